@@ -1,12 +1,30 @@
 """
 Read and return keyboard data for the M5Stack Cardputer
 """
-from machine import Pin
+from machine import Pin, Timer
+import array
+import time
+from .keyevents import KeyEventQueue, diff_state, PRESSED
 
 
 #lookup values for our keyboard
 KC_SHIFT = const(61)
 KC_FN = const(65)
+# the "G0" button isn't part of the matrix, but is given a keycode for key events
+KC_G0 = const(68)
+
+# key state is stored as a bitmask (bit N is keycode N)
+_STATE_WORDS = const(3)
+_NUM_CODES = const(69)
+_CODE_MASK = const(0xff)
+
+# offsets of each layer in _KEY_NAMES
+_LAYER_SHIFT = const(_NUM_CODES)
+_LAYER_FN = const(_NUM_CODES * 2)
+
+# hardware timer used for background scanning
+_SCAN_TIMER_ID = const(2)
+_DEFAULT_SCAN_MS = const(10)
 
 KEYMAP = {
     67:'`',  63:'1',  57:'2',  53:'3', 47:'4', 43:'5', 37:'6', 33:'7', 27:'8', 23:'9', 17:'0', 13:'_', 7:'=', 3:'BSPC',
@@ -39,6 +57,17 @@ KEYMAP_FN = {
     }
 
 
+def _make_key_names():
+    """Flatten the keymaps into one tuple, indexed by (layer offset + keycode)."""
+    names = []
+    for keymap in (KEYMAP, KEYMAP_SHIFT, KEYMAP_FN):
+        names += [keymap.get(code) for code in range(KC_G0)]
+        names.append("G0")
+    return tuple(names)
+
+_KEY_NAMES = _make_key_names()
+
+
 MOD_KEYS = const(('ALT', 'CTL', 'FN', 'SHIFT', 'OPT'))
 ALWAYS_NEW_KEYS = const(())
 
@@ -79,6 +108,87 @@ class Keys():
         
         self.key_state = []
 
+        # background scanning (see start_scanner)
+        self.events = None
+        self._scan_timer = None
+        self._state = array.array('I', bytes(_STATE_WORDS * 4))
+        self._new_state = array.array('I', bytes(_STATE_WORDS * 4))
+
+        # get_pressed_keys only converts keys that changed since the last poll
+        self._poll_state = array.array('I', bytes(_STATE_WORDS * 4))
+        self._key_bits = array.array('I', bytes(_STATE_WORDS * 4))
+        self._changes = array.array('H', bytes(_NUM_CODES * 2))
+        self._layer = 0
+        self._keys = self.key_state
+
+
+    def start_scanner(self, period_ms=_DEFAULT_SCAN_MS, queue_size=64):
+        """
+        Scan the keyboard in the background (using a hardware timer),
+        recording every press and release in self.events (a KeyEventQueue).
+
+        While the scanner is running, get_pressed_keys uses the latest background scan,
+        rather than scanning the matrix again.
+        """
+        if self._scan_timer is not None:
+            return
+        self.events = KeyEventQueue(queue_size)
+        self._scan_timer = Timer(_SCAN_TIMER_ID)
+        self._scan_timer.init(period=period_ms, mode=Timer.PERIODIC, callback=self._timer_scan)
+
+
+    def stop_scanner(self):
+        """Stop scanning in the background."""
+        if self._scan_timer is not None:
+            self._scan_timer.deinit()
+            self._scan_timer = None
+
+
+    def _timer_scan(self, timer):
+        """Timer callback: scan the matrix, and record any keys that changed."""
+        self._scan_state(self._new_state)
+        self.events.push_changes(self._state, self._new_state, _STATE_WORDS, time.ticks_ms())
+
+
+    @micropython.viper
+    def _scan_state(self, state):
+        """Scan the matrix (and G0) into a keycode bitmask, without allocating."""
+        state_ptr = ptr32(state)
+        state_ptr[0] = 0
+        state_ptr[1] = 0
+        state_ptr[2] = 0
+
+        columns = self.columns
+        a0 = self.a0
+        a1 = self.a1
+        a2 = self.a2
+
+        row_idx = 0
+        while row_idx < 8:
+            a0.value(row_idx & 0b001)
+            a1.value(( row_idx & 0b010 ) >> 1)
+            a2.value(( row_idx & 0b100 ) >> 2)
+
+            col_idx = 0
+            while col_idx < 7:
+                if not columns[col_idx].value(): # button pressed
+                    key_address = (col_idx * 10) + row_idx
+                    state_ptr[key_address >> 5] |= 1 << (key_address & 31)
+                col_idx += 1
+            row_idx += 1
+
+        if not self.G0.value():
+            state_ptr[KC_G0 >> 5] |= 1 << (KC_G0 & 31)
+
+
+    def event_key_name(self, code, fn, shift):
+        """Get the readable name of a keycode from a key event."""
+        if fn:
+            return _KEY_NAMES[_LAYER_FN + code]
+        if shift:
+            return _KEY_NAMES[_LAYER_SHIFT + code]
+        return _KEY_NAMES[code]
+
     @micropython.viper
     def scan(self):
         """scan through the matrix to see what keys are pressed."""
@@ -126,6 +236,8 @@ class Keys():
         """
         Get a readable list of currently held keys.
         Also, populate self.key_state with current vals.
+
+        While the held keys don't change, the same list is returned (so it shouldn't be modified).
         
         Args:
         =====
@@ -137,28 +249,43 @@ class Keys():
             If True, forces the use of 'SHIFT' key layer
         
         """
-        
-        #update our scan results
-        self.scan()
-        self.key_state = []
-        
-        if self.G0.value() == 0:
-            self.key_state.append("G0")
-        
-        if not self._key_list_buffer and not self.key_state: # if nothing is pressed, we can return an empty list
-            return self.key_state
-        
-        if KC_FN in self._key_list_buffer or force_fn:
-            for keycode in self._key_list_buffer:
-                self.key_state.append(KEYMAP_FN[keycode])
+        if self._scan_timer is None:
+            state = self._poll_state
+            self._scan_state(state)
+        else:
+            # the background scanner has already read the keyboard
+            state = self._state
 
-        elif KC_SHIFT in self._key_list_buffer or force_shift:
-            for keycode in self._key_list_buffer:
-                self.key_state.append(KEYMAP_SHIFT[keycode])
-        
+        if force_fn or (state[KC_FN >> 5] >> (KC_FN & 31)) & 1:
+            layer = _LAYER_FN
+        elif force_shift or (state[KC_SHIFT >> 5] >> (KC_SHIFT & 31)) & 1:
+            layer = _LAYER_SHIFT
         else:
-            for keycode in self._key_list_buffer:
-                self.key_state.append(KEYMAP[keycode])
-        
-        return self.key_state
+            layer = 0
+
+        if layer == self._layer:
+            keys = self._keys
+        else:
+            # every held key has a new name, so convert them all again
+            self._layer = layer
+            key_bits = self._key_bits
+            for idx in range(_STATE_WORDS):
+                key_bits[idx] = 0
+            keys = []
+
+        count = diff_state(self._key_bits, state, _STATE_WORDS, self._changes)
+        if count:
+            # only the keys that changed are converted to names
+            keys = list(keys)
+            changes = self._changes
+            for idx in range(count):
+                change = changes[idx]
+                name = _KEY_NAMES[layer + (change & _CODE_MASK)]
+                if change & PRESSED:
+                    keys.append(name)
+                elif name in keys:
+                    keys.remove(name)
 
+        self._keys = keys
+        self.key_state = keys
+        return keys
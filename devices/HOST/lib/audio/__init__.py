@@ -0,0 +1,26 @@
+"""
+This module provides a simple API for accessing audio features in MicroHydra.
+
+This is the HOST version of the module, for running MicroHydra on a computer (with the MicroPython unix port).
+The unix port has no I2S, so Audio takes the same calls as it does on real hardware,
+but doesn't make any sound.
+"""
+
+
+class Audio:
+    def __new__(cls, **kwargs):
+        if not hasattr(cls, 'instance'):
+          cls.instance = super(Audio, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, buf_size=2048, rate=11025, channels=4):
+        self.channels = channels
+
+    def play(self, sample, note=0, octave=4, volume=15, channel=0, loop=False):
+        pass
+
+    def stop(self, channel=0):
+        pass
+
+    def setvolume(self, volume, channel=0):
+        pass
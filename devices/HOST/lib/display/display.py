@@ -0,0 +1,142 @@
+"""
+This Module provides an easy to use Display object for creating graphics in MicroHydra
+
+This is the HOST version of the module, for running MicroHydra on a computer (with the MicroPython unix port).
+Instead of real hardware, the display driver talks to an emulated panel (see `headless.py`).
+Frames can be saved as .ppm or .png images, and the display keeps track of
+how many pixels each `show()` sends, and how long each drawing call takes.
+"""
+
+import time
+try:
+    from . import st7789
+    from .headless import HeadlessPanel
+except:
+    from lib.display import st7789
+    from lib.display.headless import HeadlessPanel
+
+# ~~~~~ Magic constants:
+_MH_DISPLAY_HEIGHT = const(135)
+_MH_DISPLAY_WIDTH = const(240)
+_MH_DISPLAY_ROTATION = const(1)
+
+# drawing methods that are timed (times include any drawing methods they call)
+_TIMED_METHODS = const((
+    'fill', 'pixel', 'vline', 'hline', 'line', 'rect', 'fill_rect', 'ellipse',
+    'polygon', 'text', 'bitmap', 'blit_buffer', 'scroll',
+))
+
+
+class Display(st7789.ST7789):
+    """
+    Headless Display.
+
+    Args:
+        use_tiny_buf (bool): Use a 4bit framebuffer (see st7789.ST7789)
+        use_gs8_buf (bool): Use an 8bit indexed framebuffer (passed through kwargs, see st7789.ST7789)
+        double_buffer (bool): Use a second framebuffer (see st7789.ST7789)
+        frame_path (str|None):
+            If given, every call to `show()` saves a frame to this path.
+            It's formatted with the frame number, e.g. "frames/{:05d}.png"
+        **kwargs: Passed to the display driver.
+    """
+
+    overlay_callbacks = []
+
+    def __new__(cls, **kwargs):
+        if not hasattr(cls, 'instance'):
+          cls.instance = super(Display, cls).__new__(cls)
+        return cls.instance
+
+
+    def __init__(self, use_tiny_buf=False, double_buffer=False, frame_path=None, **kwargs):
+        if hasattr(self, 'fbuf'):
+            print("WARNING: Display re-initialized.")
+
+        self.panel = HeadlessPanel()
+        self.frame_path = frame_path
+        self.reset_stats()
+
+        super().__init__(
+            self.panel,
+            _MH_DISPLAY_HEIGHT,
+            _MH_DISPLAY_WIDTH,
+            dc=self.panel.dc,
+            rotation=_MH_DISPLAY_ROTATION,
+            color_order="BGR",
+            use_tiny_buf=use_tiny_buf,
+            double_buffer=double_buffer,
+            **kwargs,
+            )
+        self.reset_stats()
+
+
+    def _draw_overlays(self):
+        """Call each overlay callback in Display.overlay_callbacks"""
+        for callback in Display.overlay_callbacks:
+            callback(self)
+
+
+    def show(self, wait=True):
+        self._draw_overlays()
+
+        self.panel.reset_counts()
+        start = time.ticks_us()
+        super().show(wait)
+        show_us = time.ticks_diff(time.ticks_us(), start)
+
+        self.frames += 1
+        self.last_show_pixels = self.panel.pixels
+        self.last_show_us = show_us
+        self.total_pixels += self.panel.pixels
+        self._record_call('show', show_us)
+
+        if self.frame_path:
+            self.save(self.frame_path.format(self.frames))
+
+
+    def save(self, path):
+        """Save what is currently on the (emulated) display as a .png or .ppm image."""
+        self.panel.save(path, self.xstart, self.ystart, self.width, self.height)
+
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Stats ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def reset_stats(self):
+        """Clear the frame counts and call timings."""
+        self.frames = 0
+        self.last_show_pixels = 0
+        self.last_show_us = 0
+        self.total_pixels = 0
+        # {method_name: [number of calls, total microseconds]}
+        self.call_times = {}
+
+
+    def _record_call(self, name, time_us):
+        record = self.call_times.get(name)
+        if record is None:
+            self.call_times[name] = [1, time_us]
+        else:
+            record[0] += 1
+            record[1] += time_us
+
+
+    def print_stats(self):
+        """Print a summary of the pixels sent, and the time spent in each drawing method."""
+        print(f"frames: {self.frames}, pixels sent: {self.total_pixels}, last show: {self.last_show_pixels}px in {self.last_show_us}us")
+        for name, (calls, total_us) in sorted(self.call_times.items()):
+            print(f"{name:>12}: {calls:>6} calls, {total_us:>9}us total, {total_us // calls:>6}us avg")
+
+
+
+def _timed(name):
+    """Wrap a driver method so that each call is timed."""
+    method = getattr(st7789.ST7789, name)
+    def timed_method(self, *args, **kwargs):
+        start = time.ticks_us()
+        result = method(self, *args, **kwargs)
+        self._record_call(name, time.ticks_diff(time.ticks_us(), start))
+        return result
+    return timed_method
+
+for _name in _TIMED_METHODS:
+    setattr(Display, _name, _timed(_name))
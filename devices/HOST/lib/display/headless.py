@@ -0,0 +1,181 @@
+"""
+Emulated display hardware for running MicroHydra on a computer.
+
+`HeadlessPanel` stands in for both the SPI bus and the ST7789 controller.
+It decodes just enough of the ST7789 commands to track the address window,
+and writes pixel data into its own copy of the display RAM.
+Because it receives exactly what real hardware would (after RGB565/GS4 conversion),
+it can be used to count the data sent by the driver, and to save frames as image files.
+"""
+import struct
+import binascii
+
+
+_ST7789_CASET = const(0x2A)
+_ST7789_RASET = const(0x2B)
+_ST7789_RAMWR = const(0x2C)
+
+# The ST7789 has 240x320 pixels of RAM, and rotation can swap the axes,
+# so a 320x320 area can hold any window.
+_RAM_SIZE = const(320)
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ HeadlessPin ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class HeadlessPin:
+    """Stand-in for machine.Pin that just remembers its value."""
+    def __init__(self, value=0):
+        self._value = value
+
+    def value(self, val=None):
+        if val is None:
+            return self._value
+        self._value = val
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ HeadlessPanel ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class HeadlessPanel:
+    """
+    Stand-in for machine.SPI, connected to an emulated ST7789.
+
+    Attributes:
+        dc (HeadlessPin): The data/command pin. Give this to the display driver.
+        ram (bytearray): The emulated display RAM (big-endian RGB565).
+        pixels (int): Pixels written since the last call to `reset_counts`.
+        writes (int): SPI writes since the last call to `reset_counts`.
+    """
+    def __init__(self):
+        self.dc = HeadlessPin()
+        self.ram = bytearray(_RAM_SIZE * _RAM_SIZE * 2)
+        self.command = 0
+        self.x0 = 0
+        self.x1 = 0
+        self.y0 = 0
+        self.y1 = 0
+        self.cursor_x = 0
+        self.cursor_y = 0
+        self.reset_counts()
+
+
+    def reset_counts(self):
+        self.pixels = 0
+        self.writes = 0
+
+
+    def init(self, *args, **kwargs):
+        pass
+
+
+    def deinit(self):
+        pass
+
+
+    def write(self, buf):
+        """Decode one SPI write (a command when dc is low, or data for the last command)."""
+        self.writes += 1
+        if not self.dc.value():
+            self.command = buf[0]
+            if self.command == _ST7789_RAMWR:
+                self.cursor_x = self.x0
+                self.cursor_y = self.y0
+        elif self.command == _ST7789_CASET:
+            self.x0, self.x1 = struct.unpack('>HH', buf)
+        elif self.command == _ST7789_RASET:
+            self.y0, self.y1 = struct.unpack('>HH', buf)
+        elif self.command == _ST7789_RAMWR:
+            self._write_pixels(buf)
+
+
+    def _write_pixels(self, buf):
+        """Write pixel data into the current window, wrapping at the end of each row."""
+        view = memoryview(buf)
+        ram = self.ram
+        buf_len = len(buf)
+        self.pixels += buf_len // 2
+
+        idx = 0
+        while idx < buf_len and self.cursor_y <= self.y1:
+            count = min((self.x1 - self.cursor_x + 1) * 2, buf_len - idx)
+            start = (self.cursor_y * _RAM_SIZE + self.cursor_x) * 2
+            ram[start:start + count] = view[idx:idx + count]
+
+            idx += count
+            self.cursor_x += count // 2
+            if self.cursor_x > self.x1:
+                self.cursor_x = self.x0
+                self.cursor_y += 1
+
+
+    def rgb_row(self, x, y, width):
+        """Get one row of the display RAM as 8-bit RGB."""
+        ram = self.ram
+        row = bytearray(width * 3)
+        start = (y * _RAM_SIZE + x) * 2
+        for i in range(width):
+            color = (ram[start + i * 2] << 8) | ram[start + i * 2 + 1]
+            red = color >> 11
+            green = (color >> 5) & 0x3f
+            blue = color & 0x1f
+            row[i * 3] = (red << 3) | (red >> 2)
+            row[i * 3 + 1] = (green << 2) | (green >> 4)
+            row[i * 3 + 2] = (blue << 3) | (blue >> 2)
+        return row
+
+
+    def save(self, path, x, y, width, height):
+        """Save an area of the display RAM as a .png, or a .ppm file (chosen by the file extension)."""
+        with open(path, 'wb') as file:
+            if path.endswith('.png'):
+                self._write_png(file, x, y, width, height)
+            else:
+                file.write(f'P6\n{width} {height}\n255\n'.encode())
+                for row in range(height):
+                    file.write(self.rgb_row(x, y + row, width))
+
+
+    @staticmethod
+    def _png_chunk(file, kind, data):
+        file.write(struct.pack('>I', len(data)))
+        file.write(kind)
+        file.write(data)
+        file.write(struct.pack('>I', binascii.crc32(data, binascii.crc32(kind)) & 0xffffffff))
+
+
+    def _write_png(self, file, x, y, width, height):
+        """
+        Write a PNG image.
+        Image data is stored uncompressed (in 'stored' deflate blocks),
+        so that no compression module is needed.
+        """
+        raw = bytearray()
+        for row in range(height):
+            raw.append(0) # no filter
+            raw += self.rgb_row(x, y + row, width)
+
+        # zlib stream made of stored blocks
+        data = bytearray(b'\x78\x01')
+        for start in range(0, len(raw), 0xffff):
+            block = raw[start:start + 0xffff]
+            final = 1 if start + 0xffff >= len(raw) else 0
+            data += struct.pack('<BHH', final, len(block), len(block) ^ 0xffff)
+            data += block
+
+        # adler32 checksum
+        a = 1
+        b = 0
+        for byte in raw:
+            a = (a + byte) % 65521
+            b = (b + a) % 65521
+        data += struct.pack('>I', (b << 16) | a)
+
+        file.write(b'\x89PNG\r\n\x1a\n')
+        self._png_chunk(file, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        self._png_chunk(file, b'IDAT', data)
+        self._png_chunk(file, b'IEND', b'')
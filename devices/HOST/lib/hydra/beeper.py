@@ -0,0 +1,21 @@
+"""
+This module wraps lib/audio with a simple API for making square wave beeps.
+
+This is the HOST version of the module, for running MicroHydra on a computer (with the MicroPython unix port).
+The unix port has no audio output (or machine.Timer), so Beeper takes the same arguments as it
+does on real hardware, but doesn't make any sound.
+"""
+
+
+class Beeper:
+
+    def stop(self):
+        pass
+
+
+    def play(self, notes, time_ms=100, volume=None):
+        """
+        This is the main outward-facing method of Beeper.
+        (On HOST, it does nothing.)
+        """
+        pass
@@ -0,0 +1,100 @@
+"""
+Read and return keyboard data from the terminal (stdin),
+for running MicroHydra on a computer with the MicroPython unix port.
+
+Terminals only report key presses (not releases),
+so each key is reported as held for a single call to `get_pressed_keys`.
+For the best results, put the terminal into raw mode before starting MicroHydra
+(e.g. `stty raw -echo`), so that keys are sent without waiting for enter.
+"""
+import sys
+import select
+
+
+# single characters that map to named keys
+KEYMAP = {
+    '\r':'ENT', '\n':'ENT', ' ':'SPC', '\t':'TAB', '\x7f':'BSPC', '\x08':'BSPC', '\x1b':'ESC',
+    }
+
+# escape sequences sent by terminals for special keys
+ESCAPE_KEYMAP = {
+    '[A':'UP', '[B':'DOWN', '[C':'RIGHT', '[D':'LEFT', '[3~':'DEL',
+    '[H':'HOME', '[F':'END', 'OP':'F1', 'OQ':'F2', 'OR':'F3', 'OS':'F4',
+    }
+
+
+MOD_KEYS = const(('ALT', 'CTL', 'FN', 'SHIFT', 'OPT'))
+ALWAYS_NEW_KEYS = const(())
+
+
+class Keys():
+    """
+    Keys class is responsible for reading and returning currently pressed keys.
+    It is intented to be used by the Input module.
+    """
+
+    # optional values set preferred main/secondary action keys:
+    main_action = "ENT"
+    secondary_action = "SPC"
+    aux_action = "ESC"
+
+    # terminals already send arrow keys, so no other keys need to be used as directions
+    ext_dir_dict = {}
+
+    def __init__(self, **kwargs):
+        self._poller = select.poll()
+        self._poller.register(sys.stdin, select.POLLIN)
+        self.key_state = []
+
+
+    def _read_chars(self):
+        """Read all the characters currently waiting in stdin."""
+        chars = ''
+        while self._poller.poll(0):
+            char = sys.stdin.read(1)
+            if not char:
+                break
+            chars += char
+        return chars
+
+
+    @staticmethod
+    def ext_dir_keys(keylist):
+        """Convert typical (aphanumeric) keys into extended movement-specific keys"""
+        for idx, key in enumerate(keylist):
+            if key in Keys.ext_dir_dict:
+                keylist[idx] = Keys.ext_dir_dict[key]
+        return keylist
+
+
+    def get_pressed_keys(self, force_fn=False, force_shift=False):
+        """
+        Get a readable list of keys pressed since the last call.
+        Also, populate self.key_state with current vals.
+        """
+        self.key_state = []
+        chars = self._read_chars()
+
+        idx = 0
+        while idx < len(chars):
+            char = chars[idx]
+            idx += 1
+
+            # match escape sequences (like arrow keys)
+            if char == '\x1b' and idx < len(chars):
+                for seq, key in ESCAPE_KEYMAP.items():
+                    if chars.startswith(seq, idx):
+                        self.key_state.append(key)
+                        idx += len(seq)
+                        break
+                else:
+                    self.key_state.append('ESC')
+            elif char in KEYMAP:
+                self.key_state.append(KEYMAP[char])
+            elif '\x01' <= char <= '\x1a':
+                # ctrl + letter
+                self.key_state += ['CTL', chr(ord(char) + 0x60)]
+            else:
+                self.key_state.append(char.upper() if force_shift else char)
+
+        return self.key_state
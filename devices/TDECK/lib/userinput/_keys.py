@@ -19,7 +19,9 @@ for the Lilygo T-Deck.
     However, the results will be lower quality compared to the custom firmware.
 """
 from machine import I2C, Pin
+import array
 import time
+from .keyevents import diff_state
 
 
 KBD_PWR = Pin(10, Pin.OUT)
@@ -50,6 +52,28 @@ KEYMAP_FN = {
 _KC_LEFT_SHIFT = const(23)
 _KC_SHIFT = const(36)
 _KC_FN = const(3)
+# the trackball button isn't part of the keyboard, but is given a keycode in the key state
+_KC_G0 = const(72)
+
+# key state is stored as a bitmask (bit N is keycode N)
+_STATE_WORDS = const(3)
+_NUM_CODES = const(72)
+# codes above this mean the keyboard isn't running the Hydra KB firmware
+_MAX_VALID_CODE = const(100)
+
+# offsets of each layer in _KEY_NAMES
+_LAYER_SHIFT = const(_NUM_CODES)
+_LAYER_FN = const(_NUM_CODES * 2)
+
+
+def _make_key_names():
+    """Flatten the keymaps into one tuple, indexed by (layer offset + keycode)."""
+    names = []
+    for keymap in (KEYMAP, KEYMAP_SHIFT, KEYMAP_FN):
+        names += [keymap.get(code) for code in range(_NUM_CODES)]
+    return tuple(names)
+
+_KEY_NAMES = _make_key_names()
 
 _I2C_ADDR = const(0x55)
 
@@ -60,7 +84,6 @@ _ENABLE_RAW_MODE  = const(0x03)
 
 # the number of keys sent in raw mode
 _NUM_READ_KEYS = const(4)
-_EMPTY_BYTES = b'\x00' * _NUM_READ_KEYS
 
 
 # warning to print when wrong firmware is detected.
@@ -78,6 +101,34 @@ ALWAYS_NEW_KEYS = const(('UP', 'RIGHT', 'LEFT', 'DOWN'))
 
 
 
+@micropython.viper
+def _codes_to_state(codes, state, g0_pressed:int) -> int:
+    """
+    Convert the raw codes read from the keyboard into a keycode bitmask, without allocating.
+    Returns the largest code that was read.
+    """
+    codes_ptr = ptr8(codes)
+    state_ptr = ptr32(state)
+    state_ptr[0] = 0
+    state_ptr[1] = 0
+    state_ptr[2] = 0
+
+    max_code = 0
+    idx = 0
+    while idx < _NUM_READ_KEYS:
+        code = codes_ptr[idx]
+        if code > max_code:
+            max_code = code
+        if code > 0 and code < _NUM_CODES:
+            state_ptr[code >> 5] |= 1 << (code & 31)
+        idx += 1
+
+    if g0_pressed:
+        state_ptr[_KC_G0 >> 5] |= 1 << (_KC_G0 & 31)
+    return max_code
+
+
+
 class Keys:
     """
     Keys class is responsible for reading and returning currently pressed keys.
@@ -134,6 +185,17 @@ class Keys:
         
         self.key_state = []
 
+        # raw codes are read into a reusable buffer, and compared as a bitmask,
+        # so that get_pressed_keys only builds a new list when something changes
+        self._codes = bytearray(_NUM_READ_KEYS)
+        self._poll_state = array.array('I', bytes(_STATE_WORDS * 4))
+        self._key_bits = array.array('I', bytes(_STATE_WORDS * 4))
+        self._changes = array.array('H', bytes((_NUM_CODES + 1) * 2))
+        self._layer = 0
+        self._keys = self.key_state
+        # whether the last list of keys included trackball directions
+        self._has_tb_keys = False
+
 
     @staticmethod
     def ext_dir_keys(keylist):
@@ -243,6 +305,8 @@ class Keys:
         """
         Return currently pressed keys.
         Also, populate self.key_state with current vals.
+
+        While the held keys don't change, the same list is returned (so it shouldn't be modified).
         
         Args:
         =====
@@ -254,47 +318,59 @@ class Keys:
             If True, forces the use of 'SHIFT' key layer
 
         """
-        codes = self.i2c.readfrom(_I2C_ADDR, _NUM_READ_KEYS)
-        tb_val = self.tb_click.value()
-        keys = []
-        
-        # early return on no input
-        if codes == _EMPTY_BYTES \
-        and not self.tb_x \
-        and not self.tb_y \
-        and tb_val:
-            self.key_state = keys
-            return keys
-        
+        codes = self._codes
+        self.i2c.readfrom_into(_I2C_ADDR, codes)
+        g0_pressed = not self.tb_click.value()
+        state = self._poll_state
+
+        if _codes_to_state(codes, state, g0_pressed) > _MAX_VALID_CODE:
+            # firmware should not be sending values like this
+            # enable compatibility mode for wrong kb firmware
+            print(_KB_FIRMWARE_WARNING)
+            self.firmware_compat_mode = True
+            self.get_pressed_keys = self._alt_get_pressed_keys
+            return []
+
         # process special keys before converting to readable format
-        if (_KC_FN in codes and tb_val) \
+        if (_KC_FN in codes and not g0_pressed) \
         or force_fn:
-            keymap = KEYMAP_FN
+            layer = _LAYER_FN
         elif _KC_SHIFT in codes or _KC_LEFT_SHIFT in codes \
         or force_shift:
-            keymap = KEYMAP_SHIFT
+            layer = _LAYER_SHIFT
         else:
-            keymap = KEYMAP
+            layer = 0
 
+        # early return when nothing has changed
+        changed = diff_state(self._key_bits, state, _STATE_WORDS, self._changes)
+        if not changed \
+        and layer == self._layer \
+        and not self._has_tb_keys \
+        and not self.tb_x \
+        and not self.tb_y:
+            self.key_state = self._keys
+            return self._keys
+        self._layer = layer
+
+        # only a few keys can be read at once, so the whole list is rebuilt
+        # (key combos like "OPT" depend on all of the held keys)
+        keys = []
         # tb button
-        if tb_val == 0:
+        if g0_pressed:
             keys.append("G0")
-        
+
         for code in codes:
-            if code != 0:
-                if code in keymap.keys():
-                    keys.append(keymap[code])
-
-                elif code > 100:
-                    # firmware should not be sending values like this
-                    # enable compatibility mode for wrong kb firmware
-                    print(_KB_FIRMWARE_WARNING)
-                    self.firmware_compat_mode = True
-                    self.get_pressed_keys = self._alt_get_pressed_keys
-                    return keys
+            if code:
+                name = _KEY_NAMES[layer + code] if code < _NUM_CODES else None
+                if name is not None:
+                    keys.append(name)
 
         self._special_mod_keys(codes, keys)
+        num_keys = len(keys)
         self._add_tb_keys(keys)
+        self._has_tb_keys = len(keys) > num_keys
+
+        self._keys = keys
         self.key_state = keys
         return keys
 
@@ -35,6 +35,7 @@ https://github.com/esophagoose/gt911-micropython/
 
         
 import time
+import array
 from collections import namedtuple
 import machine
 
@@ -68,6 +69,14 @@ _POINT_INFO = const(0x814E)
 _POINT_1 = const(0x814F)
 
 _NUM_POINTS = const(5)
+_POINT_SIZE = const(8)
+# the status byte, followed by every touch point, is read in one transaction
+_READ_SIZE = const(1 + _POINT_SIZE * _NUM_POINTS)
+_STATUS_READY = const(0x80)
+_STATUS_COUNT = const(0xF)
+
+# parsed points are stored as (track id, x, y, size)
+_POINT_FIELDS = const(4)
 
 
 def config_offset(reg: int):
@@ -114,30 +123,31 @@ class TouchEvent:
     swipe_move_thresh=30
     def __init__(self, point=None):
         if point:
-            self.alive = True
             _, start_x, start_y, start_size = point
+            self.begin(start_x, start_y, start_size)
         else:
+            self.begin(0, 0, 0)
             self.alive = False
-            start_x = 0
-            start_y = 0
-            start_size = 0
-        
-        self.start_x = start_x
-        self.start_y = start_y
-        self.start_size = start_size
+
+
+    def begin(self, x, y, size):
+        """Start tracking a new touch"""
+        self.alive = True
+        self.start_x = x
+        self.start_y = y
+        self.start_size = size
         self.start_time = time.ticks_ms()
-        
-        self.new_x = start_x
-        self.new_y = start_y
-        self.new_size = start_size
+
+        self.new_x = x
+        self.new_y = y
+        self.new_size = size
 
 
-    def track(self, point):
+    def track(self, x, y, size):
         """Update touchpoint values as it moves"""
-        _, new_x, new_y, new_size = point
-        self.new_x = new_x
-        self.new_y = new_y
-        self.new_size = new_size
+        self.new_x = x
+        self.new_y = y
+        self.new_size = size
 
 
     @micropython.viper
@@ -214,7 +224,21 @@ class TouchEvent:
 
 
 class Touch:
-    def __init__(self, i2c, interrupt=_BOARD_TOUCH_INT, rotation=1, swipe_move_thresh=20):
+    """
+    GT911 touch controller.
+
+    Args:
+        i2c (I2C): The (shared) I2C bus the controller is on.
+        interrupt (int): The pin connected to the controller's INT output.
+        rotation (int): Display rotation, to convert points to display coordinates.
+        swipe_move_thresh (int): How far a touch must move to count as a swipe.
+        use_interrupt (bool):
+            If True, get_touch_events only reads the controller after it signals new data (on the INT pin),
+            or while a touch is in progress. Otherwise, it reads the controller on every call.
+
+    `active_polls` and `idle_polls` count the get_touch_events calls that did and didn't use the I2C bus.
+    """
+    def __init__(self, i2c, interrupt=_BOARD_TOUCH_INT, rotation=1, swipe_move_thresh=20, use_interrupt=True):
         self.width = 0
         self.height = 0
         self.address = None
@@ -229,6 +253,25 @@ class Touch:
         
         self.ready = False
 
+        # reusable buffers, so that reading points doesn't allocate
+        self._read_buf = bytearray(_READ_SIZE)
+        self._clear_buf = bytearray(1)
+        # the latest points, as _POINT_FIELDS values per point (see read_points)
+        self.points = array.array('h', bytes(_NUM_POINTS * _POINT_FIELDS * 2))
+        self.point_count = 0
+
+        # interrupt-gated polling
+        self.use_interrupt = use_interrupt
+        # set by the INT pin, and cleared when the data is read (starts set so that the first call reads)
+        self._data_pending = True
+        self._irq_callback = None
+        # bitmask of the track ids in self.tracker that are alive
+        self._alive_ids = 0
+        self.active_polls = 0
+        self.idle_polls = 0
+        if use_interrupt:
+            self.interrupt.irq(trigger=machine.Pin.IRQ_FALLING, handler=self._handle_irq)
+
         self._begin(_DEFAULT_ADDR)
 
 
@@ -262,8 +305,17 @@ class Touch:
         return list(data)
 
 
+    def _handle_irq(self, pin):
+        """The controller has new touch data."""
+        self._data_pending = True
+        if self._irq_callback is not None:
+            self._irq_callback(pin)
+
+
     def enable_interrupt(self, callback):
-        self.interrupt.irq(trigger=machine.Pin.IRQ_FALLING, handler=callback)
+        """Call callback(pin) whenever the controller signals new data."""
+        self._irq_callback = callback
+        self.interrupt.irq(trigger=machine.Pin.IRQ_FALLING, handler=self._handle_irq)
 
 
     def _begin(self, address):
@@ -277,41 +329,115 @@ class Touch:
         self.height = (hh << 8) + hl
 
 
-    def _parse_point(self, data):
-        track_id = data[0]
-        x = data[1] + (data[2] << 8)
-        y = data[3] + (data[4] << 8)
-        x, y = self._rotate_xy(x, y)
-        size = data[5] + (data[6] << 8)
-        return TouchPoint(track_id, x, y, size)
+    @micropython.viper
+    def _parse_points(self, data, points) -> int:
+        """
+        Parse the points from a burst read (status byte + point data) into the points array.
+        Returns the number of points (0 if the data isn't ready).
+        """
+        data_ptr = ptr8(data)
+        points_ptr = ptr16(points)
+        rotation = int(self.rotation)
+        width = int(self.width)
+        height = int(self.height)
+
+        status = data_ptr[0]
+        if not status & _STATUS_READY:
+            return 0
+        count = status & _STATUS_COUNT
+        if count > _NUM_POINTS:
+            count = _NUM_POINTS
+
+        idx = 0
+        while idx < count:
+            src = 1 + idx * _POINT_SIZE
+            dest = idx * _POINT_FIELDS
+            x = data_ptr[src + 1] | (data_ptr[src + 2] << 8)
+            y = data_ptr[src + 3] | (data_ptr[src + 4] << 8)
+            # rotate to display coordinates (like _rotate_xy)
+            if rotation % 2 == 1:
+                x, y = y, x
+                rot_width = height
+                rot_height = width
+            else:
+                rot_width = width
+                rot_height = height
+            if rotation == 1 or rotation == 2:
+                y = rot_height - y
+            if rotation == 2 or rotation == 3:
+                x = rot_width - x
+
+            points_ptr[dest] = data_ptr[src]
+            points_ptr[dest + 1] = x
+            points_ptr[dest + 2] = y
+            points_ptr[dest + 3] = data_ptr[src + 5] | (data_ptr[src + 6] << 8)
+            idx += 1
+        return count
+
+
+    def read_points(self) -> int:
+        """
+        Read the latest touch data into self.points (without allocating),
+        and return the number of points.
+        Each point is stored as _POINT_FIELDS values: (track id, x, y, size).
+        """
+        buf = self._read_buf
+        self.i2c.readfrom_mem_into(self.address, _POINT_INFO, buf, addrsize=16)
+        self.ready = bool(buf[0] & _STATUS_READY)
+        count = self._parse_points(buf, self.points)
+        if self.ready:
+            # clear the status, so the controller can send new data
+            self.i2c.writeto_mem(self.address, _POINT_INFO, self._clear_buf, addrsize=16)
+        self.point_count = count
+        return count
 
 
     def get_touch_events(self):
         """
         Returns a list of Taps or Swipes based on the latest touch data.
         """
-        current_points = self.get_current_points()
-        active_ids = [point.id for point in current_points]
+        # skip the I2C bus when there's no new data, and no touch to finish
+        if self.use_interrupt \
+        and not self._data_pending \
+        and not self._alive_ids:
+            self.idle_polls += 1
+            return []
+        self.active_polls += 1
+
+        # cleared before reading, so that a new signal during the read isn't lost
+        self._data_pending = False
+        count = self.read_points()
+        points = self.points
         tracker = self.tracker
         
         output = []
         
         # add/update touchevents in tracker
-        for point in current_points:
-            if tracker[point.id].alive:
+        active_ids = 0
+        for idx in range(0, count * _POINT_FIELDS, _POINT_FIELDS):
+            track_id = points[idx]
+            if track_id >= _NUM_POINTS:
+                continue
+            active_ids |= 1 << track_id
+            event = tracker[track_id]
+            if event.alive:
                 # point is already being tracked; update
-                tracker[point.id].track(point)
+                event.track(points[idx + 1], points[idx + 2], points[idx + 3])
             else:
                 # init new touch event in tracker
-                tracker[point.id].__init__(point)
+                event.begin(points[idx + 1], points[idx + 2], points[idx + 3])
         
         # self.ready indicates if the data is up to date
         if self.ready:
             # iterate though touchevents to find active events that are finished
             for idx, event in enumerate(tracker):
-                if event.alive and idx not in active_ids:
+                if event.alive and not (active_ids >> idx) & 1:
                     output.append(event.finish())
         
+        self._alive_ids = 0
+        for idx, event in enumerate(tracker):
+            if event.alive:
+                self._alive_ids |= 1 << idx
         return output
                 
         
@@ -320,17 +446,14 @@ class Touch:
     def get_current_points(self):
         """
         Returns a list of TouchPoints representing the current touch data.
+        (read_points and self.points can be used instead, to avoid allocating.)
         """
-        points = []
-        info = self._read(_POINT_INFO, 1)[0]
-        self.ready = bool((info >> 7) & 1)
-        touch_count = info & 0xF
-        if self.ready and touch_count > 0:
-            for i in range(touch_count):
-                data = self._read(_POINT_1 + (i * 8), 7)
-                points.append(self._parse_point(data))
-        self._write(_POINT_INFO, [0])
-        return points
+        count = self.read_points()
+        points = self.points
+        return [
+            TouchPoint(points[idx], points[idx + 1], points[idx + 2], points[idx + 3])
+            for idx in range(0, count * _POINT_FIELDS, _POINT_FIELDS)
+            ]
 
 
 
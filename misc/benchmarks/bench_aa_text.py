@@ -0,0 +1,62 @@
+"""
+Compare drawing text with 1 bpp (jagged) and 2/4 bpp (anti-aliased) proportional fonts.
+
+The fonts are generated here with the same glyph sizes (so only the pixel format differs),
+in the same layout that `tools/fonts/aa_font_converter.py` writes.
+Anti-aliased text should cost no more than 1.5x the 1 bpp text.
+
+Run from the root of the repo using the MicroPython unix port:
+`micropython misc/benchmarks/bench_aa_text.py`
+"""
+import time
+from fakehw import make_display
+
+
+_FRAMES = const(50)
+_GLYPH_WIDTH = const(16)
+_GLYPH_HEIGHT = const(32)
+_MAX_RATIO = 1.5
+_TEXT = "MicroHydra 123"
+
+
+class SyntheticFont:
+    """A proportional font with a simple pattern in every glyph."""
+    def __init__(self, bpp):
+        self.MAP = "".join(chr(code) for code in range(0x20, 0x7f))
+        self.BPP = bpp
+        self.HEIGHT = _GLYPH_HEIGHT
+        self.MAX_WIDTH = _GLYPH_WIDTH
+        self.OFFSET_WIDTH = 3
+        glyph_bits = _GLYPH_WIDTH * _GLYPH_HEIGHT * bpp
+        glyph_bytes = glyph_bits // 8
+
+        self.WIDTHS = bytes([_GLYPH_WIDTH] * len(self.MAP))
+        offsets = bytearray()
+        for idx in range(len(self.MAP)):
+            offsets += (idx * glyph_bits).to_bytes(3, 'big')
+        self.OFFSETS = bytes(offsets)
+        # about half the pixels are set, with a mix of levels
+        self.BITMAPS = bytes((i * 37 + (i >> 3)) & 0xff for i in range(glyph_bytes * len(self.MAP)))
+
+
+def text_us(display, font):
+    start = time.ticks_us()
+    for _ in range(_FRAMES):
+        display.text(_TEXT, 0, 40, display.palette[8], font=font)
+    return time.ticks_diff(time.ticks_us(), start) // _FRAMES
+
+
+def run(mode, **kwargs):
+    display, _ = make_display(240, 135, **kwargs)
+    print(f"\n240x135 ({mode}), {len(_TEXT)} chars of {_GLYPH_WIDTH}x{_GLYPH_HEIGHT}:")
+    base_us = text_us(display, SyntheticFont(1))
+    print(f"{'1 bpp':<8}{base_us:>8} us")
+    for bpp in (2, 4):
+        aa_us = text_us(display, SyntheticFont(bpp))
+        ratio = aa_us / base_us
+        print(f"{bpp} bpp{'':<4}{aa_us:>8} us  ({ratio:.2f}x) {'ok' if ratio <= _MAX_RATIO else 'TOO SLOW'}")
+
+
+run("RGB565")
+run("GS8", use_gs8_buf=True)
+run("GS4 tiny buf", use_tiny_buf=True)
@@ -0,0 +1,37 @@
+"""
+Measure how many launcher icons per second ST7789.bitmap can draw,
+from the bitmap module directly, and from a PreparedBitmap.
+
+Run from the root of the repo using the MicroPython unix port:
+`micropython misc/benchmarks/bench_bitmap.py`
+"""
+import time
+from fakehw import make_display
+from launcher.icons import appicons, battery
+
+
+_REPEATS = const(500)
+
+
+def icons_per_second(display, bitmap, count):
+    start = time.ticks_us()
+    for i in range(_REPEATS):
+        display.bitmap(bitmap, (i * 7) % 200, 40, index=i % count, palette=(0x0000, 0xffff))
+    return _REPEATS * 1_000_000 // time.ticks_diff(time.ticks_us(), start)
+
+
+def run(use_tiny_buf):
+    mode = "GS4 tiny buf" if use_tiny_buf else "RGB565"
+    print(f"\n240x135 ({mode}):")
+    print(f"{'bitmap':<10}{'module/s':>10}{'prepared/s':>12}{'speedup':>10}")
+
+    display, _ = make_display(240, 135, use_tiny_buf=use_tiny_buf)
+    for name, bitmap in (('appicons', appicons), ('battery', battery)):
+        before = icons_per_second(display, bitmap, bitmap.BITMAPS)
+        prepared = display.prepare_bitmap(bitmap)
+        after = icons_per_second(display, prepared, bitmap.BITMAPS)
+        print(f"{name:<10}{before:>10}{after:>12}{after / before:>9.1f}x")
+
+
+run(use_tiny_buf=True)
+run(use_tiny_buf=False)
@@ -0,0 +1,70 @@
+"""
+Compare drawing a menu-like screen with direct Display calls, and with a CommandList.
+
+Each frame draws a background, and a list of rows (each with a filled box, an outline, and a label),
+like lib.hydra.menu and the popups do. The CommandList is recorded once and then re-drawn every frame.
+
+Run from the root of the repo using the MicroPython unix port:
+`micropython misc/benchmarks/bench_commandlist.py`
+"""
+import time
+from fakehw import make_display
+from lib.display.commandlist import CommandList
+
+
+_FRAMES = const(100)
+_ROWS = const(12)
+_ROW_HEIGHT = const(11)
+
+
+def draw_direct(display):
+    display.fill(display.palette[2])
+    for row in range(_ROWS):
+        y = row * _ROW_HEIGHT
+        display.rect(4, y, 180, _ROW_HEIGHT - 1, display.palette[3], fill=True)
+        display.rect(4, y, 180, _ROW_HEIGHT - 1, display.palette[5])
+        display.hline(8, y + _ROW_HEIGHT - 2, 100, display.palette[6])
+        display.text("Option", 10, y + 1, display.palette[8])
+
+
+def record(commands, display):
+    commands.fill(display.palette[2])
+    for row in range(_ROWS):
+        y = row * _ROW_HEIGHT
+        commands.rect(4, y, 180, _ROW_HEIGHT - 1, display.palette[3], fill=True)
+        commands.rect(4, y, 180, _ROW_HEIGHT - 1, display.palette[5])
+        commands.hline(8, y + _ROW_HEIGHT - 2, 100, display.palette[6])
+        commands.text("Option", 10, y + 1, display.palette[8])
+
+
+def time_us(function):
+    start = time.ticks_us()
+    for _ in range(_FRAMES):
+        function()
+    return time.ticks_diff(time.ticks_us(), start) // _FRAMES
+
+
+def run(mode, **kwargs):
+    display, _ = make_display(240, 135, **kwargs)
+    commands = CommandList(display)
+
+    direct_us = time_us(lambda: draw_direct(display))
+
+    def record_and_draw():
+        commands.clear()
+        record(commands, display)
+        commands.draw()
+    recorded_us = time_us(record_and_draw)
+
+    record(commands, display)
+    replay_us = time_us(commands.draw)
+
+    print(f"\n240x135 ({mode}), {_ROWS} rows, {len(commands)} commands:")
+    print(f"{'direct':<20}{direct_us:>8} us/frame")
+    print(f"{'record + draw':<20}{recorded_us:>8} us/frame")
+    print(f"{'replay':<20}{replay_us:>8} us/frame")
+
+
+run("RGB565")
+run("GS8", use_gs8_buf=True)
+run("GS4 tiny buf", use_tiny_buf=True)
@@ -0,0 +1,84 @@
+"""
+Count the bytes sent to the display for some typical MicroHydra frames,
+comparing the dirty-rectangle tracking in ST7789.show() against the old full-width row band.
+
+Run from the root of the repo using the MicroPython unix port:
+`micropython misc/benchmarks/bench_dirty_rects.py`
+"""
+from fakehw import make_display
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Frames ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Each frame function draws something similar to what the real app would draw in one loop.
+
+def launcher_clock(display):
+    """Launcher status bar clock changing minutes."""
+    display.rect(6, 5, 40, 8, 0x0000, fill=True)
+    display.text("12:34", 6, 6, 0x1111)
+    display.text("12:34", 6, 5, 0xffff)
+    display.text("pm", 48, 4, 0xffff)
+
+
+def launcher_scrollbar(display):
+    """Launcher scrollbar moving one step."""
+    display.rect(0, display.height - 4, display.width, 4, 0x0000, fill=True)
+    display.rect(40, display.height - 3, 20, 2, 0xffff, fill=True)
+
+
+def hyde_cursor_blink(display):
+    """HyDE cursor blinking in the middle of the screen."""
+    display.vline(100, 52, 8, 0xffff)
+
+
+def hyde_typing(display):
+    """HyDE redrawing a single edited line of text, plus the cursor."""
+    display.rect(0, 52, display.width, 8, 0x0000, fill=True)
+    display.text("def main_loop():", 0, 52, 0xffff)
+    display.vline(128, 52, 8, 0xffff)
+
+
+def hyde_scattered(display):
+    """Several unrelated small updates (cursor, line number, status)."""
+    display.vline(100, 52, 8, 0xffff)
+    display.text("12", 0, 100, 0xffff)
+    display.pixel(display.width - 2, 2, 0xffff)
+    display.rect(display.width - 30, display.height - 10, 20, 8, 0xffff)
+
+
+FRAMES = (
+    ('launcher clock', launcher_clock),
+    ('launcher scrollbar', launcher_scrollbar),
+    ('HyDE cursor blink', hyde_cursor_blink),
+    ('HyDE typing', hyde_typing),
+    ('HyDE scattered', hyde_scattered),
+    )
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Runner ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def measure(display, spi, frame, use_rects):
+    """Draw and show one frame, returning the (data bytes, total bytes) written."""
+    frame(display)
+    if not use_rects:
+        # force the fallback to the full-width band
+        display._dirty_count = -1
+    spi.reset_counts()
+    display.show()
+    return spi.data_bytes, spi.total_bytes
+
+
+def run(width, height, use_tiny_buf):
+    display, spi = make_display(width, height, use_tiny_buf=use_tiny_buf)
+    mode = "GS4 tiny buf" if use_tiny_buf else "RGB565"
+    print(f"\n{width}x{height} ({mode}):")
+    print(f"{'frame':<22}{'band bytes':>12}{'rect bytes':>12}{'saved':>8}")
+
+    for name, frame in FRAMES:
+        _, band_total = measure(display, spi, frame, use_rects=False)
+        _, rect_total = measure(display, spi, frame, use_rects=True)
+        saved = 100 - (rect_total * 100 // band_total) if band_total else 0
+        print(f"{name:<22}{band_total:>12}{rect_total:>12}{saved:>7}%")
+
+
+run(240, 135, use_tiny_buf=True)
+run(240, 135, use_tiny_buf=False)
+run(320, 240, use_tiny_buf=False)
@@ -0,0 +1,67 @@
+"""
+Compare single buffered show() against double buffered show(wait=False),
+using a fake SPI bus that takes as long as a real 40MHz transfer would.
+
+The benchmark draws a series of frames, spending a fixed amount of time "rendering" each one.
+While rendering, the fake flush timer is ticked once per millisecond (like the real timer would),
+which lets the double buffered display send the previous frame in between.
+
+Run from the root of the repo using the MicroPython unix port:
+`micropython misc/benchmarks/bench_double_buffer.py`
+"""
+import time
+from fakehw import make_display, FakeSPI, FakeTimer
+
+
+_BAUDRATE = const(40_000_000)
+_FRAMES = const(20)
+_RENDER_MS = const(15)
+
+
+def render(display, frame, timer):
+    """Draw a frame, taking _RENDER_MS to do it (ticking the timer each ms)."""
+    display.fill(frame * 1234)
+    display.text(f"frame {frame}", 10, 10, 0xffff)
+
+    start = time.ticks_ms()
+    last_tick = start
+    while time.ticks_diff(time.ticks_ms(), start) < _RENDER_MS:
+        now = time.ticks_ms()
+        if timer is not None and time.ticks_diff(now, last_tick) >= 1:
+            last_tick = now
+            timer.tick()
+
+
+def run(width, height, double_buffer):
+    timer = FakeTimer() if double_buffer else None
+    display, spi = make_display(
+        width, height,
+        spi=FakeSPI(baudrate=_BAUDRATE),
+        double_buffer=double_buffer,
+        flush_timer=timer,
+        )
+
+    show_us = 0
+    start = time.ticks_us()
+    for frame in range(_FRAMES):
+        render(display, frame, timer)
+
+        show_start = time.ticks_us()
+        display.show(wait=False)
+        show_us += time.ticks_diff(time.ticks_us(), show_start)
+    display.wait_for_flush()
+    total_us = time.ticks_diff(time.ticks_us(), start)
+
+    mode = "double buffered" if double_buffer else "single buffered"
+    print(
+        f"{width}x{height} {mode:<16}: "
+        f"{total_us // _FRAMES // 1000:>4}ms per frame, "
+        f"{show_us // _FRAMES // 1000:>4}ms blocked in show()"
+        )
+
+
+print(f"{_FRAMES} full frames, {_RENDER_MS}ms of rendering each, {_BAUDRATE // 1_000_000}MHz SPI:")
+run(240, 135, double_buffer=False)
+run(240, 135, double_buffer=True)
+run(320, 240, double_buffer=False)
+run(320, 240, double_buffer=True)
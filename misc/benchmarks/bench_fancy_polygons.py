@@ -0,0 +1,90 @@
+"""
+Measure how many transformed polygons per second FancyDisplay can draw,
+comparing the old float math (cos/sin/floor per vertex into a new array)
+with the fixed point Transform written into a reused array.
+
+Run from the root of the repo using the MicroPython unix port:
+`micropython misc/benchmarks/bench_fancy_polygons.py`
+"""
+import array
+import time
+from math import sin, cos, floor
+from fakehw import make_display
+from lib.display.fancydisplay import Transform, FancyDisplay
+
+
+_REPEATS = const(500)
+_SHAPES = (
+    ('triangle', array.array('h', (0, 0, 30, 0, 15, 26))),
+    ('star', array.array('h', (
+        20, 0, 25, 14, 40, 15, 28, 24, 32, 39,
+        20, 30, 8, 39, 12, 24, 0, 15, 15, 14,
+        ))),
+    ('circle64', array.array('h', (
+        round(v) for i in range(64)
+        for v in (30 + 30 * cos(i * 0.0982), 30 + 30 * sin(i * 0.0982))
+        ))),
+    )
+
+
+def float_rotate(points, angle, center_x, center_y):
+    """The rotation FancyDisplay used before it switched to fixed point math."""
+    cos_a = cos(angle)
+    sin_a = sin(angle)
+    rotated = array.array('h')
+    for i in range(0, len(points), 2):
+        rotated.append(
+            center_x + floor((points[i] - center_x) * cos_a - (points[i+1] - center_y) * sin_a)
+            )
+        rotated.append(
+            center_y + floor((points[i] - center_x) * sin_a + (points[i+1] - center_y) * cos_a)
+            )
+    return rotated
+
+
+def polys_per_second_float(display, points):
+    start = time.ticks_us()
+    for i in range(_REPEATS):
+        scaled = array.array('h', points)
+        FancyDisplay.scale_poly(scaled, 120)
+        rotated = float_rotate(scaled, i * 0.05, 20, 20)
+        display.polygon(rotated, 60, 40, 0xffff, fill=True)
+    return _REPEATS * 1_000_000 // time.ticks_diff(time.ticks_us(), start)
+
+
+def polys_per_second_fixed(display, points):
+    matrix = Transform()
+    out = array.array('h', points)
+    start = time.ticks_us()
+    for i in range(_REPEATS):
+        matrix.reset().scale(1.2).rotate(i * 0.05, 20, 20).apply(points, out)
+        display.polygon(out, 60, 40, 0xffff, fill=True)
+    return _REPEATS * 1_000_000 // time.ticks_diff(time.ticks_us(), start)
+
+
+def transforms_per_second(points, use_fixed):
+    """Transform only (no drawing)."""
+    matrix = Transform()
+    out = array.array('h', points)
+    start = time.ticks_us()
+    for i in range(_REPEATS):
+        if use_fixed:
+            matrix.reset().scale(1.2).rotate(i * 0.05, 20, 20).apply(points, out)
+        else:
+            scaled = array.array('h', points)
+            FancyDisplay.scale_poly(scaled, 120)
+            float_rotate(scaled, i * 0.05, 20, 20)
+    return _REPEATS * 1_000_000 // time.ticks_diff(time.ticks_us(), start)
+
+
+display, _ = make_display(240, 135)
+
+print(f"{'shape':<10}{'float xf/s':>12}{'fixed xf/s':>12}{'float poly/s':>14}{'fixed poly/s':>14}")
+for name, points in _SHAPES:
+    print(
+        f"{name:<10}"
+        f"{transforms_per_second(points, False):>12}"
+        f"{transforms_per_second(points, True):>12}"
+        f"{polys_per_second_float(display, points):>14}"
+        f"{polys_per_second_fixed(display, points):>14}"
+        )
@@ -0,0 +1,41 @@
+"""
+Measure how many characters per second ST7789.text can draw with bitmap fonts,
+with and without the glyph cache.
+
+Run from the root of the repo using the MicroPython unix port:
+`micropython misc/benchmarks/bench_glyph_cache.py`
+"""
+import time
+from fakehw import make_display
+from font import vga1_8x16, vga2_16x32
+
+
+_REPEATS = const(200)
+_TEXT = "MicroHydra Settings 0123456789"
+
+
+def chars_per_second(display, font):
+    text = _TEXT
+    start = time.ticks_us()
+    for i in range(_REPEATS):
+        display.text(text, 0, (i % 4) * font.HEIGHT, 0xffff, font=font)
+    elapsed_us = time.ticks_diff(time.ticks_us(), start)
+    return len(text) * _REPEATS * 1_000_000 // elapsed_us
+
+
+def run(use_tiny_buf):
+    mode = "GS4 tiny buf" if use_tiny_buf else "RGB565"
+    print(f"\n240x135 ({mode}):")
+    print(f"{'font':<12}{'uncached chars/s':>18}{'cached chars/s':>18}{'speedup':>10}")
+
+    uncached, _ = make_display(240, 135, use_tiny_buf=use_tiny_buf, glyph_cache_size=0)
+    cached, _ = make_display(240, 135, use_tiny_buf=use_tiny_buf)
+
+    for name, font in (('vga1_8x16', vga1_8x16), ('vga2_16x32', vga2_16x32)):
+        before = chars_per_second(uncached, font)
+        after = chars_per_second(cached, font)
+        print(f"{name:<12}{before:>18}{after:>18}{after / before:>9.1f}x")
+
+
+run(use_tiny_buf=True)
+run(use_tiny_buf=False)
@@ -0,0 +1,139 @@
+"""
+Measure how many keyboard polls per second the Cardputer and T-Deck _keys modules can do.
+
+The keyboards are connected to fake pins/I2C, and polled while idle, while holding the same keys,
+and while the held keys change on every poll.
+(On the host, the fake pins are much cheaper than real ones, so this mostly measures
+the work _keys does to turn the raw key state into a list of readable keys.)
+
+Run from the root of the repo using the MicroPython unix port:
+`micropython misc/benchmarks/bench_keys.py`
+"""
+import sys
+import os
+import time
+from fakehw import FakePin, FakeTimer
+
+
+_POLLS = const(2000)
+_PACKAGE = "mhkeys"
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Fake machine ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class Pin(FakePin):
+    """machine.Pin stand-in. Input pins read high (not pressed) unless changed by the benchmark."""
+    IN = 0
+    OUT = 1
+    PULL_UP = 2
+    IRQ_FALLING = 4
+
+    def __init__(self, pin_id, mode=None, pull=None, **kwargs):
+        super().__init__(1)
+
+    def irq(self, *args, **kwargs):
+        pass
+
+
+class I2C:
+    """machine.I2C stand-in for the T-Deck keyboard. Reads return self.codes."""
+    def __init__(self, *args, **kwargs):
+        self.codes = bytes(4)
+
+    def writeto(self, addr, buf):
+        pass
+
+    def readfrom_into(self, addr, buf):
+        buf[:] = self.codes
+
+
+class _Machine:
+    Pin = Pin
+    I2C = I2C
+    Timer = lambda timer_id: FakeTimer()
+
+sys.modules['machine'] = _Machine
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Loading _keys ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def _copy(source, target):
+    with open(source) as f:
+        text = f.read()
+    with open(target, 'w') as f:
+        f.write(text)
+
+
+def load_keys(device):
+    """
+    Import a device's _keys module.
+    It's copied into a temporary package alongside keyevents, so its relative imports work.
+    """
+    base = f"/tmp/{_PACKAGE}{device}"
+    package = f"{base}/{_PACKAGE}{device}"
+    for path in (base, package):
+        try:
+            os.mkdir(path)
+        except OSError:
+            pass
+    _copy("src/lib/userinput/keyevents.py", f"{package}/keyevents.py")
+    _copy(f"devices/{device}/lib/userinput/_keys.py", f"{package}/_keys.py")
+    with open(f"{package}/__init__.py", 'w'):
+        pass
+
+    sys.path.insert(0, base)
+    module = __import__(f"{_PACKAGE}{device}._keys")
+    return module._keys
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Benchmark ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def polls_per_second(keys, before_poll=None):
+    start = time.ticks_us()
+    for idx in range(_POLLS):
+        if before_poll:
+            before_poll(idx)
+        keys.get_pressed_keys()
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    return _POLLS * 1_000_000 // max(1, elapsed)
+
+
+def report(device, idle, held, changing):
+    print(f"{device:<10}{idle:>10}{held:>10}{changing:>10}")
+
+
+def bench_cardputer():
+    keys = load_keys("CARDPUTER").Keys()
+    idle = polls_per_second(keys)
+
+    # one column reading low holds a key in every row
+    column = keys.columns[3]
+    column.value(0)
+    held = polls_per_second(keys)
+
+    def toggle(idx):
+        column.value(idx & 1)
+    changing = polls_per_second(keys, toggle)
+    column.value(1)
+    report("CARDPUTER", idle, held, changing)
+
+
+def bench_tdeck():
+    keys = load_keys("TDECK").Keys()
+    idle = polls_per_second(keys)
+
+    # SHIFT + 'a' + 's'
+    i2c = keys.i2c
+    i2c.codes = bytes((36, 4, 18, 0))
+    held = polls_per_second(keys)
+
+    def toggle(idx):
+        i2c.codes = bytes((36, 4, 18, 0)) if idx & 1 else bytes((4, 0, 0, 0))
+    changing = polls_per_second(keys, toggle)
+    report("TDECK", idle, held, changing)
+
+
+print(f"Keyboard polls per second ({_POLLS} polls each):")
+print(f"{'':<10}{'idle':>10}{'held':>10}{'changing':>10}")
+bench_cardputer()
+bench_tdeck()
@@ -0,0 +1,81 @@
+"""
+Replay recorded input through a HydraMenu on the HOST device's headless display, and report frame times.
+
+The same log always produces the same frames, so this can be used to compare changes to
+the menu and display code from end to end.
+Record a log on any device with `lib.userinput.inputlog` (see the userinput wiki page),
+or leave out the path to use a generated log that scrolls up and down the menu.
+
+Build the HOST device first (`python3 tools/parse_files.py`), then run from inside `MicroHydra/HOST`:
+`micropython ../../misc/benchmarks/bench_replay.py [input.bin]`
+"""
+import sys
+
+# the unix port puts this script's folder first in sys.path (instead of the current directory),
+# so the HOST build's modules have to be added
+if '.' not in sys.path:
+    sys.path.insert(0, '.')
+
+from lib.display import Display, profiler
+from lib.userinput import UserInput, inputlog
+from lib.hydra import menu as HydraMenu
+
+
+_GENERATED_PATH = "/tmp/mh_replay.bin"
+_MENU_ITEMS = const(20)
+
+
+class _ScriptedInput:
+    """Stands in for UserInput, to record a generated log."""
+    def __init__(self, keys):
+        self.keys = keys
+
+    def get_new_keys(self):
+        return [self.keys.pop(0)] if self.keys else []
+
+
+def generate_log(path):
+    keys = ['DOWN'] * (_MENU_ITEMS + 5) + ['UP'] * (_MENU_ITEMS // 2) + ['ENT', 'DOWN', 'ENT']
+    source = _ScriptedInput(keys)
+    recorder = inputlog.InputRecorder(source, path)
+    while source.keys:
+        source.get_new_keys()
+    recorder.stop()
+
+
+def main():
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        path = _GENERATED_PATH
+        generate_log(path)
+
+    display = Display()
+    kb = UserInput()
+    menu = HydraMenu.Menu()
+    for idx in range(_MENU_ITEMS):
+        if idx % 2:
+            menu.append(HydraMenu.BoolItem(menu=menu, text=f"Option {idx}", value=False))
+        else:
+            menu.append(HydraMenu.IntItem(menu=menu, text=f"Value {idx}", value=idx % 10))
+
+    prof = profiler.enable(display, overlay=False)
+    replay = inputlog.replay(path, realtime=False, user_input=kb)
+
+    redraw = True
+    while not replay.finished or redraw:
+        keys = kb.get_new_keys()
+        for key in keys:
+            menu.handle_input(key)
+        if keys:
+            redraw = True
+        if redraw:
+            redraw = menu.draw()
+            display.show()
+
+    inputlog.stop()
+    print(f"Replayed '{path}' ({prof.count} frames):")
+    prof.print_summary()
+
+
+main()
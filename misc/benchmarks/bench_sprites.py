@@ -0,0 +1,104 @@
+"""
+Measure how many moving sprites lib.display.sprites can draw per frame, while holding 30fps.
+
+Each frame moves every sprite (over a tile map background), redraws the changed areas,
+and sends them to a fake display at a 40MHz SPI baudrate.
+
+Run from the root of the repo using the MicroPython unix port:
+`micropython misc/benchmarks/bench_sprites.py`
+"""
+import time
+from fakehw import make_display, FakeSPI
+from lib.display import sprites
+
+
+_FRAMES = const(60)
+_FRAME_BUDGET_US = const(33_333)
+_SPRITE_SIZE = const(16)
+_TILE_SIZE = const(16)
+_BAUDRATE = const(40_000_000)
+_SPRITE_COUNTS = (1, 2, 4, 8, 16, 32, 48, 64, 96, 128, 192, 256)
+
+
+def make_sheet(size, frames, use_tiny_buf, key):
+    """Make a sprite sheet with a simple pattern in each frame."""
+    if use_tiny_buf:
+        data = bytearray(size * size * frames // 2)
+        for i in range(len(data)):
+            data[i] = (i * 7) & 0xff
+    else:
+        data = bytearray(size * size * frames * 2)
+        for i in range(0, len(data), 2):
+            data[i] = (i * 13) & 0xff
+            data[i + 1] = (i * 5) & 0xff
+    return sprites.SpriteSheet(data, size, size, use_tiny_buf=use_tiny_buf, key=key)
+
+
+def make_scene(display, count, use_tiny_buf):
+    tiles = make_sheet(_TILE_SIZE, 4, use_tiny_buf, -1)
+    cols = display.width // _TILE_SIZE + 1
+    rows = display.height // _TILE_SIZE + 1
+    tilemap = sprites.TileMap(tiles, cols, rows, bytearray(i % 4 for i in range(cols * rows)))
+    scene = sprites.Scene(display, tilemap)
+
+    sheet = make_sheet(_SPRITE_SIZE, 4, use_tiny_buf, 0)
+    for i in range(count):
+        sprite = scene.add(sprites.Sprite(
+            sheet,
+            (i * 37) % (display.width - _SPRITE_SIZE),
+            (i * 23) % (display.height - _SPRITE_SIZE),
+            ))
+        sprite.dx = 1 + i % 3
+        sprite.dy = 1 + i % 2
+    return scene
+
+
+def move(scene, frame_num):
+    max_x = scene.display.width - _SPRITE_SIZE
+    max_y = scene.display.height - _SPRITE_SIZE
+    for sprite in scene.sprites:
+        sprite.x += sprite.dx
+        sprite.y += sprite.dy
+        if not 0 <= sprite.x <= max_x:
+            sprite.dx = -sprite.dx
+            sprite.x += sprite.dx * 2
+        if not 0 <= sprite.y <= max_y:
+            sprite.dy = -sprite.dy
+            sprite.y += sprite.dy * 2
+        sprite.frame = (frame_num // 4) % 4
+
+
+def frame_time_us(width, height, use_tiny_buf, count):
+    """Average time to move, draw, and show one frame."""
+    display, spi = make_display(width, height, use_tiny_buf=use_tiny_buf, spi=FakeSPI(baudrate=_BAUDRATE))
+    scene = make_scene(display, count, use_tiny_buf)
+    # the first frame draws the whole screen
+    scene.draw()
+    display.show()
+
+    start = time.ticks_us()
+    for frame_num in range(_FRAMES):
+        move(scene, frame_num)
+        scene.draw()
+        display.show()
+    return time.ticks_diff(time.ticks_us(), start) // _FRAMES
+
+
+def run(width, height, use_tiny_buf):
+    mode = "GS4 tiny buf" if use_tiny_buf else "RGB565"
+    print(f"\n{width}x{height} ({mode}), {_SPRITE_SIZE}x{_SPRITE_SIZE} sprites:")
+    print(f"{'sprites':>8}{'ms/frame':>10}{'fps':>8}")
+
+    best = 0
+    for count in _SPRITE_COUNTS:
+        frame_us = frame_time_us(width, height, use_tiny_buf, count)
+        print(f"{count:>8}{frame_us / 1000:>10.2f}{1_000_000 // frame_us:>8}")
+        if frame_us > _FRAME_BUDGET_US:
+            break
+        best = count
+    print(f"Sprites per frame at 30fps: {best}")
+
+
+for use_tiny_buf in (False, True):
+    run(240, 135, use_tiny_buf)
+    run(320, 240, use_tiny_buf)
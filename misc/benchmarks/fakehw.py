@@ -0,0 +1,134 @@
+"""
+Fake hardware for running MicroHydra's display driver off-device.
+
+These helpers are designed for the MicroPython unix port,
+so that drawing code can be benchmarked on a normal computer.
+Run the benchmark scripts from the root of the repo, like this:
+`micropython misc/benchmarks/bench_dirty_rects.py`
+"""
+import sys
+import time
+
+# import MicroHydra modules straight from the source folder
+if 'src' not in sys.path:
+    sys.path.insert(0, 'src')
+
+from lib.display import st7789
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Fake Pins ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class FakePin:
+    """Stand-in for machine.Pin that just remembers its value."""
+    def __init__(self, value=0):
+        self._value = value
+
+    def value(self, val=None):
+        if val is None:
+            return self._value
+        self._value = val
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Fake SPI ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class FakeSPI:
+    """
+    Stand-in for machine.SPI that counts what gets written to it.
+
+    Bytes are counted as 'data' when the dc pin is high, and 'cmd' otherwise.
+    If a baudrate is given, each write also blocks for as long as the real transfer would take.
+    """
+    def __init__(self, dc=None, baudrate=None):
+        self.dc = dc
+        self.baudrate = baudrate
+        self.reset_counts()
+
+    def reset_counts(self):
+        self.data_bytes = 0
+        self.cmd_bytes = 0
+        self.writes = 0
+
+    @property
+    def total_bytes(self):
+        return self.data_bytes + self.cmd_bytes
+
+    def write(self, buf):
+        self.writes += 1
+        if self.dc is not None and self.dc.value():
+            self.data_bytes += len(buf)
+        else:
+            self.cmd_bytes += len(buf)
+
+        if self.baudrate:
+            # simulate the time it takes to send these bits
+            time.sleep_us(len(buf) * 8_000_000 // self.baudrate)
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def deinit(self):
+        pass
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Fake Timer ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class FakeTimer:
+    """
+    Stand-in for machine.Timer.
+    There are no interrupts on the host, so the benchmark must call `tick()`
+    wherever the real timer would have fired.
+    """
+    def __init__(self):
+        self.callback = None
+        self.fired = 0
+
+    def init(self, period=None, mode=None, callback=None):
+        self.callback = callback
+
+    def deinit(self):
+        self.callback = None
+
+    def tick(self):
+        if self.callback is not None:
+            self.fired += 1
+            self.callback(self)
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Fake Display ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# The driver opens the utf8 font from the root of the device filesystem.
+# Point it at the copy in the source folder instead.
+_builtin_open = open
+def _src_open(path, *args, **kwargs):
+    if path.startswith('/font/'):
+        path = 'src' + path
+    return _builtin_open(path, *args)
+st7789.open = _src_open
+
+
+def make_display(width=240, height=135, use_tiny_buf=False, spi=None, **kwargs):
+    """Create an ST7789 driver connected to fake hardware. Returns (display, spi)."""
+    dc = FakePin()
+    if spi is None:
+        spi = FakeSPI(dc)
+    else:
+        spi.dc = dc
+
+    display = st7789.ST7789(
+        spi,
+        # the driver takes the panel's portrait size, and rotates it to landscape
+        min(width, height),
+        max(width, height),
+        dc=dc,
+        cs=FakePin(1),
+        rotation=1 if width > height else 0,
+        use_tiny_buf=use_tiny_buf,
+        **kwargs,
+        )
+    spi.reset_counts()
+    return display, spi
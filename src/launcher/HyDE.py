@@ -96,7 +96,15 @@ _MAX_FORMATTED_LEN = const(200)
 
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Global Objects: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-DISPLAY = display.Display()
+DISPLAY = display.Display(
+    # mh_if spi_ram:
+    # # mh_if not TDECK:
+    # # # send frames in the background while the next one is drawn
+    # # # (not on the T-Deck, where the display shares its SPI bus with the SD card)
+    # # double_buffer=True,
+    # # mh_end_if
+    # mh_end_if
+    )
 
 RTC = machine.RTC()
 CONFIG = config.Config()
@@ -163,14 +171,17 @@ DARK_COMMENT_COLOR = color.mix_color565(
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Function defs: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def file_options(target_file, overlay, editor):
-    """Give file options menu"""
+def file_options(target_file, overlay, editor) -> bool:
+    """
+    Give file options menu.
+    Returns False if the menu was closed without doing anything.
+    """
     _OPTIONS = const(("Back", "Save", "Tab...", "Run...", "Exit..."))
 
     choice = overlay.popup_options(_OPTIONS,title="GO...")
 
-    if choice == "Back":
-        return
+    if choice == "Back" or choice is None:
+        return False
     elif choice == "Save":
         editor.save_file(target_file)
     elif choice == "Run...":
@@ -179,6 +190,7 @@ def file_options(target_file, overlay, editor):
         exit_options(target_file,overlay,editor)
     elif choice == "Tab...":
         tab_options(target_file,overlay,editor)
+    return True
 
 
 def tab_options(target_file, overlay, editor):
@@ -1132,7 +1144,11 @@ def main_loop():
 
                     elif key == "G0":
                         # file actions menu
-                        file_options(target_file,overlay,editor)
+                        # (skip redrawing if nothing changed, the popup put back the editor underneath it,
+                        # and this was the only key)
+                        if not file_options(target_file,overlay,editor) \
+                        and overlay.background_restored and len(keys) == 1:
+                            redraw_display = False
 
                     elif key == "DEL":
                         editor.del_line()
@@ -1150,7 +1166,8 @@ def main_loop():
             time.sleep_ms(1)
 
         editor.draw_cursor() # cursor blinks so it needs to be redrawn regularly
-        DISPLAY.show()
+        # (only returns early when double buffered)
+        DISPLAY.show(wait=False)
 
 main_loop()
 
@@ -9,7 +9,7 @@ Thank you for your contributions!
 
 
 from lib import userinput
-from lib.display import Display
+from lib.display import Display, textlayout
 from lib.hydra.config import Config
 from lib.hydra.simpleterminal import SimpleTerminal
 from lib.device import Device
@@ -212,27 +212,6 @@ class CatalogDisplay:
         self.idx %= len(self.names)
 
 
-    @staticmethod
-    def split_lines(text:str):
-        """Split a string into multiple lines, based on max line-length."""
-        lines = []
-        current_line = ''
-        words = text.split()
-
-        for word in words:
-            if len(word) + len(current_line) >= _MAX_H_CHARS:
-                lines.append(current_line)
-                current_line = word
-            elif len(current_line) == 0:
-                current_line += word
-            else:
-                current_line += ' ' + word
-            
-        lines.append(current_line) # add final line
-            
-        return lines
-
-
     def draw(self):
         name = self.names[self.idx]
         # separate author
@@ -263,11 +242,11 @@ class CatalogDisplay:
         # draw description
         DISPLAY.text(I18N["Description:"], _DISPLAY_WIDTH_HALF - 48, _DESC_Y - 10, CONFIG.palette[3])
         desc_y = _DESC_Y
-        desc_lines = self.split_lines(desc)
+        desc_lines = textlayout.wrap(desc, _MAX_H_CHARS * _CHAR_WIDTH)
         for line in desc_lines:
             DISPLAY.text(
                 line,
-                _DISPLAY_WIDTH_HALF - (len(line) * 4),
+                textlayout.center_x(line, _MH_DISPLAY_WIDTH),
                 desc_y,
                 CONFIG.palette[6]
                 )
@@ -26,6 +26,8 @@ from lib import userinput, battlevel, sdcard
 from lib.hydra import beeper
 from lib.hydra.config import Config
 from lib import display
+from lib.display.layer import Layer
+from lib.display import textlayout
 from lib.hydra.i18n import I18n
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ _CONSTANTS: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -102,6 +104,11 @@ except RuntimeError as e:
 DISPLAY = display.Display(
     # mh_if spi_ram:
     # use_tiny_buf=False,
+    # # mh_if not TDECK:
+    # # # send frames in the background while the next one is drawn
+    # # # (not on the T-Deck, where the display shares its SPI bus with the SD card)
+    # # double_buffer=True,
+    # # mh_end_if
     # mh_else:
     use_tiny_buf=True,
     # mh_end_if
@@ -117,6 +124,10 @@ BATT = battlevel.Battery()
 
 I18N = I18n(_TRANS)
 
+# convert the icon bitmaps once, so that drawing them is a single blit
+APP_ICONS = DISPLAY.prepare_bitmap(appicons, palette=(CONFIG.palette[2], CONFIG.palette[8]))
+BATTERY_ICONS = DISPLAY.prepare_bitmap(battery, palette=(CONFIG.palette[4], CONFIG.palette[7]))
+
 SYNC_NTP_ATTEMPTS = 0
 CONNECT_WIFI_ATTEMPTS = 0
 SYNCING_CLOCK = None
@@ -126,6 +137,8 @@ APP_PATHS = None
 APP_SELECTOR_INDEX = 0
 PREV_SELECTOR_INDEX = 0
 LASTDRAWN_MINUTE = -1
+# the status bar background (drawn once, and restored before drawing the clock/battery)
+STATUSBAR_BG = None
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Finding Apps ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -262,24 +275,6 @@ def launch_app(app_path):
     machine.reset()
 
 
-def center_text_x(text, char_width=16):
-    """
-        Calculate the x coordinate to draw a text string, to make it horizontally centered. (plus the text width)
-    """
-    def calculate_length(text):
-        length = 0
-        for char in text:
-            if ord(char) > 255:
-                length += 2 
-            else:
-                length += 1  
-        return length
-    str_width = calculate_length(text) * char_width
-    start_coord = _DISPLAY_WIDTH_HALF - (str_width // 2)
-
-    return start_coord
-
-
 def ease_out_cubic(x):
     return 1 - ((1 - x) ** 3)
 
@@ -318,13 +313,7 @@ _BATTERY_Y = const((_STATUSBAR_HEIGHT - 10) // 2)
 def draw_statusbar(t=None):
     global LASTDRAWN_MINUTE
     # erase status bar
-    DISPLAY.fill_rect(
-        0,
-        _BATTERY_Y,
-        _MH_DISPLAY_WIDTH,
-        _BATTERY_HEIGHT,
-        CONFIG.palette[4]
-        )
+    STATUSBAR_BG.restore(0, _BATTERY_Y, _MH_DISPLAY_WIDTH, _BATTERY_HEIGHT)
 
     # clock
     _, _, _, hour_24, minute, _, _, _ = time.localtime()
@@ -367,11 +356,10 @@ def draw_statusbar(t=None):
     # battery
     batt_lvl = BATT.read_level()
     DISPLAY.bitmap(
-        battery,
+        BATTERY_ICONS,
         _BATTERY_X,
         _BATTERY_Y,
         index=batt_lvl,
-        palette=[CONFIG.palette[4], CONFIG.palette[7]],
         )
 
 
@@ -518,11 +506,10 @@ class IconWidget:
 
     def _draw_bitmap_icon(self):
         DISPLAY.bitmap(
-            appicons,
+            APP_ICONS,
             self.x - _ICON_WIDTH_HALF,
             _ICON_Y,
             index=self.drawn_icon,
-            palette=(CONFIG.palette[2], CONFIG.palette[8]),
             )
 
 
@@ -654,7 +641,7 @@ def draw_app_name():
     # and draw app name
     DISPLAY.text(
             current_app_text,
-            center_text_x(current_app_text), _APPNAME_Y,
+            textlayout.center_x(current_app_text, _MH_DISPLAY_WIDTH, font), _APPNAME_Y,
             CONFIG.palette[8],
             font=font)
 
@@ -706,7 +693,7 @@ def try_sync_clock():
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # --------------------------------------------------------------------------------------------------
 def main_loop():
-    global APP_SELECTOR_INDEX, PREV_SELECTOR_INDEX, SYNCING_CLOCK
+    global APP_SELECTOR_INDEX, PREV_SELECTOR_INDEX, SYNCING_CLOCK, STATUSBAR_BG
     # scan apps asap to populate app names/paths and SD
     scan_apps()
 
@@ -741,6 +728,8 @@ def main_loop():
     DISPLAY.fill_rect(0, 0, _MH_DISPLAY_WIDTH,
                       _STATUSBAR_HEIGHT, CONFIG.palette[4])
     DISPLAY.hline(0, _STATUSBAR_HEIGHT, _MH_DISPLAY_WIDTH, CONFIG.palette[1])
+    STATUSBAR_BG = Layer(DISPLAY, 0, 0, _MH_DISPLAY_WIDTH, _STATUSBAR_HEIGHT)
+    STATUSBAR_BG.capture()
     
     icon = IconWidget()
     icon.force_update()
@@ -863,7 +852,8 @@ def main_loop():
             draw_statusbar()
 
         draw_app_selector(icon)
-        DISPLAY.show()
+        # (only returns early when double buffered)
+        DISPLAY.show(wait=False)
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ WIFI and RTC: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
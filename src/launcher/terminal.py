@@ -28,6 +28,8 @@ _MAX_CHARS = const(_MH_DISPLAY_WIDTH // _CHAR_WIDTH)
 
 _LINE_HEIGHT = const(10)
 _LINE_COUNT = const(_MH_DISPLAY_HEIGHT // _LINE_HEIGHT)
+# rows at the bottom of the display that don't fit a whole line
+_FOOTER_HEIGHT = const(_MH_DISPLAY_HEIGHT - (_LINE_COUNT * _LINE_HEIGHT))
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ GLOBAL OBJECTS: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
@@ -42,6 +44,8 @@ kb = UserInput()
 
 #screen buffer
 scr_buf = [""]*_LINE_COUNT
+# tft.fill_count from the last full redraw. If it changes, something else drew on the screen.
+scr_fill_count = None
 
 RTC = machine.RTC()
 
@@ -55,13 +59,42 @@ def scr_feed(string):
     scr_buf[-1] = string
     
 def scr_show():
+    global scr_fill_count
     # clear framebuffer 
     tft.fill(config['bg_color'])
+    # lines scroll in an area that fits a whole number of lines
+    tft.set_scroll_area(0, _FOOTER_HEIGHT)
     # write current text to framebuffer
     for i in range(_LINE_COUNT):
         tft.text(text=scr_buf[i], x=0, y=_LINE_HEIGHT*i,color=config['ui_color'])
     # write framebuffer to display
     tft.show()
+    scr_fill_count = tft.fill_count
+
+def scr_draw_line(i):
+    """Clear and redraw a single line of the screen buffer."""
+    y = tft.scroll_y(_LINE_HEIGHT*i)
+    tft.rect(0, y, _MH_DISPLAY_WIDTH, _LINE_HEIGHT, config['bg_color'], fill=True)
+    tft.text(text=scr_buf[i], x=0, y=y, color=config['ui_color'])
+
+def scr_show_last():
+    """Show changes to the last line only (unless the whole screen needs to be redrawn)."""
+    if scr_fill_count != tft.fill_count:
+        scr_show()
+        return
+    scr_draw_line(_LINE_COUNT - 1)
+    tft.show()
+
+def scr_scroll():
+    """Scroll the screen up by one line, and only draw the newest lines."""
+    if scr_fill_count != tft.fill_count:
+        scr_show()
+        return
+    tft.scroll_area(_LINE_HEIGHT, config['bg_color'])
+    # the previous line might have been edited since it was drawn (e.g. removing the cursor)
+    scr_draw_line(_LINE_COUNT - 2)
+    scr_draw_line(_LINE_COUNT - 1)
+    tft.show()
 
 def scr_clear():
     for i in range(_LINE_COUNT):
@@ -74,11 +107,11 @@ def custom_print(*args, **kwargs):
     for i in str_out:
         while len(i)>_MAX_CHARS:
             scr_feed(i[:_MAX_CHARS])
-            scr_show()
+            scr_scroll()
             i = i[_MAX_CHARS:]
         
         scr_feed(i)
-        scr_show()
+        scr_scroll()
 
 
 # Replace the built-in print function with the custom one
@@ -100,11 +133,11 @@ def custom_input(prmpt):
                 current_text += [i for i in keys if i != 'ENT']
             
             scr_buf[-1] = f"{prmpt} " + ''.join(current_text) + "_"
-            scr_show()
+            scr_show_last()
             
             if 'ENT' in keys or 'GO' in keys:
                 scr_buf[-1] = scr_buf[-1][:-1]
-                scr_show()
+                scr_show_last()
                 line = ''.join(current_text)
                 return line
 
@@ -158,7 +191,7 @@ def main_loop():
                 current_text += [i for i in keys if len(i) == 1]
             
             scr_buf[-1] = f"root@MH:{os.getcwd()}# " + ''.join(current_text) + "_"
-            scr_show()
+            scr_show_last()
             
             if 'ENT' in keys:
                 scr_buf[-1] = scr_buf[-1][:-1]
@@ -0,0 +1,301 @@
+"""
+Retained drawing command lists for MicroHydra's Display.
+
+A CommandList records drawing primitives (rectangles, lines, pixels, and text) into a compact array,
+and then draws them all in one viper pass.
+This avoids paying for a method call, a color conversion, and a dirty rect update for every primitive,
+which adds up on screens that draw hundreds of small shapes per frame.
+
+Short lists mark each command's area as changed, but longer lists mark just the bounding box of
+everything they recorded (which is much cheaper to track, but can send unchanged pixels
+between shapes that are far apart). Use separate CommandLists for widgets in different parts of the screen.
+
+The list is kept until it is cleared, so a screen that hasn't changed can simply be drawn again
+(for example, after a popup closes) without re-recording it.
+
+Example:
+```
+from lib.display import Display
+from lib.display.commandlist import CommandList
+
+display = Display()
+commands = CommandList(display)
+commands.fill(display.palette[2])
+for i in range(10):
+    commands.rect(10, i * 12, 100, 10, display.palette[4], fill=True)
+    commands.text(f"Item {i}", 14, i * 12 + 1, display.palette[8])
+
+commands.draw()
+display.show()
+```
+"""
+import array
+
+
+# command fields
+_FIELDS = const(6)
+_OP = const(0)
+_X = const(1)
+_Y = const(2)
+_W = const(3)
+_H = const(4)
+_COLOR = const(5)
+# (for text commands, _W holds the index into the text list)
+
+_OP_FILL_RECT = const(0)
+_OP_TEXT = const(1)
+
+# framebuffer formats
+_FMT_RGB565 = const(0)
+_FMT_GS8 = const(1)
+_FMT_GS4 = const(2)
+
+_INITIAL_COMMANDS = const(32)
+_MAX_COORD = const(0x7fff)
+
+# lists with up to this many commands mark each command's area as changed
+# (past this, one bounding box is cheaper than merging every rect)
+_MAX_COMMAND_RECTS = const(8)
+
+
+
+def _signed(value:int) -> int:
+    """Convert a coordinate stored as an unsigned 16 bit value back to a signed int."""
+    return value - 0x10000 if value & 0x8000 else value
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Viper executor ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+@micropython.viper
+def _execute(fbuf, fb_width:int, fb_height:int, fmt:int, commands, start:int, end:int) -> int:
+    """
+    Draw commands from start to end, stopping early at a text command.
+    Returns the index of the first command that wasn't drawn.
+    """
+    cmd = ptr16(commands)
+    fb8 = ptr8(fbuf)
+    fb16 = ptr16(fbuf)
+    # bytes per GS4 row (rounded up to a whole byte)
+    fb_stride = (fb_width + 1) >> 1
+
+    idx = start
+    while idx < end:
+        base = idx * _FIELDS
+        if cmd[base + _OP] == _OP_TEXT:
+            return idx
+
+        # coordinates are stored as unsigned 16 bit values
+        x0 = cmd[base + _X]
+        if x0 & 0x8000:
+            x0 -= 0x10000
+        y0 = cmd[base + _Y]
+        if y0 & 0x8000:
+            y0 -= 0x10000
+        x1 = x0 + cmd[base + _W]
+        y1 = y0 + cmd[base + _H]
+        color = cmd[base + _COLOR]
+
+        # clip to the framebuffer
+        if x0 < 0:
+            x0 = 0
+        if y0 < 0:
+            y0 = 0
+        if x1 > fb_width:
+            x1 = fb_width
+        if y1 > fb_height:
+            y1 = fb_height
+
+        if x0 < x1 and y0 < y1:
+            if fmt == _FMT_RGB565:
+                row = y0
+                while row < y1:
+                    px = row * fb_width + x0
+                    row_end = row * fb_width + x1
+                    while px < row_end:
+                        fb16[px] = color
+                        px += 1
+                    row += 1
+
+            elif fmt == _FMT_GS8:
+                row = y0
+                while row < y1:
+                    px = row * fb_width + x0
+                    row_end = row * fb_width + x1
+                    while px < row_end:
+                        fb8[px] = color
+                        px += 1
+                    row += 1
+
+            else:
+                color_byte = (color << 4) | color
+                row = y0
+                while row < y1:
+                    # GS4 rows are padded to a whole byte, so each row starts at row * stride
+                    byte_idx = row * fb_stride + (x0 >> 1)
+                    px = x0
+                    # odd starting pixel (low nibble)
+                    if px & 1 and px < x1:
+                        fb8[byte_idx] = (fb8[byte_idx] & 0xf0) | color
+                        byte_idx += 1
+                        px += 1
+                    # whole bytes
+                    while px + 1 < x1:
+                        fb8[byte_idx] = color_byte
+                        byte_idx += 1
+                        px += 2
+                    # even ending pixel (high nibble)
+                    if px < x1:
+                        fb8[byte_idx] = (fb8[byte_idx] & 0x0f) | (color << 4)
+                    row += 1
+        idx += 1
+
+    return idx
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ CommandList ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class CommandList:
+    """
+    A recorded list of drawing commands, which can be drawn (and re-drawn) in one pass.
+
+    Args:
+        display (Display): The display to draw to.
+
+    Colors are given the same way as for the Display (e.g. `display.palette[i]`),
+    and are converted when they're recorded.
+    """
+    def __init__(self, display):
+        self.display = display
+        if display.use_tiny_buf:
+            self._fmt = _FMT_GS4
+        elif display.use_gs8_buf:
+            self._fmt = _FMT_GS8
+        else:
+            self._fmt = _FMT_RGB565
+
+        self._commands = array.array('H', bytes(_INITIAL_COMMANDS * _FIELDS * 2))
+        self._texts = []
+        self.count = 0
+        # bounding box of everything recorded (x1/y1 exclusive)
+        self._x0 = self._y0 = _MAX_COORD
+        self._x1 = self._y1 = -_MAX_COORD
+        self._has_fill = False
+
+
+    def __len__(self):
+        return self.count
+
+
+    def clear(self):
+        """Remove all commands (keeping the allocated space for reuse)."""
+        self._texts.clear()
+        self.count = 0
+        self._x0 = self._y0 = _MAX_COORD
+        self._x1 = self._y1 = -_MAX_COORD
+        self._has_fill = False
+
+
+    def _add(self, op, x, y, w, h, color):
+        """Record a command, and grow the bounding box to include it."""
+        commands = self._commands
+        base = self.count * _FIELDS
+        if base + _FIELDS > len(commands):
+            # double the capacity
+            commands.extend(array.array('H', bytes(len(commands) * 2)))
+
+        commands[base + _OP] = op
+        commands[base + _X] = x & 0xffff
+        commands[base + _Y] = y & 0xffff
+        commands[base + _W] = w
+        commands[base + _H] = h
+        commands[base + _COLOR] = color
+        self.count += 1
+
+        if op == _OP_TEXT:
+            w, h = self._texts[w][5], self._texts[w][6]
+        self._x0 = min(self._x0, x)
+        self._y0 = min(self._y0, y)
+        self._x1 = max(self._x1, x + w)
+        self._y1 = max(self._y1, y + h)
+
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Recording ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def fill_rect(self, x, y, w, h, color):
+        """Record a filled rectangle."""
+        if w > 0 and h > 0:
+            self._add(_OP_FILL_RECT, x, y, w, h, self.display._format_color(color))
+
+
+    def rect(self, x, y, w, h, color, fill=False):
+        """Record a rectangle (like Display.rect)."""
+        if fill:
+            self.fill_rect(x, y, w, h, color)
+            return
+        # an outline is recorded as 4 filled rectangles
+        self.fill_rect(x, y, w, 1, color)
+        self.fill_rect(x, y + h - 1, w, 1, color)
+        self.fill_rect(x, y + 1, 1, h - 2, color)
+        self.fill_rect(x + w - 1, y + 1, 1, h - 2, color)
+
+
+    def hline(self, x, y, length, color):
+        """Record a horizontal line."""
+        self.fill_rect(x, y, length, 1, color)
+
+
+    def vline(self, x, y, length, color):
+        """Record a vertical line."""
+        self.fill_rect(x, y, 1, length, color)
+
+
+    def pixel(self, x, y, color):
+        """Record a single pixel."""
+        self.fill_rect(x, y, 1, 1, color)
+
+
+    def fill(self, color):
+        """Record filling the whole display."""
+        self.fill_rect(0, 0, self.display.width, self.display.height, color)
+        self._has_fill = True
+
+
+    def text(self, text, x, y, color, font=None):
+        """
+        Record text (drawn with Display.text).
+        Text is drawn in order with the other commands, between viper passes.
+        """
+        height = font.HEIGHT if font else 8
+        self._texts.append((text, x, y, color, font, self.display.text_width(text, font), height))
+        self._add(_OP_TEXT, x, y, len(self._texts) - 1, 0, 0)
+
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Drawing ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def draw(self):
+        """Draw all the recorded commands to the display's framebuffer."""
+        count = self.count
+        if not count:
+            return
+        display = self.display
+        commands = self._commands
+        # (text marks its own area as it's drawn)
+        if count <= _MAX_COMMAND_RECTS:
+            # mark each command's area, so that small shapes far apart don't send everything between them
+            for idx in range(count):
+                base = idx * _FIELDS
+                if commands[base + _OP] != _OP_TEXT:
+                    x = _signed(commands[base + _X])
+                    y = _signed(commands[base + _Y])
+                    display._set_show_rect(x, y, x + commands[base + _W], y + commands[base + _H])
+        else:
+            # one dirty rect update for everything
+            display._set_show_rect(self._x0, self._y0, self._x1, self._y1)
+        if self._has_fill:
+            display.fill_count += 1
+
+        idx = 0
+        while idx < count:
+            idx = _execute(display.fbuf, display.width, display.height, self._fmt, commands, idx, count)
+            if idx < count:
+                text, x, y, color, font, _, _ = self._texts[commands[idx * _FIELDS + _W]]
+                display.text(text, x, y, color, font)
+                idx += 1
@@ -23,6 +23,9 @@ _MH_DISPLAY_DC = const(34)
 _MH_DISPLAY_BACKLIGHT = const(38) 
 _MH_DISPLAY_ROTATION = const(1)
 
+# hardware timer used to send double buffered frames in the background
+_FLUSH_TIMER_ID = const(3)
+
 
 class Display(st7789.ST7789):
 
@@ -34,7 +37,7 @@ class Display(st7789.ST7789):
         return cls.instance
 
 
-    def __init__(self, use_tiny_buf=False, **kwargs):
+    def __init__(self, use_tiny_buf=False, double_buffer=False, **kwargs):
         # mh_if TDECK:
         # # Enable Peripherals:
         # machine.Pin(10, machine.Pin.OUT, value=1)
@@ -42,6 +45,17 @@ class Display(st7789.ST7789):
 
         if hasattr(self, 'fbuf'):
             print("WARNING: Display re-initialized.")
+
+        # double buffered frames are sent in the background using a timer
+        # mh_if TDECK:
+        # # ...except on the T-Deck, where the display shares its SPI bus with the SD card.
+        # # The timer could fire in the middle of an SD transfer, so frames are only sent
+        # # from the main thread (by show, wait_for_flush, or show_async).
+        # mh_else:
+        if double_buffer and 'flush_timer' not in kwargs:
+            kwargs['flush_timer'] = machine.Timer(_FLUSH_TIMER_ID)
+        # mh_end_if
+
         super().__init__(
             machine.SPI(
                 _MH_DISPLAY_SPI_ID,
@@ -59,6 +73,7 @@ class Display(st7789.ST7789):
             rotation=_MH_DISPLAY_ROTATION,
             color_order="BGR",
             use_tiny_buf=use_tiny_buf,
+            double_buffer=double_buffer,
             **kwargs,
             )
 
@@ -77,6 +92,6 @@ class Display(st7789.ST7789):
             callback(self)
         
 
-    def show(self):
+    def show(self, wait=True):
         self._draw_overlays()
-        super().show()
+        super().show(wait)
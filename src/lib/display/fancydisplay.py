@@ -2,140 +2,375 @@
 This module provides the FancyDisplay class, which subclasses the Display class
 This module is intended to provide extra graphics drawing for apps who need it,
 while keeping the regular Display class (relatively) lightweight.
+
+All of the point transformations here use integer (fixed point) math, and lookup tables for sine and easing.
 """
 
 from . import Display
 import array
-from math import sin, cos, floor
+from math import sin, cos, sqrt, pi
+
+
+# Fixed point values are stored with 14 fractional bits. (1.0 == 16384)
+_FIX_SHIFT = const(14)
+_FIX_ONE = const(16384)
+
+# The sine table holds one full circle
+_SIN_STEPS = const(1024)
+_SIN_MASK = const(1023)
+_QUARTER_TURN = const(256)
+
+# Easing tables hold 0.0 - 1.0 (inclusive) in _EASE_STEPS steps
+_EASE_STEPS = const(256)
+_EASE_SHIFT = const(6) # _FIX_SHIFT - log2(_EASE_STEPS)
 
+# warp_points flags
+_WARP_EASE = const(1)
+_WARP_FOCUS_CENTER_X = const(2)
 
 
-def ease_in_out_sine(x):
-    return -(cos(pi * x) - 1) / 2
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Lookup tables ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# These are only calculated once, when the module is imported.
+_SIN_TABLE = array.array(
+    'h', (round(sin(i * 2 * pi / _SIN_STEPS) * _FIX_ONE) for i in range(_SIN_STEPS))
+    )
 
 
-def ease_in_out_circ(x):
+def _ease_in_out_sine(x):
+    return (1 - cos(pi * x)) / 2
+
+
+def _ease_in_out_circ(x):
     if x < 0.5:
-        return (1 - sqrt(1 - pow(2 * x, 2))) / 2
-    else:
-        return (sqrt(1 - pow(-2 * x + 2, 2)) + 1) / 2
+        return (1 - sqrt(1 - (2 * x) ** 2)) / 2
+    return (sqrt(1 - (-2 * x + 2) ** 2) + 1) / 2
+
+
+_EASE_SINE_TABLE = array.array(
+    'h', (round(_ease_in_out_sine(i / _EASE_STEPS) * _FIX_ONE) for i in range(_EASE_STEPS + 1))
+    )
+_EASE_CIRC_TABLE = array.array(
+    'h', (round(_ease_in_out_circ(i / _EASE_STEPS) * _FIX_ONE) for i in range(_EASE_STEPS + 1))
+    )
+
+
+def angle_to_index(angle) -> int:
+    """Convert an angle (in radians) to an index in the sine table."""
+    return round(angle * _SIN_STEPS / (2 * pi)) & _SIN_MASK
+
+
+def sin_fixed(index:int) -> int:
+    """Fixed point sine of a sine table index. (1.0 == 16384)"""
+    return _SIN_TABLE[index & _SIN_MASK]
+
+
+def cos_fixed(index:int) -> int:
+    """Fixed point cosine of a sine table index. (1.0 == 16384)"""
+    return _SIN_TABLE[(index + _QUARTER_TURN) & _SIN_MASK]
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Transform ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class Transform:
+    """
+    A 2D affine transform matrix, stored in fixed point.
+
+    Calls to rotate, scale, and translate are combined into one matrix,
+    so that `apply` can transform the points in a single pass.
+    Each call is applied after the ones before it. For example:
+    ```
+    matrix = Transform().scale(2.0).rotate(0.5, 10, 10).translate(5, 0)
+    matrix.apply(points, out)
+    ```
+    """
+    def __init__(self):
+        # a, b, c, d, tx, ty  ->  x' = a*x + b*y + tx,  y' = c*x + d*y + ty
+        self.matrix = [_FIX_ONE, 0, 0, _FIX_ONE, 0, 0]
+
+
+    def reset(self):
+        """Reset to the identity matrix. Returns self."""
+        mat = self.matrix
+        mat[0] = _FIX_ONE
+        mat[1] = 0
+        mat[2] = 0
+        mat[3] = _FIX_ONE
+        mat[4] = 0
+        mat[5] = 0
+        return self
+
+
+    def _combine(self, a, b, c, d, tx, ty):
+        """Apply the given fixed point matrix after the current one."""
+        mat = self.matrix
+        a1, b1, c1, d1, tx1, ty1 = mat
+        mat[0] = (a * a1 + b * c1) >> _FIX_SHIFT
+        mat[1] = (a * b1 + b * d1) >> _FIX_SHIFT
+        mat[2] = (c * a1 + d * c1) >> _FIX_SHIFT
+        mat[3] = (c * b1 + d * d1) >> _FIX_SHIFT
+        mat[4] = ((a * tx1 + b * ty1) >> _FIX_SHIFT) + tx
+        mat[5] = ((c * tx1 + d * ty1) >> _FIX_SHIFT) + ty
+        return self
+
+
+    def translate(self, x, y):
+        """Move the points by (x, y). Returns self."""
+        x = int(x)
+        y = int(y)
+        return self._combine(_FIX_ONE, 0, 0, _FIX_ONE, x << _FIX_SHIFT, y << _FIX_SHIFT)
+
+
+    def scale(self, scale_x, scale_y=None, center_x=0, center_y=0):
+        """Scale the points around (center_x, center_y). Returns self."""
+        if scale_y is None:
+            scale_y = scale_x
+        sx = int(scale_x * _FIX_ONE)
+        sy = int(scale_y * _FIX_ONE)
+        center_x = int(center_x)
+        center_y = int(center_y)
+        return self._combine(
+            sx, 0, 0, sy,
+            (center_x << _FIX_SHIFT) - center_x * sx,
+            (center_y << _FIX_SHIFT) - center_y * sy,
+            )
+
+
+    def rotate(self, angle, center_x=0, center_y=0):
+        """Rotate the points (by angle radians) around (center_x, center_y). Returns self."""
+        index = angle_to_index(angle)
+        cos_a = cos_fixed(index)
+        sin_a = sin_fixed(index)
+        center_x = int(center_x)
+        center_y = int(center_y)
+        return self._combine(
+            cos_a, -sin_a, sin_a, cos_a,
+            (center_x << _FIX_SHIFT) - center_x * cos_a + center_y * sin_a,
+            (center_y << _FIX_SHIFT) - center_x * sin_a - center_y * cos_a,
+            )
+
+
+    def apply(self, points, out=None):
+        """
+        Transform all the points in the array, and write them to out.
+        (out can be the same array as points, and is created if not given.)
+        Returns out.
+        """
+        if out is None:
+            out = array.array('h', bytes(len(points) * 2))
+        _transform_points(points, out, *self.matrix)
+        return out
+
 
 
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Viper kernels ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+@micropython.viper
+def _transform_points(points, out, a:int, b:int, c:int, d:int, tx:int, ty:int):
+    """Apply a fixed point matrix to every point, writing the results to out."""
+    in_ptr = ptr16(points)
+    out_ptr = ptr16(out)
+    points_len = int(len(points))
 
+    idx = 0
+    while idx < points_len:
+        # ptr16 reads are unsigned, so restore the sign
+        px = in_ptr[idx]
+        if px & 0x8000:
+            px -= 0x10000
+        py = in_ptr[idx + 1]
+        if py & 0x8000:
+            py -= 0x10000
+        out_ptr[idx] = (a * px + b * py + tx) >> _FIX_SHIFT
+        out_ptr[idx + 1] = (c * px + d * py + ty) >> _FIX_SHIFT
+        idx += 2
+
+
+@micropython.viper
+def _rotate_points(points, out, cos_a:int, sin_a:int, center_x:int, center_y:int):
+    """Rotate every point around the center (using fixed point sin/cos), writing the results to out."""
+    in_ptr = ptr16(points)
+    out_ptr = ptr16(out)
+    points_len = int(len(points))
+
+    idx = 0
+    while idx < points_len:
+        px = in_ptr[idx]
+        if px & 0x8000:
+            px -= 0x10000
+        py = in_ptr[idx + 1]
+        if py & 0x8000:
+            py -= 0x10000
+        px -= center_x
+        py -= center_y
+        out_ptr[idx] = center_x + ((px * cos_a - py * sin_a) >> _FIX_SHIFT)
+        out_ptr[idx + 1] = center_y + ((px * sin_a + py * cos_a) >> _FIX_SHIFT)
+        idx += 2
+
+
+@micropython.viper
+def _copy_points(points, out):
+    """Copy every point to out, unchanged."""
+    in_ptr = ptr16(points)
+    out_ptr = ptr16(out)
+    points_len = int(len(points))
+
+    idx = 0
+    while idx < points_len:
+        out_ptr[idx] = in_ptr[idx]
+        idx += 1
+
+
+@micropython.viper
+def _scale_points(points, out, scale:int):
+    """Scale every point (by a fixed point scale), writing the results to out."""
+    in_ptr = ptr16(points)
+    out_ptr = ptr16(out)
+    points_len = int(len(points))
+
+    idx = 0
+    while idx < points_len:
+        val = in_ptr[idx]
+        if val & 0x8000:
+            val -= 0x10000
+        out_ptr[idx] = (val * scale) >> _FIX_SHIFT
+        idx += 1
+
+
+@micropython.viper
+def _warp_points(points, out, smallest:int, largest:int, tilt_center:int, flags:int):
+    """
+    Skew the y value of every point, writing the results to out.
+    tilt_center is fixed point, and flags holds _WARP_EASE and _WARP_FOCUS_CENTER_X.
+    """
+    in_ptr = ptr16(points)
+    out_ptr = ptr16(out)
+    sine_ptr = ptr16(_EASE_SINE_TABLE)
+    circ_ptr = ptr16(_EASE_CIRC_TABLE)
+    points_len = int(len(points))
+
+    span = largest - smallest
+    if span <= 0:
+        # all the points are level, so there's nothing to warp
+        if out is not points:
+            _copy_points(points, out)
+        return
+
+    # where the midpoint is moved to, and the distance from there to the largest value
+    new_midpoint = (span * tilt_center) >> _FIX_SHIFT
+    upper_span = span - new_midpoint
+
+    idx = 0
+    while idx < points_len:
+        x_val = in_ptr[idx]
+        if x_val & 0x8000:
+            x_val -= 0x10000
+        point = in_ptr[idx + 1]
+        if point & 0x8000:
+            point -= 0x10000
+        # the x value is copied unchanged
+        out_ptr[idx] = x_val
+
+        # find the factor between 0 and the midpoint, or the midpoint and largest
+        adj_point = point - smallest
+        lower = adj_point * 2 < span
+        if lower:
+            factor = (adj_point << (_FIX_SHIFT + 1)) // span
+        else:
+            factor = ((adj_point * 2 - span) << _FIX_SHIFT) // span
+        if factor < 0:
+            factor = 0
+        elif factor > _FIX_ONE:
+            factor = _FIX_ONE
+        if flags & _WARP_EASE:
+            # fancy easing function to round out the shape more
+            factor = sine_ptr[factor >> _EASE_SHIFT]
+
+        # then interpolate between 0 and the new midpoint, or the new midpoint and largest
+        if lower:
+            result = ((new_midpoint * factor) >> _FIX_SHIFT) + smallest
+        else:
+            result = ((upper_span * factor) >> _FIX_SHIFT) + new_midpoint + smallest
+
+        if flags & _WARP_FOCUS_CENTER_X:
+            # apply the effect more strongly to points nearer to the center x
+            center_factor = (x_val - smallest) * 2 - span
+            if center_factor < 0:
+                center_factor = -center_factor
+            center_factor = (center_factor << _FIX_SHIFT) // span
+            if center_factor > _FIX_ONE:
+                center_factor = _FIX_ONE
+            center_factor = circ_ptr[center_factor >> _EASE_SHIFT]
+            # mix between the warped and original point
+            result = (result * (_FIX_ONE - center_factor) + point * center_factor) >> _FIX_SHIFT
+
+        out_ptr[idx + 1] = result
+        idx += 2
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ FancyDisplay ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 class FancyDisplay(Display):
-    
 
-    @micropython.viper
+    # reused for transformed polygons (replaced when a different length is needed)
+    _poly_buf = array.array('h')
+    _poly_transform = Transform()
+
+
     @staticmethod
-    def scale_poly(points, scale_pct:int):
+    def scale_poly(points, scale_pct, out=None):
         """
-        Resize all the points in the array. Returns None.
+        Resize all the points in the array (by a percentage).
+        Writes to `out` if given, or modifies `points` in place. Returns None.
         """
-        point_ptr = ptr16(points)
-        points_len = int(len(points))
-        
-        idx = 0
-        while idx < points_len:
-            # scale using integer math for speed
-            point_ptr[idx] = (point_ptr[idx] * scale_pct) // 100
-            idx += 1
+        if out is None:
+            out = points
+        _scale_points(points, out, (scale_pct * _FIX_ONE) // 100)
 
 
     @staticmethod
-    def rotate_points(points, angle=0, center_x=0, center_y=0):
+    def rotate_points(points, angle=0, center_x=0, center_y=0, out=None):
         """
-        Rotate all the points in the array, return resulting array.
+        Rotate all the points in the array (by angle radians), and return the resulting array.
+        Writes to `out` if given, otherwise a new array is created.
         """
-        if angle:
-            cos_a = cos(angle)
-            sin_a = sin(angle)
-            rotated = array.array('h')
-            for i in range(0,len(points),2):
-                rotated.append(
-                    center_x + floor((points[i] - center_x) * cos_a - (points[i+1] - center_y) * sin_a)
-                )
-                rotated.append(
-                    center_y + floor((points[i] - center_x) * sin_a + (points[i+1] - center_y) * cos_a)    
-                )
-            return rotated
-        else:
-            return points
+        if not angle:
+            if out is None:
+                return points
+            _copy_points(points, out)
+            return out
+        if out is None:
+            out = array.array('h', bytes(len(points) * 2))
+        index = angle_to_index(angle)
+        _rotate_points(points, out, cos_fixed(index), sin_fixed(index), int(center_x), int(center_y))
+        return out
 
 
     @staticmethod
-    def warp_points(points, tilt_center=0.5, ease=True, focus_center_x=True, smallest=None, largest=None):
+    def warp_points(
+            points,
+            tilt_center=0.5,
+            ease=True,
+            focus_center_x=True,
+            smallest=None,
+            largest=None,
+            out=None):
         """
         Skew points on the y axis. Can create a faux 3d looking effect, or a kinda jelly-like effect.
+        Writes to `out` if given, or modifies `points` in place. Returns the resulting array.
         """
+        if out is None:
+            out = points
         if tilt_center == 0.5 and not ease:
-            return points
-        
-        if smallest == None:
+            if out is not points:
+                _copy_points(points, out)
+            return out
+
+        if smallest is None:
             smallest = min(points)
-        if largest == None:
+        if largest is None:
             largest = max(points)
-
-        midpoint = (smallest + largest) / 2
-        #shift numbers so that the smallest point = 0
-        adj_largest = largest - smallest
-        adj_midpoint = adj_largest / 2
-        new_adj_midpoint = adj_largest * tilt_center
-        
-        #shift largest down, (along with newmidpoint), so that newmidpoint = 0
-        #this is done so that we can interpolate between 0 and this number, then re-add the midpoint
-        temp_largest = adj_largest - new_adj_midpoint
-        
-        #iterate over each point
-        # if point is less than midpoint, interpolate point between 0 and new midpoint
-        # if point is greater than midpoint, interpolate between new midpoint and largest
-        # then add the smallest value back to the result, to shift the result into the original range
-        #for index, point in enumerate(points):
-        for index in range(1,len(points),2):
-            point=points[index]
-            
-            if focus_center_x:
-                #if focus_center_x, then apply the effect more strongly to points nearer to the center x
-                adj_x_val = points[index-1] - smallest
-                x_center_factor = abs(adj_x_val - adj_midpoint ) / adj_midpoint
-                x_center_factor = ease_in_out_circ(x_center_factor)
-            
-            if point < midpoint:
-                #find fac between 0 and adj_midpoint,
-                #then interpolate between 0 and new midpoint
-                adj_point = point - smallest
-                factor = adj_point / adj_midpoint
-                
-                #fancy easing function to round out the shape more
-                factor = ease_in_out_sine(factor)
-                
-                if focus_center_x:
-                    points[index] = floor(
-                        mix(
-                            (new_adj_midpoint * factor) + smallest, points[index], x_center_factor
-                            ))
-                else:
-                    points[index] = floor((new_adj_midpoint * factor) + smallest)
-
-
-            else: # point >= midpoint:
-                #find fac between adj_midpoint and adj_largest,
-                #then interpolate between new midpoint and largest
-                adj_point = point - smallest
-                factor = (adj_point - adj_midpoint) / (adj_largest - adj_midpoint)
-                
-                #fancy easing function to round out the shape more
-                factor = ease_in_out_sine(factor)
-                
-                if focus_center_x:
-                    points[index] = floor(
-                        mix(
-                            (temp_largest * factor) + new_adj_midpoint + smallest,points[index],x_center_factor
-                            )
-                        )
-                else:
-                    points[index] = floor((temp_largest * factor) + new_adj_midpoint + smallest)       
-                
-        return points
+        flags = (_WARP_EASE if ease else 0) | (_WARP_FOCUS_CENTER_X if focus_center_x else 0)
+        _warp_points(points, out, smallest, largest, round(tilt_center * _FIX_ONE), flags)
+        return out
 
 
     def polygon(self, points, x, y, color, angle=0, center_x=None, center_y=None, scale=1.0, warp=None, fill=False):
@@ -150,32 +385,38 @@ class FancyDisplay(Display):
             angle (float): Rotation angle in radians (default: 0).
             center_x (int): X-coordinate of the rotation center (default: 0).
             center_y (int): Y-coordinate of the rotation center (default: 0).
+            scale (float|Transform): Scale factor, or a Transform to apply instead of angle and scale.
+            warp (float): Optional tilt center for `warp_points`.
         """
-        
+
         # super().polygon wrapper
-        if angle == 0 and scale == 1.0 and warp == None:
+        if angle == 0 and scale == 1.0 and warp is None:
             super().polygon(points, x, y, color, fill=fill)
-        
-        #complex polygon
+            return
+
+        # complex polygon
+        # (write to a reused buffer so we don't modify the original)
+        out = self._poly_buf
+        if len(out) != len(points):
+            out = array.array('h', bytes(len(points) * 2))
+            self._poly_buf = out
+
+        if isinstance(scale, Transform):
+            scale.apply(points, out)
         else:
-            #clone array so we don't modify original
-            points = array.array('h', points)
-            
-            #scale
+            # scale and rotate in one pass
+            matrix = self._poly_transform.reset()
             if scale != 1.0:
-                # (convert scale to integer percentage for speed)
-                self.scale_poly(points, int(scale * 100))
-
-            #rotate
+                matrix.scale(scale)
             if angle != 0:
-                if center_x == None:
-                    center_x = max(points) // 2
-                if center_y == None:
-                    center_y = max(points) // 2
-                points = self.rotate_points(points, angle, center_x, center_y)
-                
-            if warp != None:
-                self.warp_points(points, warp)
-            
-            super().polygon(points, x, y, color, fill=fill)
+                if center_x is None:
+                    center_x = int(max(points) * scale) // 2
+                if center_y is None:
+                    center_y = int(max(points) * scale) // 2
+                matrix.rotate(angle, center_x, center_y)
+            matrix.apply(points, out)
+
+        if warp is not None:
+            self.warp_points(out, warp)
 
+        super().polygon(out, x, y, color, fill=fill)
@@ -0,0 +1,151 @@
+"""
+Off-screen layers for MicroHydra's Display.
+
+A Layer is a buffer in the same format as the Display's framebuffer (GS4, GS8, or RGB565),
+which can hold a copy of part of the screen.
+This makes it cheap to redraw static content: draw it once, `capture()` it,
+and then `restore()` it (a fast row-by-row copy) instead of drawing it again.
+It can also be used to save what is underneath a popup, and put it back when the popup closes.
+
+Example:
+```
+from lib.display import Display
+from lib.display.layer import Layer
+
+display = Display()
+# draw the static background once
+display.fill(display.palette[2])
+display.text("Title", 10, 4, display.palette[8])
+background = Layer(display)
+background.capture()
+
+while True:
+    background.restore()
+    # ... draw dynamic content ...
+    display.show()
+```
+"""
+
+
+@micropython.viper
+def _copy_rows(source, source_start:int, source_stride:int, target, target_start:int, target_stride:int, row_bytes:int, rows:int):
+    """Copy `rows` rows of `row_bytes` bytes between buffers with different strides."""
+    # copy 32 bits at a time when everything is aligned
+    if (source_start | source_stride | target_start | target_stride | row_bytes) & 3 == 0:
+        source32 = ptr32(source)
+        target32 = ptr32(target)
+        source_start >>= 2
+        source_stride >>= 2
+        target_start >>= 2
+        target_stride >>= 2
+        row_words = row_bytes >> 2
+        row = 0
+        while row < rows:
+            source_idx = source_start + row * source_stride
+            target_idx = target_start + row * target_stride
+            end = source_idx + row_words
+            while source_idx < end:
+                target32[target_idx] = source32[source_idx]
+                source_idx += 1
+                target_idx += 1
+            row += 1
+        return
+
+    source8 = ptr8(source)
+    target8 = ptr8(target)
+    row = 0
+    while row < rows:
+        source_idx = source_start + row * source_stride
+        target_idx = target_start + row * target_stride
+        end = source_idx + row_bytes
+        while source_idx < end:
+            target8[target_idx] = source8[source_idx]
+            source_idx += 1
+            target_idx += 1
+        row += 1
+
+
+
+class Layer:
+    """
+    A copy of a rectangle of the Display's framebuffer.
+
+    Args:
+        display (Display): The display to copy from/to.
+        x, y (int): Top left corner of the layer.
+        width, height (int|None): Size of the layer (defaults to the rest of the display).
+
+    When the display uses `use_tiny_buf`, the layer's x and width are rounded to even numbers
+    (two pixels share each byte).
+    """
+    def __init__(self, display, x=0, y=0, width=None, height=None):
+        self.display = display
+        if width is None:
+            width = display.width - x
+        if height is None:
+            height = display.height - y
+
+        if display.use_tiny_buf:
+            # align to whole bytes
+            width += x & 1
+            x &= ~1
+            width += width & 1
+            self._bytes_per_px = 0 # (half a byte)
+        elif display.use_gs8_buf:
+            self._bytes_per_px = 1
+        else:
+            self._bytes_per_px = 2
+
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.buf = bytearray(self._row_bytes(width) * height)
+
+
+    def _row_bytes(self, width:int) -> int:
+        return width * self._bytes_per_px if self._bytes_per_px else width // 2
+
+
+    def _copy(self, x, y, width, height, to_display):
+        """Copy part of the layer (given in display coordinates) to or from the display."""
+        # clip to the layer
+        x0 = max(x, self.x)
+        y0 = max(y, self.y)
+        x1 = min(x + width, self.x + self.width)
+        y1 = min(y + height, self.y + self.height)
+        if self._bytes_per_px == 0:
+            x0 &= ~1
+            x1 += x1 & 1
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        display = self.display
+        # (GS4 rows are padded to a whole byte, so an odd width has an extra half byte)
+        display_stride = self._row_bytes(display.width + (display.width & 1))
+        layer_stride = self._row_bytes(self.width)
+        display_start = y0 * display_stride + self._row_bytes(x0)
+        layer_start = (y0 - self.y) * layer_stride + self._row_bytes(x0 - self.x)
+        row_bytes = self._row_bytes(x1 - x0)
+
+        if to_display:
+            _copy_rows(self.buf, layer_start, layer_stride, display.fbuf, display_start, display_stride, row_bytes, y1 - y0)
+            display._set_show_rect(x0, y0, x1, y1)
+        else:
+            _copy_rows(display.fbuf, display_start, display_stride, self.buf, layer_start, layer_stride, row_bytes, y1 - y0)
+
+
+    def capture(self):
+        """Copy the layer's area of the display's framebuffer into the layer."""
+        self._copy(self.x, self.y, self.width, self.height, False)
+
+
+    def restore(self, x=None, y=None, width=None, height=None):
+        """
+        Copy the layer back onto the display (marking it to be shown).
+        If a rectangle is given, only that part of the layer is restored.
+        """
+        if x is None:
+            self._copy(self.x, self.y, self.width, self.height, True)
+        else:
+            self._copy(x, y, width, height, True)
@@ -0,0 +1,77 @@
+"""
+This module provides a small, bounded cache that discards the least recently used items.
+
+It's used by the display driver to keep frequently drawn glyphs ready to use,
+without letting the cache grow without limit.
+"""
+
+
+class LRUCache:
+    """
+    Bounded key/value cache.
+
+    Eviction uses the "clock" approximation of LRU: keys are kept in a fixed ring,
+    and a hand sweeps the ring, giving recently used items a second chance.
+    This keeps `put` O(1) (amortized), instead of scanning every item to find the oldest.
+
+    Args:
+        max_items (int): The maximum number of items to store.
+    """
+    def __init__(self, max_items):
+        self.max_items = max_items
+        # each entry is stored as [value, recently_used] (so that hits don't allocate)
+        self._entries = {}
+        self._ring = [None] * max_items
+        self._hand = 0
+
+
+    def get(self, key, default=None):
+        """Return the value for key (marking it as recently used), or default."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        entry[1] = True
+        return entry[0]
+
+
+    def put(self, key, value):
+        """Store a value, discarding a least recently used item if the cache is full."""
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is not None:
+            entry[0] = value
+            entry[1] = True
+            return
+
+        ring = self._ring
+        hand = self._hand
+        max_items = self.max_items
+        # sweep until a free slot, or an item that hasn't been used since the last sweep
+        while True:
+            old_key = ring[hand]
+            if old_key is None:
+                break
+            old_entry = entries[old_key]
+            if not old_entry[1]:
+                del entries[old_key]
+                break
+            old_entry[1] = False
+            hand = (hand + 1) % max_items
+
+        ring[hand] = key
+        entries[key] = [value, False]
+        self._hand = (hand + 1) % max_items
+
+
+    def clear(self):
+        self._entries = {}
+        self._ring = [None] * self.max_items
+        self._hand = 0
+
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+    def __len__(self):
+        return len(self._entries)
@@ -8,15 +8,44 @@ Key notes on Palette:
 
   - Returns an RGB565 color when using normal framebuffer, or an index of the color if use_tiny_buf.
     (This makes it so that you can pass a `Palette[i]` to the Display class in either mode.)
+
+  - Has 16 colors, or 256 after `extend()` (used by the Display's 8-bit "use_gs8_buf" mode).
+    The extra colors are a gradient (filled in by Config.generate_palette) and a 6x6x6 RGB cube.
     
   - Palette is a singleton, which is important so that different MH classes can modify and share it's data
     (without initializing the Display).
+
+  - Keeps a version number, which changes whenever a color is changed.
+    This is used to cache the tables the Display needs for converting indexed framebuffers
+    (a byte-swapped copy of the colors, and a GS4 "pair table"),
+    so that they're only rebuilt when the palette has actually changed.
 """
+import array
+
+# extended (256 color) palette layout
+_BASE_COLORS = const(16)
+_EXTENDED_COLORS = const(256)
+# a smooth bg_color -> ui_color gradient
+_GRADIENT_START = const(16)
+_GRADIENT_LEN = const(24)
+# 6 levels each of red, green, and blue
+_CUBE_START = const(40)
+_CUBE_LEVELS = const(6)
+
 
 # Palette class
 class Palette:
     use_tiny_buf = False
     buf = bytearray(32)
+    # incremented every time a color changes
+    _version = array.array('I', (0,))
+    # cached conversion tables (and the versions they were built from)
+    _swapped_buf = None
+    _swapped_version = -1
+    _pair_table = None
+    _pair_version = -1
+    _pair_swap = False
+
     def __new__(cls):
         if not hasattr(cls, 'instance'):
           cls.instance = super(Palette, cls).__new__(cls)
@@ -30,7 +59,11 @@ class Palette:
     @micropython.viper
     def __setitem__(self, key:int, new_val:int):
         buf_ptr = ptr16(self.buf)
-        buf_ptr[key] = new_val
+        new_val &= 0xffff
+        if buf_ptr[key] != new_val:
+            buf_ptr[key] = new_val
+            version_ptr = ptr32(self._version)
+            version_ptr[0] += 1
 
 
     @micropython.viper
@@ -46,3 +79,144 @@ class Palette:
     def __iter__(self):
         for i in range(len(self)):
             yield self[i]
+
+
+    @property
+    def version(self) -> int:
+        """A number that changes whenever a palette color is changed."""
+        return self._version[0]
+
+
+    def swapped_buf(self):
+        """
+        Return a copy of the palette colors with the bytes of each color swapped.
+        The copy is cached, and only rebuilt after the palette changes.
+        """
+        version = self._version[0]
+        if self._swapped_version != version:
+            if self._swapped_buf is None or len(self._swapped_buf) != len(self.buf):
+                self._swapped_buf = bytearray(len(self.buf))
+            self._swap_colors(self.buf, self._swapped_buf, len(self))
+            self._swapped_version = version
+        return self._swapped_buf
+
+
+    def pair_table(self, swap:bool):
+        """
+        Return a table (256 32-bit words) that converts one GS4_HMSB byte into two RGB565 pixels.
+
+        Each word holds the color for the high nibble (the left pixel) in its low half,
+        so that it can be written straight into a little-endian RGB565 buffer.
+        The table is cached, and only rebuilt after the palette changes.
+        """
+        version = self._version[0]
+        if self._pair_version != version or self._pair_swap != swap:
+            if self._pair_table is None:
+                self._pair_table = bytearray(1024)
+            self._fill_pair_table(self.buf, self._pair_table, swap)
+            self._pair_version = version
+            self._pair_swap = swap
+        return self._pair_table
+
+
+    @micropython.viper
+    @staticmethod
+    def _swap_colors(source, target, num_colors:int):
+        source_ptr = ptr16(source)
+        target_ptr = ptr16(target)
+        i = 0
+        while i < num_colors:
+            color = source_ptr[i]
+            target_ptr[i] = ((color & 255) << 8) | (color >> 8)
+            i += 1
+
+
+    @micropython.viper
+    @staticmethod
+    def _fill_pair_table(source, table, swap:bool):
+        source_ptr = ptr16(source)
+        table_ptr = ptr16(table)
+        i = 0
+        while i < 256:
+            left = source_ptr[i >> 4]
+            right = source_ptr[i & 0xf]
+            if swap:
+                left = ((left & 255) << 8) | (left >> 8)
+                right = ((right & 255) << 8) | (right >> 8)
+            table_ptr[i * 2] = left
+            table_ptr[i * 2 + 1] = right
+            i += 1
+
+
+    @property
+    def extended(self) -> bool:
+        return len(self.buf) == _EXTENDED_COLORS * 2
+
+
+    def extend(self):
+        """
+        Grow the palette to 256 colors (keeping the current 16).
+
+        Colors 16-39 are a gradient (grayscale until Config.generate_palette fills it in),
+        and colors 40-255 are a 6x6x6 RGB color cube.
+        """
+        if self.extended:
+            return
+        buf = bytearray(_EXTENDED_COLORS * 2)
+        buf[:_BASE_COLORS * 2] = Palette.buf
+        Palette.buf = buf
+        self._version[0] += 1
+
+        for i in range(_GRADIENT_LEN):
+            level = i * 255 // (_GRADIENT_LEN - 1)
+            self[_GRADIENT_START + i] = self._rgb565(level, level, level)
+
+        i = _CUBE_START
+        for red in range(_CUBE_LEVELS):
+            for green in range(_CUBE_LEVELS):
+                for blue in range(_CUBE_LEVELS):
+                    self[i] = self._rgb565(red * 51, green * 51, blue * 51)
+                    i += 1
+
+
+    @staticmethod
+    def _rgb565(red, green, blue) -> int:
+        return ((red & 0xf8) << 8) | ((green & 0xfc) << 3) | (blue >> 3)
+
+
+    def _raw(self, idx) -> int:
+        """The RGB565 color at idx (regardless of use_tiny_buf)."""
+        return self.buf[idx * 2] | (self.buf[idx * 2 + 1] << 8)
+
+
+    def closest(self, color) -> int:
+        """
+        Find the palette index with the closest color to the given RGB565 color.
+
+        The first 16 colors are searched, and when the palette is extended,
+        the nearest color in the RGB cube is also considered.
+        """
+        red, green, blue = color >> 11, (color >> 5) & 0x3f, color & 0x1f
+        candidates = list(range(_BASE_COLORS))
+        if self.extended:
+            # round each channel to the nearest of the 6 cube levels
+            candidates.append(
+                _CUBE_START
+                + ((red * 5 + 15) // 31) * _CUBE_LEVELS * _CUBE_LEVELS
+                + ((green * 5 + 31) // 63) * _CUBE_LEVELS
+                + ((blue * 5 + 15) // 31)
+                )
+
+        best_idx = 0
+        best_dist = 0x7fffffff
+        for idx in candidates:
+            other = self._raw(idx)
+            dist = (
+                ((red - (other >> 11)) * 2) ** 2
+                + (green - ((other >> 5) & 0x3f)) ** 2
+                + ((blue - (other & 0x1f)) * 2) ** 2
+                )
+            if dist < best_dist:
+                best_idx = idx
+                best_dist = dist
+        return best_idx
@@ -0,0 +1,224 @@
+"""
+A frame timing profiler for MicroHydra's Display.
+
+Once enabled, every call to `Display.show()` records how long was spent in the app
+(since the previous show), in the overlay callbacks, and sending the frame (SPI),
+along with how many rows and pixels were sent.
+
+When the display is double buffered, show() only copies the frame into the front buffer,
+and the frame is sent in chunks afterwards. In that case the copy is recorded separately (copy_us),
+and spi_us is the time spent sending chunks since the previous show.
+A small FPS/ms overlay is drawn in the corner of the screen,
+and the recorded frames can be saved as a CSV file.
+
+Enable it with one line (after the Display has been created):
+```
+from lib.display import profiler; profiler.enable()
+```
+and save the results with `profiler.dump_csv("/sd/profile.csv")`.
+"""
+import time
+import array
+from .display import Display
+
+
+_DEFAULT_FRAMES = const(120)
+
+# values stored per frame
+_FIELDS = const(7)
+_APP_US = const(0)
+_OVERLAY_US = const(1)
+_SHOW_US = const(2)
+_ROWS = const(3)
+_PIXELS = const(4)
+_TICKS_MS = const(5)
+_COPY_US = const(6)
+_CSV_HEADER = "frame,ticks_ms,app_us,overlay_us,spi_us,copy_us,rows,pixels\n"
+
+# overlay
+_OVERLAY_WIDTH = const(98) # 12 characters
+_OVERLAY_HEIGHT = const(10)
+_OVERLAY_PADDING = const(1)
+
+
+
+class Profiler:
+    """
+    Records frame timings by wrapping the Display's show and overlay methods.
+
+    Args:
+        display (Display): The display to profile.
+        frames (int): How many recent frames to keep.
+        overlay (bool): Whether to draw the FPS/ms overlay.
+    """
+    def __init__(self, display, frames=_DEFAULT_FRAMES, overlay=True):
+        self.display = display
+        self.overlay = overlay
+        self.frames = frames
+        # ring buffer of recorded frames
+        self.records = array.array('I', bytes(frames * _FIELDS * 4))
+        self.count = 0
+
+        self._frame_start = time.ticks_us()
+        self._overlay_us = 0
+        self._rows = 0
+        self._pixels = 0
+        self._last_total_us = 0
+
+        # wrap the display's methods (these instance attributes hide the class methods)
+        self._show = display.show
+        self._draw_overlays = display._draw_overlays
+        display.show = self.show
+        display._draw_overlays = self.draw_overlays
+
+        # double buffered frames are sent after show() returns, so the chunks are timed instead
+        self._double_buffered = getattr(display, '_front_view', None) is not None
+        self._flush_us = 0
+        if self._double_buffered:
+            self._flush_step = display._flush_step
+            display._flush_step = self.flush_step
+
+
+    def remove(self):
+        """Stop profiling, and restore the display's original methods."""
+        del self.display.show
+        del self.display._draw_overlays
+        if self._double_buffered:
+            self.display.wait_for_flush()
+            del self.display._flush_step
+
+
+    def draw_overlays(self):
+        """Time the overlay callbacks, then draw the profiler overlay and count what will be sent."""
+        start = time.ticks_us()
+        self._draw_overlays()
+        self._overlay_us = time.ticks_diff(time.ticks_us(), start)
+
+        if self.overlay:
+            self._draw_profiler_overlay()
+
+        rows = 0
+        pixels = 0
+        for x0, y0, x1, y1 in self.display._get_show_windows():
+            rows += y1 - y0
+            pixels += (x1 - x0) * (y1 - y0)
+        self._rows = rows
+        self._pixels = pixels
+
+
+    def _draw_profiler_overlay(self):
+        display = self.display
+        total_us = self._last_total_us
+        fps = 1_000_000 // total_us if total_us else 0
+        x = display.width - _OVERLAY_WIDTH
+        display.rect(x, 0, _OVERLAY_WIDTH, _OVERLAY_HEIGHT, display.palette[0], fill=True)
+        display.text(
+            f"{fps:>3}fps {total_us // 1000:>3}ms",
+            x + _OVERLAY_PADDING, _OVERLAY_PADDING,
+            display.palette[10],
+            )
+
+
+    def flush_step(self):
+        """Time sending one chunk of a double buffered frame."""
+        start = time.ticks_us()
+        more = self._flush_step()
+        self._flush_us += time.ticks_diff(time.ticks_us(), start)
+        return more
+
+
+    def show(self, wait=True):
+        """Time a call to Display.show, and record the frame."""
+        start = time.ticks_us()
+        app_us = time.ticks_diff(start, self._frame_start)
+        self._show(wait)
+        end = time.ticks_us()
+
+        # the show time includes the overlays, so separate them
+        show_us = time.ticks_diff(end, start) - self._overlay_us
+        copy_us = 0
+        if self._double_buffered:
+            # show() copied the frame, and the time spent sending chunks was added up by flush_step.
+            # (the chunks sent during show are part of both, so they're taken out of the copy time)
+            copy_us = max(0, show_us - self._flush_us)
+            show_us = self._flush_us
+            self._flush_us = 0
+        self._last_total_us = time.ticks_diff(end, self._frame_start)
+        self._frame_start = end
+
+        idx = (self.count % self.frames) * _FIELDS
+        records = self.records
+        records[idx + _APP_US] = app_us
+        records[idx + _OVERLAY_US] = self._overlay_us
+        records[idx + _SHOW_US] = show_us
+        records[idx + _COPY_US] = copy_us
+        records[idx + _ROWS] = self._rows
+        records[idx + _PIXELS] = self._pixels
+        records[idx + _TICKS_MS] = time.ticks_ms()
+        self.count += 1
+
+
+    def dump_csv(self, path):
+        """Write the recorded frames (oldest first) to a CSV file."""
+        records = self.records
+        first = max(0, self.count - self.frames)
+        with open(path, 'w') as f:
+            f.write(_CSV_HEADER)
+            for frame in range(first, self.count):
+                idx = (frame % self.frames) * _FIELDS
+                f.write(
+                    f"{frame},{records[idx + _TICKS_MS]},{records[idx + _APP_US]},"
+                    f"{records[idx + _OVERLAY_US]},{records[idx + _SHOW_US]},{records[idx + _COPY_US]},"
+                    f"{records[idx + _ROWS]},{records[idx + _PIXELS]}\n"
+                    )
+
+
+    def print_summary(self):
+        """Print the average and worst frame times."""
+        frames = min(self.count, self.frames)
+        if not frames:
+            print("No frames recorded.")
+            return
+        records = self.records
+        print(f"{'':<12}{'avg':>10}{'max':>10}")
+        for name, field in (
+                ('app us', _APP_US),
+                ('overlay us', _OVERLAY_US),
+                ('spi us', _SHOW_US),
+                ('copy us', _COPY_US),
+                ('rows', _ROWS),
+                ('pixels', _PIXELS)):
+            values = [records[i * _FIELDS + field] for i in range(frames)]
+            print(f"{name:<12}{sum(values) // frames:>10}{max(values):>10}")
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ One-line API ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+_profiler = None
+
+
+def enable(display=None, frames=_DEFAULT_FRAMES, overlay=True) -> Profiler:
+    """
+    Start profiling the display (the Display instance, if not given), and return the Profiler.
+    """
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+    if display is None:
+        display = Display.instance
+    _profiler = Profiler(display, frames, overlay)
+    return _profiler
+
+
+def disable():
+    """Stop profiling."""
+    global _profiler
+    if _profiler is not None:
+        _profiler.remove()
+        _profiler = None
+
+
+def dump_csv(path="/profile.csv"):
+    """Save the recorded frames as a CSV file (e.g. on flash, or "/sd/profile.csv")."""
+    if _profiler is not None:
+        _profiler.dump_csv(path)
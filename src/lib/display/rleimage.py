@@ -0,0 +1,177 @@
+"""
+Compressed (run-length encoded) images for MicroHydra.
+
+RLE images are made with `tools/icons/image_to_rle.py`, and are decoded straight into the
+Display's framebuffer, a small chunk at a time, so even full-screen images can be drawn
+without loading the whole file into RAM.
+
+File format (all values little-endian):
+  - Header: b'MHRL', width (u16), height (u16), number of colors (u8), reserved (u8)
+  - Palette: one RGB565 color (u16) per color (up to 16)
+  - Pixel data: one byte per run, with the palette index in the high nibble,
+    and (run length - 1) in the low nibble. Runs never continue onto the next row.
+
+Example:
+```
+from lib.display import Display
+from lib.display.rleimage import RLEImage
+
+display = Display()
+RLEImage("/sd/splash.rle").draw(display, 0, 0)
+display.show()
+```
+"""
+import struct
+import array
+
+
+_MAGIC = b'MHRL'
+_HEADER_FORMAT = '<4sHHBB'
+_HEADER_BYTES = const(10)
+_MAX_COLORS = const(16)
+_CHUNK_BYTES = const(256)
+
+# decoder state array indices
+_STATE_COL = const(0)
+_STATE_ROW = const(1)
+
+
+
+class RLEImage:
+    """
+    A run-length encoded image, read from a file (or from bytes).
+
+    Args:
+        source (str|bytes): Path to a .rle file, or the file's contents (e.g. from a frozen module).
+        palette (list): Optional colors to draw with, instead of the image's own palette.
+    """
+    def __init__(self, source, palette=None):
+        if isinstance(source, str):
+            self.path = source
+            self.data = None
+            with open(source, 'rb') as f:
+                header = f.read(_HEADER_BYTES)
+                magic, self.width, self.height, num_colors, _ = struct.unpack(_HEADER_FORMAT, header)
+                color_bytes = f.read(num_colors * 2)
+        else:
+            self.path = None
+            self.data = memoryview(source)
+            magic, self.width, self.height, num_colors, _ = struct.unpack_from(_HEADER_FORMAT, source)
+            color_bytes = self.data[_HEADER_BYTES:_HEADER_BYTES + num_colors * 2]
+
+        if magic != _MAGIC or num_colors > _MAX_COLORS:
+            raise ValueError("Not a MicroHydra RLE image.")
+
+        self.colors = struct.unpack(f'<{num_colors}H', color_bytes)
+        self.palette = palette
+        self._data_start = _HEADER_BYTES + num_colors * 2
+
+        # reused for every draw
+        self._display_palette = array.array('H', bytes(_MAX_COLORS * 2))
+        self._state = array.array('i', (0, 0))
+        self._chunk = bytearray(_CHUNK_BYTES) if self.data is None else None
+
+
+    def _format_palette(self, display):
+        """Convert the image colors into values for the display's framebuffer."""
+        display_palette = self._display_palette
+        if self.palette is not None:
+            # user colors are already in the display's format (e.g. Palette[i])
+            for idx, color in enumerate(self.palette):
+                display_palette[idx] = display._format_color(color)
+        elif display.palette.use_tiny_buf:
+            # the framebuffer holds palette indices, so use the closest palette colors
+            for idx, color in enumerate(self.colors):
+                display_palette[idx] = display.palette.closest(color)
+        else:
+            for idx, color in enumerate(self.colors):
+                display_palette[idx] = display._format_color(color)
+
+
+    def draw(self, display, x=0, y=0, key=-1):
+        """
+        Decode the image into the display's framebuffer.
+
+        Args:
+            display (Display): The display to draw to.
+            x (int): Left edge of the image.
+            y (int): Top edge of the image.
+            key (int): Image palette index to treat as transparent (-1 for none).
+        """
+        self._format_palette(display)
+        display._set_show_rect(x, y, x + self.width, y + self.height)
+
+        state = self._state
+        state[_STATE_COL] = 0
+        state[_STATE_ROW] = 0
+
+        if self.data is not None:
+            self._decode(display, self.data, self._data_start, len(self.data), x, y, key)
+            return
+
+        # stream the file one chunk at a time
+        chunk = self._chunk
+        with open(self.path, 'rb') as f:
+            f.seek(self._data_start)
+            while state[_STATE_ROW] < self.height:
+                length = f.readinto(chunk)
+                if not length:
+                    break
+                self._decode(display, chunk, 0, length, x, y, key)
+
+
+    @micropython.viper
+    def _decode(self, display, data, start:int, end:int, x:int, y:int, key:int):
+        """Decode runs from data[start:end] into the framebuffer, continuing from the saved row/col."""
+        data_ptr = ptr8(data)
+        palette = ptr16(self._display_palette)
+        state = ptr32(self._state)
+        width = int(self.width)
+        height = int(self.height)
+
+        fb_width = int(display.width)
+        fb_height = int(display.height)
+        tiny = bool(display.use_tiny_buf)
+        gs8 = bool(display.use_gs8_buf)
+        fb8 = ptr8(display.fbuf)
+        fb16 = ptr16(display.fbuf)
+
+        col = state[_STATE_COL]
+        row = state[_STATE_ROW]
+
+        idx = start
+        while idx < end and row < height:
+            run = data_ptr[idx]
+            idx += 1
+            color_idx = run >> 4
+            run_end = col + (run & 0xf) + 1
+
+            target_y = y + row
+            if color_idx != key and 0 <= target_y < fb_height:
+                clr = palette[color_idx]
+                target_x = x + col
+                row_px = target_y * fb_width
+                while col < run_end:
+                    # dont draw pixels off the screen (ptrs don't check your work!)
+                    if 0 <= target_x < fb_width:
+                        target_px = row_px + target_x
+                        if tiny:
+                            target_idx = target_px >> 1
+                            dest_shift = ((target_px & 1) ^ 1) << 2
+                            fb8[target_idx] = (fb8[target_idx] & (0xf0 >> dest_shift)) | (clr << dest_shift)
+                        elif gs8:
+                            fb8[target_px] = clr
+                        else:
+                            fb16[target_px] = clr
+                    target_x += 1
+                    col += 1
+            else:
+                col = run_end
+
+            # runs never cross rows
+            if col >= width:
+                col = 0
+                row += 1
+
+        state[_STATE_COL] = col
+        state[_STATE_ROW] = row
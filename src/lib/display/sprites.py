@@ -0,0 +1,409 @@
+"""
+Sprites and tile maps for MicroHydra.
+
+This module draws sprite sheets and tile maps straight into the Display's framebuffer
+(using viper), and only redraws the parts of the screen that change from frame to frame.
+Those changed areas are passed on to the Display's dirty tracking,
+so `Display.show()` only sends them to the display.
+
+Sprite sheets are packed bytearrays in the same format as the display's framebuffer:
+- GS4 (when the display uses `use_tiny_buf`): 4 bits per pixel (palette indices),
+  with the left pixel of each pair in the high nibble.
+- GS8 (when the display uses `use_gs8_buf`): 8 bits per pixel (palette indices).
+- RGB565: 16 bits per pixel, in the framebuffer's byte order.
+
+Example:
+```
+from lib.display import Display, sprites
+
+display = Display(use_tiny_buf=True)
+sheet = sprites.SpriteSheet(data, 16, 16, use_tiny_buf=True, key=0)
+scene = sprites.Scene(display, background=display.palette[2])
+player = scene.add(sprites.Sprite(sheet, 10, 10))
+
+while True:
+    player.x += 1
+    scene.draw()
+    display.show()
+```
+"""
+import array
+
+
+# sprite sheet formats
+_FMT_RGB565 = const(0)
+_FMT_GS8 = const(1)
+_FMT_GS4 = const(2)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Viper blits ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+@micropython.viper
+def _blit_frame(fbuf, fb_width:int, sheet, frame:int, x:int, y:int, clip):
+    """
+    Draw one frame of a sprite sheet into a framebuffer at (x, y).
+    Only pixels inside the clip rect (x0, y0, x1, y1) are drawn,
+    and pixels matching the sheet's key are transparent.
+    """
+    clip_ptr = ptr16(clip)
+    width = int(sheet.width)
+    height = int(sheet.height)
+    key = int(sheet.key)
+    fmt = int(sheet.fmt)
+    src8 = ptr8(sheet.data)
+    src16 = ptr16(sheet.data)
+    fb8 = ptr8(fbuf)
+    fb16 = ptr16(fbuf)
+
+    # find the part of the sprite that is inside the clip rect
+    x0 = int(clip_ptr[0])
+    if x > x0:
+        x0 = x
+    y0 = int(clip_ptr[1])
+    if y > y0:
+        y0 = y
+    x1 = int(clip_ptr[2])
+    if x + width < x1:
+        x1 = x + width
+    y1 = int(clip_ptr[3])
+    if y + height < y1:
+        y1 = y + height
+
+    frame_start = frame * width * height
+    # GS4 framebuffer rows are padded to a whole byte
+    fb_stride = (fb_width + 1) >> 1
+
+    row = y0
+    while row < y1:
+        src_px = frame_start + ((row - y) * width) + (x0 - x)
+        dst_px = (row * fb_width) + x0
+        dst_row = row * fb_stride
+        col = x0
+        while col < x1:
+            if fmt == _FMT_GS4:
+                # even pixels are in the high nibble
+                val = (src8[src_px >> 1] >> (((src_px & 1) ^ 1) << 2)) & 0xf
+                if val != key:
+                    dst_shift = ((col & 1) ^ 1) << 2
+                    dst_idx = dst_row + (col >> 1)
+                    fb8[dst_idx] = (fb8[dst_idx] & (0xf0 >> dst_shift)) | (val << dst_shift)
+            elif fmt == _FMT_GS8:
+                val = src8[src_px]
+                if val != key:
+                    fb8[dst_px] = val
+            else:
+                val = src16[src_px]
+                if val != key:
+                    fb16[dst_px] = val
+            src_px += 1
+            dst_px += 1
+            col += 1
+        row += 1
+
+
+@micropython.viper
+def _draw_tiles(fbuf, fb_width:int, tilemap, clip):
+    """Draw the part of a tile map that is inside the clip rect (x0, y0, x1, y1) into a framebuffer."""
+    clip_ptr = ptr16(clip)
+    sheet = tilemap.sheet
+    tile_w = int(sheet.width)
+    tile_h = int(sheet.height)
+    tile_px = tile_w * tile_h
+    fmt = int(sheet.fmt)
+    src8 = ptr8(sheet.data)
+    src16 = ptr16(sheet.data)
+    tiles = ptr8(tilemap.tiles)
+    cols = int(tilemap.cols)
+    map_w = cols * tile_w
+    map_h = int(tilemap.rows) * tile_h
+    scroll_x = int(tilemap.x)
+    scroll_y = int(tilemap.y)
+    fb8 = ptr8(fbuf)
+    fb16 = ptr16(fbuf)
+
+    x0 = int(clip_ptr[0])
+    y0 = int(clip_ptr[1])
+    x1 = int(clip_ptr[2])
+    y1 = int(clip_ptr[3])
+    # GS4 framebuffer rows are padded to a whole byte
+    fb_stride = (fb_width + 1) >> 1
+
+    row = y0
+    while row < y1:
+        # the map wraps around at its edges
+        map_y = (row + scroll_y) % map_h
+        tile_row = (map_y // tile_h) * cols
+        src_row = (map_y % tile_h) * tile_w
+        dst_px = (row * fb_width) + x0
+        dst_row = row * fb_stride
+        col = x0
+        while col < x1:
+            map_x = (col + scroll_x) % map_w
+            src_px = (tiles[tile_row + (map_x // tile_w)] * tile_px) + src_row + (map_x % tile_w)
+            if fmt == _FMT_GS4:
+                val = (src8[src_px >> 1] >> (((src_px & 1) ^ 1) << 2)) & 0xf
+                dst_shift = ((col & 1) ^ 1) << 2
+                dst_idx = dst_row + (col >> 1)
+                fb8[dst_idx] = (fb8[dst_idx] & (0xf0 >> dst_shift)) | (val << dst_shift)
+            elif fmt == _FMT_GS8:
+                fb8[dst_px] = src8[src_px]
+            else:
+                fb16[dst_px] = src16[src_px]
+            dst_px += 1
+            col += 1
+        row += 1
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ SpriteSheet ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class SpriteSheet:
+    """
+    A set of equally sized images (frames), packed into one buffer.
+
+    Args:
+        data (bytearray): Packed frames (GS4, GS8, or RGB565, matching the display's framebuffer).
+        width (int): Width of each frame (must be even for GS4).
+        height (int): Height of each frame.
+        use_tiny_buf (bool): True if data is GS4 (for displays that use the tiny buffer).
+        use_gs8_buf (bool): True if data is GS8 (for displays that use the 8bit buffer).
+        key (int): Pixels with this value are transparent (-1 for none).
+            This is a palette index for GS4/GS8, or a framebuffer (byte-swapped) color for RGB565.
+    """
+    def __init__(self, data, width, height, use_tiny_buf=False, key=-1, use_gs8_buf=False):
+        if use_tiny_buf and use_gs8_buf:
+            raise ValueError("use_tiny_buf and use_gs8_buf can't both be used.")
+        if use_tiny_buf and width % 2:
+            raise ValueError("GS4 sprite sheets must have an even width.")
+        self.data = data
+        self.width = width
+        self.height = height
+        self.use_tiny_buf = use_tiny_buf
+        self.use_gs8_buf = use_gs8_buf
+        self.key = key
+        if use_tiny_buf:
+            self.fmt = _FMT_GS4
+            frame_bytes = (width * height) // 2
+        elif use_gs8_buf:
+            self.fmt = _FMT_GS8
+            frame_bytes = width * height
+        else:
+            self.fmt = _FMT_RGB565
+            frame_bytes = width * height * 2
+        self.frames = len(data) // frame_bytes
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Sprite ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class Sprite:
+    """
+    A movable image, drawn from one frame of a SpriteSheet.
+    Change x, y, frame, or visible, and the Scene redraws it on the next draw().
+    """
+    def __init__(self, sheet, x=0, y=0, frame=0, visible=True):
+        self.sheet = sheet
+        self.x = x
+        self.y = y
+        self.frame = frame
+        self.visible = visible
+
+        # where the sprite was last drawn (so that it can be erased)
+        self._drawn_x = x
+        self._drawn_y = y
+        self._drawn_frame = frame
+        self._drawn = False
+
+
+    def changed(self) -> bool:
+        """Check if the sprite needs to be redrawn."""
+        if not self._drawn:
+            return self.visible
+        return not self.visible \
+            or self.x != self._drawn_x \
+            or self.y != self._drawn_y \
+            or self.frame != self._drawn_frame
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ TileMap ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class TileMap:
+    """
+    A grid of tiles, drawn from a SpriteSheet.
+
+    Args:
+        sheet (SpriteSheet): The tile images.
+        cols (int): Number of tile columns.
+        rows (int): Number of tile rows.
+        tiles (bytearray): Frame index for each tile (row by row). Defaults to all 0.
+
+    Set x/y to scroll the map (it wraps around at the edges),
+    and call Scene.draw(force=True) afterwards.
+    """
+    def __init__(self, sheet, cols, rows, tiles=None):
+        self.sheet = sheet
+        self.cols = cols
+        self.rows = rows
+        self.tiles = tiles if tiles is not None else bytearray(cols * rows)
+        self.x = 0
+        self.y = 0
+
+
+    def __getitem__(self, pos):
+        col, row = pos
+        return self.tiles[row * self.cols + col]
+
+
+    def __setitem__(self, pos, tile):
+        if not 0 <= tile < self.sheet.frames:
+            raise ValueError(f"Tile {tile} is not in the sprite sheet.")
+        col, row = pos
+        self.tiles[row * self.cols + col] = tile
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Scene ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class Scene:
+    """
+    A background (tile map or solid color) with sprites drawn on top, in the order they were added.
+
+    Args:
+        display (Display): The display to draw to.
+        tilemap (TileMap|None): Optional tile map to use as the background.
+        background (int): Background color when there is no tile map.
+    """
+    def __init__(self, display, tilemap=None, background=0):
+        self.display = display
+        if display.use_tiny_buf:
+            self._fmt = _FMT_GS4
+        elif display.use_gs8_buf:
+            self._fmt = _FMT_GS8
+        else:
+            self._fmt = _FMT_RGB565
+        if tilemap is not None:
+            self._check_sheet(tilemap.sheet)
+            if tilemap.tiles and max(tilemap.tiles) >= tilemap.sheet.frames:
+                raise ValueError("Tile map uses tiles that are not in its sprite sheet.")
+        self.tilemap = tilemap
+        self.background = background
+        self.sprites = []
+        self._clip = array.array('H', [0, 0, 0, 0])
+        self._full_redraw = True
+
+
+    def _check_sheet(self, sheet):
+        """Sheets are blitted straight into the framebuffer, so their format must match it."""
+        if sheet.fmt != self._fmt:
+            raise ValueError("Sprite sheet format doesn't match the display's framebuffer.")
+
+
+    @staticmethod
+    def _check_frame(sprite):
+        """The frame is read straight from the sheet's data, so it must be in the sheet."""
+        if not 0 <= sprite.frame < sprite.sheet.frames:
+            raise ValueError(f"Sprite frame {sprite.frame} is not in its sprite sheet.")
+
+
+    def add(self, sprite):
+        """Add a sprite to the top of the scene. Returns the sprite."""
+        self._check_sheet(sprite.sheet)
+        self._check_frame(sprite)
+        self.sprites.append(sprite)
+        return sprite
+
+
+    def remove(self, sprite):
+        """Remove a sprite (erasing it on the next draw)."""
+        sprite.visible = False
+        self.draw()
+        self.sprites.remove(sprite)
+
+
+    @staticmethod
+    def _add_rect(rects, x0, y0, x1, y1):
+        """Add a rect to the list, merging it with any rects it overlaps."""
+        idx = 0
+        while idx < len(rects):
+            rx0, ry0, rx1, ry1 = rects[idx]
+            if x0 <= rx1 and rx0 <= x1 and y0 <= ry1 and ry0 <= y1:
+                # merge and start over (the bigger rect might overlap others)
+                rects.pop(idx)
+                x0 = min(x0, rx0)
+                y0 = min(y0, ry0)
+                x1 = max(x1, rx1)
+                y1 = max(y1, ry1)
+                idx = 0
+            else:
+                idx += 1
+        rects.append((x0, y0, x1, y1))
+
+
+    def draw(self, force=False):
+        """
+        Redraw the parts of the scene that changed since the last draw.
+
+        Args:
+            force (bool): Redraw the whole screen (e.g. after scrolling the tile map).
+        """
+        display = self.display
+        width = display.width
+        height = display.height
+
+        for sprite in self.sprites:
+            if sprite.visible:
+                self._check_frame(sprite)
+
+        rects = []
+        if force or self._full_redraw:
+            rects.append((0, 0, width, height))
+            self._full_redraw = False
+        else:
+            for sprite in self.sprites:
+                if sprite.changed():
+                    sheet = sprite.sheet
+                    if sprite._drawn:
+                        self._add_rect(
+                            rects,
+                            sprite._drawn_x, sprite._drawn_y,
+                            sprite._drawn_x + sheet.width, sprite._drawn_y + sheet.height,
+                            )
+                    if sprite.visible:
+                        self._add_rect(
+                            rects,
+                            sprite.x, sprite.y,
+                            sprite.x + sheet.width, sprite.y + sheet.height,
+                            )
+
+        fbuf = display.fbuf
+        clip = self._clip
+        for x0, y0, x1, y1 in rects:
+            # clip to the screen
+            x0 = max(0, x0)
+            y0 = max(0, y0)
+            x1 = min(width, x1)
+            y1 = min(height, y1)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            clip[0] = x0
+            clip[1] = y0
+            clip[2] = x1
+            clip[3] = y1
+
+            # redraw the background, and then every sprite that overlaps it
+            if self.tilemap is None:
+                display.rect(x0, y0, x1 - x0, y1 - y0, self.background, fill=True)
+            else:
+                _draw_tiles(fbuf, width, self.tilemap, clip)
+
+            for sprite in self.sprites:
+                sheet = sprite.sheet
+                if sprite.visible \
+                and sprite.x < x1 and sprite.x + sheet.width > x0 \
+                and sprite.y < y1 and sprite.y + sheet.height > y0:
+                    _blit_frame(fbuf, width, sheet, sprite.frame, sprite.x, sprite.y, clip)
+
+            display._set_show_rect(x0, y0, x1, y1)
+
+        # remember where everything was drawn
+        for sprite in self.sprites:
+            sprite._drawn_x = sprite.x
+            sprite._drawn_y = sprite.y
+            sprite._drawn_frame = sprite.frame
+            sprite._drawn = sprite.visible
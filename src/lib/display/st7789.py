@@ -58,7 +58,8 @@ This driver supports:
 """
 
 from .palette import Palette
-import framebuf, struct
+from .lrucache import LRUCache
+import framebuf, struct, array
 from time import sleep_ms
 # mh_if frozen:
 # # frozen firmware must access the font as a module, 
@@ -66,6 +67,13 @@ from time import sleep_ms
 # from font.utf8_8x8 import utf8
 # mh_end_if
 
+# mh_if HOST:
+# # on a computer, MicroHydra's files are relative to the working directory
+# _UTF8_FONT_PATH = "font/utf8_8x8.bin"
+# mh_else:
+_UTF8_FONT_PATH = "/font/utf8_8x8.bin"
+# mh_end_if
+
 
 
 # ST7789 commands
@@ -116,6 +124,38 @@ _ENCODE_POS_16 = const("<HH")
 # must be at least 256 for 16 bit wide fonts
 _BUFFER_SIZE = const(256)
 
+# how many separate dirty rectangles to track before falling back to a full-width band
+_MAX_DIRTY_RECTS = const(8)
+# approximate cost (in pixels) of setting up an extra CASET/RASET window
+_DIRTY_RECT_OVERHEAD = const(64)
+
+# default number of full-width lines converted per SPI write when using the tiny buffer
+_TINY_BUF_CHUNK_LINES = const(4)
+
+# default number of bytes sent per step of a background (double buffered) flush
+_FLUSH_CHUNK_BYTES = const(4096)
+# how often (in ms) the flush timer sends the next chunk
+_FLUSH_PERIOD_MS = const(1)
+
+# the ST7789 has 320 rows of display RAM (used for hardware vertical scrolling)
+_ST7789_RAM_ROWS = const(320)
+
+# default max number of cached glyphs (per font) for drawing text with framebuf.blit
+_GLYPH_CACHE_SIZE = const(64)
+# how many color lookup tables to keep for anti-aliased text
+_AA_LUT_CACHE_SIZE = const(8)
+
+# how many recently used utf8 glyphs to keep in RAM (when the utf8 font is read from a file)
+_UTF8_CACHE_SIZE = const(128)
+# size of the reusable buffer used to read utf8 glyphs (nearby glyphs are read together)
+_UTF8_READ_BYTES = const(64)
+
+# The utf8 font is stored in a sparse format (see tools/utf8_util/sparse_font.py):
+# an 8 byte header, then a range index (3 uint16s per range), then the 8 byte glyphs.
+_UTF8_MAGIC = b'MHU8'
+_UTF8_HEADER_BYTES = const(8)
+_UTF8_RANGE_BYTES = const(6)
+
 _BIT7 = const(0x80)
 _BIT6 = const(0x40)
 _BIT5 = const(0x20)
@@ -195,6 +235,92 @@ _ST7789_INIT_CMDS = const((
 
 
 
+class PreparedBitmap:
+    """
+    A bitmap module (like the ones in launcher/icons), converted once into a framebuf-native format.
+
+    Each bitmap in the module becomes its own FrameBuffer (MONO_HLSB for 1-bit images,
+    GS4_HMSB for up to 4 bits, and GS8 otherwise), and the formatted palette is cached in
+    a palette FrameBuffer, so that drawing it is a single `FrameBuffer.blit`.
+
+    Create these using `ST7789.prepare_bitmap`, and draw them using `ST7789.bitmap`.
+    """
+    def __init__(self, display, bitmap, palette=None):
+        self.width = bitmap.WIDTH
+        self.height = bitmap.HEIGHT
+        self._format_color = display._format_color
+
+        bpp = bitmap.BPP
+        if bpp == 1:
+            fmt, target_bpp = framebuf.MONO_HLSB, 1
+        elif bpp <= 4:
+            fmt, target_bpp = framebuf.GS4_HMSB, 4
+        else:
+            fmt, target_bpp = framebuf.GS8, 8
+
+        # framebuf rows start on a new byte, but bitmap module rows don't
+        frame_bytes = ((self.width * target_bpp + 7) // 8) * self.height
+        self.frames = []
+        for index in range(bitmap.BITMAPS):
+            buf = bytearray(frame_bytes)
+            self._convert(
+                bitmap._bitmap, buf,
+                index * self.width * self.height * bpp,
+                self.width, self.height, bpp, target_bpp,
+                )
+            self.frames.append(framebuf.FrameBuffer(buf, self.width, self.height, fmt))
+
+        # the palette needs an entry for every possible pixel value
+        self.palette = framebuf.FrameBuffer(
+            bytearray(2 << target_bpp), 1 << target_bpp, 1, framebuf.RGB565,
+            )
+        self._palette_src = None
+        self.set_palette(bitmap.PALETTE if palette is None else palette)
+
+
+    def set_palette(self, palette):
+        """Set the colors used to draw the bitmap. (Only reformatted if the colors have changed.)"""
+        palette = tuple(palette)
+        if palette == self._palette_src:
+            return
+        self._palette_src = palette
+        for idx, color in enumerate(palette):
+            self.palette.pixel(idx, 0, self._format_color(color))
+
+
+    @micropython.viper
+    @staticmethod
+    def _convert(source, target, start_bit:int, width:int, height:int, bpp:int, target_bpp:int):
+        """Unpack one bitmap from a bitmap module, into MSB-first rows that start on a byte boundary."""
+        source_ptr = ptr8(source)
+        target_ptr = ptr8(target)
+        target_stride = ((width * target_bpp) + 7) // 8
+
+        source_bit = start_bit
+        row = 0
+        while row < height:
+            target_bit = row * target_stride * 8
+            col = 0
+            while col < width:
+                # read the pixel value one bit at a time (it may span two bytes)
+                value = 0
+                bit = 0
+                while bit < bpp:
+                    next_bit = source_bit + bit
+                    value = (value << 1) | ((source_ptr[next_bit >> 3] >> (7 - (next_bit & 7))) & 1)
+                    bit += 1
+
+                target_idx = target_bit >> 3
+                target_shift = 8 - target_bpp - (target_bit & 7)
+                target_ptr[target_idx] = target_ptr[target_idx] | (value << target_shift)
+
+                source_bit += bpp
+                target_bit += target_bpp
+                col += 1
+            row += 1
+
+
+
 class ST7789:
     """
     ST7789 driver class
@@ -208,6 +334,24 @@ class ST7789:
         cs (pin): cs pin
         backlight(pin): backlight pin
         reserved_bytearray (bytearray): pre-allocated bytearray to use for framebuffer
+        tiny_buf_chunk_lines (int):
+            How many full-width lines to convert and send in one SPI write when using the tiny buffer.
+            Higher values use more RAM (width * 2 bytes per line) but make fewer SPI calls.
+        double_buffer (bool):
+            Allocate a second (front) framebuffer, so that show(wait=False) can return immediately,
+            and the frame can be sent in the background while the app draws the next one.
+            This doubles the framebuffer memory, so it's intended for devices with SPI RAM,
+            and it can't be combined with use_tiny_buf or use_gs8_buf.
+        flush_timer (machine.Timer):
+            Optional timer used to send chunks of the front buffer in the background.
+            Without it, the flush only progresses in wait_for_flush() or show_async().
+            Don't use a timer if the SPI bus is shared with another device (like an SD card),
+            because the timer can fire in the middle of that device's transfers.
+        flush_chunk_bytes (int):
+            How many bytes to send per step of a background flush.
+        glyph_cache_size (int):
+            The maximum number of glyphs (per font) to keep ready for drawing text.
+            Set to 0 to disable the cache (and draw each glyph pixel by pixel).
         use_tiny_buf (bool):
             
             Whether to use:
@@ -220,6 +364,12 @@ class ST7789:
                "RGB565" mode
                Can be written directly to display
                Allows any color the display can show
+
+        use_gs8_buf (bool):
+            A middle ground between the two modes above (can't be combined with use_tiny_buf).
+            Uses an 8-bit indexed framebuffer (~width * height bytes memory), "GS8" mode.
+            Like the tiny buffer, it's converted to RGB565 as it's sent to the display,
+            but the Palette is extended to 256 colors (see Palette.extend).
         
         rotation (int):
 
@@ -257,6 +407,12 @@ class ST7789:
         custom_rotations=None,
         reserved_bytearray = None,
         use_tiny_buf = False,
+        use_gs8_buf = False,
+        tiny_buf_chunk_lines = _TINY_BUF_CHUNK_LINES,
+        double_buffer = False,
+        flush_timer = None,
+        flush_chunk_bytes = _FLUSH_CHUNK_BYTES,
+        glyph_cache_size = _GLYPH_CACHE_SIZE,
         **kwargs,
     ):
         """
@@ -273,6 +429,19 @@ class ST7789:
 
         if dc is None:
             raise ValueError("dc pin is required.")
+
+        if double_buffer and (use_tiny_buf or use_gs8_buf):
+            raise ValueError("double_buffer can't be used with use_tiny_buf or use_gs8_buf.")
+        if use_tiny_buf and use_gs8_buf:
+            raise ValueError("use_tiny_buf and use_gs8_buf can't be used together.")
+
+        # use_tiny_fbuf uses GS4 format for less memory usage, and use_gs8_buf is a middle ground
+        if use_tiny_buf:
+            self._fbuf_format = framebuf.GS4_HMSB
+        elif use_gs8_buf:
+            self._fbuf_format = framebuf.GS8
+        else:
+            self._fbuf_format = framebuf.RGB565
         
         #init the fbuf
         if reserved_bytearray is None:
@@ -282,6 +451,10 @@ class ST7789:
                 size = (height * width) // 2 if (width % 8 == 0) else (height * (width + 1)) // 2
                 reserved_bytearray = bytearray(size)
 
+            elif use_gs8_buf:
+                # one byte per pixel
+                reserved_bytearray = bytearray(height*width)
+
             else: # full sized buffer
                 reserved_bytearray = bytearray(height*width*2)
 
@@ -290,20 +463,66 @@ class ST7789:
             # height and width are swapped when rotation is 1 or 3
             height if (rotation % 2 == 1) else width,
             width if (rotation % 2 == 1) else height,
-            # use_tiny_fbuf uses GS4 format for less memory usage
-            framebuf.GS4_HMSB if use_tiny_buf else framebuf.RGB565,
+            self._fbuf_format,
             )
         
         
         self.palette = Palette()
-        self.palette.use_tiny_buf = self.use_tiny_buf = use_tiny_buf
+        self.use_tiny_buf = use_tiny_buf
+        self.use_gs8_buf = use_gs8_buf
+        # in either indexed mode, Palette returns color indices rather than RGB565 colors
+        self.palette.use_tiny_buf = use_tiny_buf or use_gs8_buf
+        if use_gs8_buf:
+            self.palette.extend()
+
+        # The tiny/gs8 buffer is converted to RGB565 before being sent to the display.
+        # Reuse one chunk buffer for this, rather than allocating a new buffer for every line.
+        # (Sized using the longest side, so that it works for any rotation.)
+        if use_tiny_buf or use_gs8_buf:
+            self._tiny_chunk_buf = bytearray(max(width, height) * 2 * max(1, tiny_buf_chunk_lines))
+            self._tiny_chunk_view = memoryview(self._tiny_chunk_buf)
         
         # keep track of min/max y vals for writing to display
         # this speeds up drawing significantly.
-        # only y value is currently used, because framebuffer is stored in horizontal lines,
-        # making y slices much simpler than x slices.
+        # This full-width "band" is the fallback used when the dirty rects below overflow,
+        # or when writing the band would be cheaper than writing each rect.
         self._show_y_min = width if (rotation % 2 == 1) else height
         self._show_y_max = 0
+
+        # Also keep a small list of merged dirty rectangles (x0, y0, x1, y1), (x1/y1 exclusive).
+        # These become CASET/RASET windows in show(), so small updates only send changed pixels.
+        # _dirty_count is -1 when the list has overflowed (and the band should be used instead.)
+        self._dirty_rects = array.array('H', [0] * (_MAX_DIRTY_RECTS * 4))
+        self._dirty_count = 0
+
+        # When double buffered, show() copies the dirty windows into the front buffer,
+        # which is then sent to the display in chunks (while the app keeps drawing to self.fbuf).
+        if double_buffer:
+            self._front_view = memoryview(bytearray(len(reserved_bytearray)))
+        else:
+            self._front_view = None
+        self._flush_timer = flush_timer
+        self._flush_chunk_bytes = flush_chunk_bytes
+        # list of windows left to flush, and the next row to send in the first window
+        self._flush_windows = None
+        self._flush_row = 0
+        self._flush_busy = False
+
+        # Bitmap font glyphs are stored as MONO_HLSB framebuffers (one LRUCache per font),
+        # so that text can be drawn with framebuf.blit rather than pixel by pixel.
+        # The text color is applied using a 2 pixel palette of (transparent key color, text color).
+        self._glyph_cache_size = glyph_cache_size
+        self._glyph_caches = {}
+        # sorted (codepoint, glyph index) arrays for the MAP of each proportional font
+        self._font_maps = {}
+        # anti-aliased (2/4 bpp) fonts draw each level of coverage using a color lookup table,
+        # which is cached for each (color, background, bpp, palette version).
+        self._aa_luts = LRUCache(_AA_LUT_CACHE_SIZE)
+        self._glyph_palette = framebuf.FrameBuffer(
+            bytearray(1 if use_tiny_buf else 4),
+            2, 1,
+            self._fbuf_format,
+            )
         
         self.width = width
         self.height = height
@@ -329,9 +548,25 @@ class ST7789:
         if backlight is not None:
             backlight.value(1)
         
-        # mh_if not frozen:
+        # mh_if frozen:
+        # # the utf8 range index is used directly from the frozen font
+        # num_ranges = self._utf8_num_ranges(utf8[:_UTF8_HEADER_BYTES])
+        # self._utf8_ranges = utf8[_UTF8_HEADER_BYTES:_UTF8_HEADER_BYTES + num_ranges * _UTF8_RANGE_BYTES]
+        # mh_else:
         # when not frozen, the utf8 font is read as needed from a binary.
-        self.utf8_font = open("/font/utf8_8x8.bin", "rb", buffering = 0)
+        # only the (small) range index is kept in RAM.
+        self.utf8_font = open(_UTF8_FONT_PATH, "rb", buffering = 0)
+        num_ranges = self._utf8_num_ranges(self.utf8_font.read(_UTF8_HEADER_BYTES))
+        self._utf8_ranges = self.utf8_font.read(num_ranges * _UTF8_RANGE_BYTES)
+        # mh_end_if
+        self._utf8_range_count = num_ranges
+        self._utf8_data_start = _UTF8_HEADER_BYTES + num_ranges * _UTF8_RANGE_BYTES
+
+        # mh_if not frozen:
+        # recently used glyphs are kept in RAM, so redrawing the same text doesn't re-read the file.
+        self._utf8_cache = LRUCache(_UTF8_CACHE_SIZE)
+        self._utf8_buf = bytearray(_UTF8_READ_BYTES)
+        self._utf8_view = memoryview(self._utf8_buf)
         # mh_end_if
 
 
@@ -356,28 +591,118 @@ class ST7789:
         """Reset show boundaries"""
         self._show_y_min = self.height
         self._show_y_max = 0
+        self._dirty_count = 0
 
 
-    @micropython.viper
-    def _set_show_min(self, y0:int, y1:int):
+    def _set_show_min(self, y0, y1):
         """Set/store minimum and maximum Y to show next time show() is called."""
-        y_min = int(self._show_y_min)
-        y_max = int(self._show_y_max)
-        
-        
-        if y_min > y0:
-            y_min = y0
-        if y_max < y1:
-            y_max = y1
+        self._set_show_rect(0, y0, self.width, y1)
+
 
-        self._show_y_min = y_min
-        self._show_y_max = y_max
+    @micropython.viper
+    def _set_show_rect(self, x0:int, y0:int, x1:int, y1:int):
+        """
+        Mark a rectangle as changed, so that it is written next time show() is called.
+        (x1 and y1 are exclusive.)
+
+        Overlapping or touching rectangles are merged together,
+        and the full-width y band is always updated as a fallback.
+        """
+        width = int(self.width)
+        height = int(self.height)
+
+        # clamp to the display
+        if x0 < 0:
+            x0 = 0
+        if y0 < 0:
+            y0 = 0
+        if x1 > width:
+            x1 = width
+        if y1 > height:
+            y1 = height
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        # update the full-width band
+        if int(self._show_y_min) > y0:
+            self._show_y_min = y0
+        if int(self._show_y_max) < y1:
+            self._show_y_max = y1
+
+        count = int(self._dirty_count)
+        if count < 0:
+            # rect list has already overflowed, only the band is used.
+            return
+
+        rects = ptr16(self._dirty_rects)
+        idx = 0
+        while idx < count:
+            i = idx * 4
+            if x0 <= rects[i + 2] and rects[i] <= x1 \
+            and y0 <= rects[i + 3] and rects[i + 1] <= y1:
+                # rects overlap or touch; grow our rect to include the old one,
+                if rects[i] < x0:
+                    x0 = rects[i]
+                if rects[i + 1] < y0:
+                    y0 = rects[i + 1]
+                if rects[i + 2] > x1:
+                    x1 = rects[i + 2]
+                if rects[i + 3] > y1:
+                    y1 = rects[i + 3]
+
+                # then remove the old rect (by moving the last rect into its place),
+                count -= 1
+                last = count * 4
+                rects[i] = rects[last]
+                rects[i + 1] = rects[last + 1]
+                rects[i + 2] = rects[last + 2]
+                rects[i + 3] = rects[last + 3]
+
+                # and start over, because the bigger rect might now touch other rects.
+                idx = 0
+            else:
+                idx += 1
+
+        if count >= _MAX_DIRTY_RECTS:
+            # too many separate rects, fall back to the full-width band.
+            self._dirty_count = -1
+            return
+
+        i = count * 4
+        rects[i] = x0
+        rects[i + 1] = y0
+        rects[i + 2] = x1
+        rects[i + 3] = y1
+        self._dirty_count = count + 1
+
+
+    @micropython.viper
+    def _dirty_rect_count(self) -> int:
+        """
+        Return the number of dirty rects that show() should write,
+        or 0 if writing the full-width band would be cheaper.
+        """
+        count = int(self._dirty_count)
+        if count <= 0:
+            return 0
+
+        rects = ptr16(self._dirty_rects)
+        total_px = 0
+        i = 0
+        while i < count * 4:
+            total_px += (rects[i + 2] - rects[i]) * (rects[i + 3] - rects[i + 1]) + _DIRTY_RECT_OVERHEAD
+            i += 4
+
+        band_px = int(self.width) * (int(self._show_y_max) - int(self._show_y_min))
+        if total_px < band_px:
+            return count
+        return 0
 
     
     @micropython.viper
     def _format_color(self, color:int) -> int:
         """Swap color bytes if needed, do nothing otherwise."""
-        if (not self.use_tiny_buf) and self.needs_swap:
+        if (not self.use_tiny_buf) and (not self.use_gs8_buf) and self.needs_swap:
             color = ((color & 0xff) << 8) | (color >> 8)
         return color
 
@@ -396,76 +721,163 @@ class ST7789:
             self.cs.on()
     
     
-    @micropython.viper
-    def _write_tiny_buf(self):
-        """Convert tiny_buf data to RGB565 and write to SPI"""
+    def _write_tiny_buf(self, x0, y0, x1, y1):
+        """
+        Convert tiny_buf (or gs8_buf) data in the given window to RGB565 and write to SPI.
+        Several lines are converted into the reusable chunk buffer for each SPI write.
+        """
         if self.cs:
             self.cs.off()
         self.dc.on()
 
-        landscape_rotation = int(self._rotation) % 2 == 1
-        
-        height = int(self.height)
-        width = int(self.width)
-        
-        start_y = int(self._show_y_min)
-        end_y = int(self._show_y_max)
-        
-        # swap colors if needed
-        if self.needs_swap:
-            palette_buf = bytearray(32)
-            target_palette_ptr = ptr16(palette_buf)
-            source_palette_ptr = ptr16(self.palette.buf)
-            for i in range(16):
-                target_palette_ptr[i] = ((source_palette_ptr[i] & 255) << 8) | (source_palette_ptr[i] >> 8)
-        else:
-            palette_buf = self.palette.buf
-        
-        #for y in range(start_y, end_y):
-        while start_y < end_y:
+        width = x1 - x0
+        palette_buf = self._tiny_palette_buf()
+        chunk_buf = self._tiny_chunk_buf
+        chunk_view = self._tiny_chunk_view
+        convert_lines = self._convert_gs8_lines if self.use_gs8_buf else self._convert_tiny_lines
+
+        # narrow windows can fit more lines in the chunk buffer
+        chunk_lines = len(chunk_buf) // (width * 2)
+
+        while y0 < y1:
+            lines = min(chunk_lines, y1 - y0)
+            convert_lines(palette_buf, chunk_buf, x0, y0, width, lines)
+
+            # (avoid making a new memoryview slice when the whole buffer is used)
+            write_len = lines * width * 2
             self.spi.write(
-                self._convert_tiny_line(palette_buf, start_y, width)
+                chunk_view if write_len == len(chunk_buf) else chunk_view[:write_len]
                 )
-            start_y += 1
+            y0 += lines
         
         if self.cs:
             self.cs.on()
 
 
+    def _tiny_palette_buf(self):
+        """
+        For "_write_tiny_buf", return the conversion table for the current palette.
+        (The Palette caches these, so they're only rebuilt when a color changes.)
+        """
+        palette = self.palette
+        if self.use_gs8_buf:
+            return palette.swapped_buf() if self.needs_swap else palette.buf
+        return palette.pair_table(bool(self.needs_swap))
+
+
     @micropython.viper
-    def _convert_tiny_line(self, palette_buf, y:int, width:int):
+    def _convert_tiny_lines(self, pair_table, output_buf, x:int, y:int, width:int, lines:int):
         """
         For "_write_tiny_buf"
-        this method outputs a single converted line of the requested size.
+        this method converts the requested number of lines (of the requested width),
+        starting from the given x/y coordinate, and packs them into output_buf.
+
+        Each source byte (2 pixels) is converted at once using the Palette's pair table,
+        which holds both RGB565 pixels in one 32-bit word.
         """
         source_ptr = ptr8(self.fbuf)
-        palette = ptr16(palette_buf)
-        output_buf = bytearray(width * 2)
+        pairs16 = ptr16(pair_table)
+        pairs32 = ptr32(pair_table)
         output = ptr16(output_buf)
+        output32 = ptr32(output_buf)
+        # GS4 rows are padded to a whole byte (so an odd width has an extra half byte)
+        stride = (int(self.width) + 1) >> 1
         
-        
-        source_width = width // 2 if (width % 8 == 0) else ((width + 1) // 2)
-        source_start_idx = source_width * y
         output_idx = 0
-        
-        while output_idx < width:
-            source_idx = source_start_idx + (output_idx // 2)
-            sample = source_ptr[source_idx] >> 4 if (output_idx % 2 == 0) else source_ptr[source_idx] & 0xf
+        line = 0
+        while line < lines:
+            # index of the source byte holding the first pixel in this line (each byte holds 2 pixels)
+            source_idx = ((y + line) * stride) + (x >> 1)
+            px = x
+            end_px = x + width
+
+            # a window starting on an odd pixel begins with the low nibble of a byte
+            if px & 1 and px < end_px:
+                output[output_idx] = pairs16[(source_ptr[source_idx] << 1) | 1]
+                output_idx += 1
+                source_idx += 1
+                px += 1
+
+            if output_idx & 1 == 0:
+                # output is 32-bit aligned, so write both pixels at once
+                while px + 1 < end_px:
+                    output32[output_idx >> 1] = pairs32[source_ptr[source_idx]]
+                    output_idx += 2
+                    source_idx += 1
+                    px += 2
+            else:
+                while px + 1 < end_px:
+                    pair_idx = source_ptr[source_idx] << 1
+                    output[output_idx] = pairs16[pair_idx]
+                    output[output_idx + 1] = pairs16[pair_idx + 1]
+                    output_idx += 2
+                    source_idx += 1
+                    px += 2
 
-            output[output_idx] = palette[sample]
-            
-            output_idx += 1
-        
-        return output_buf
+            # and a window can end on the high nibble of a byte
+            if px < end_px:
+                output[output_idx] = pairs16[source_ptr[source_idx] << 1]
+                output_idx += 1
 
+            line += 1
 
-    def _write_normal_buf(self):
-        """Write normal framebuf data, respecting show_y_min/max values."""
-        source_start_idx = self._show_y_min * self.width * 2
-        source_end_idx = self._show_y_max * self.width * 2
-        
-        if source_start_idx < source_end_idx:
-            self._write(None, memoryview(self.fbuf)[source_start_idx:source_end_idx])
+
+    @micropython.viper
+    def _convert_gs8_lines(self, palette_buf, output_buf, x:int, y:int, width:int, lines:int):
+        """
+        For "_write_tiny_buf" in gs8 mode.
+        Like _convert_tiny_lines, but each source byte is a single (8-bit) palette index.
+        """
+        source_ptr = ptr8(self.fbuf)
+        palette = ptr16(palette_buf)
+        output = ptr16(output_buf)
+        self_width = int(self.width)
+
+        output_idx = 0
+        line = 0
+        while line < lines:
+            source_idx = ((y + line) * self_width) + x
+            end_idx = source_idx + width
+
+            while source_idx < end_idx:
+                output[output_idx] = palette[source_ptr[source_idx]]
+                output_idx += 1
+                source_idx += 1
+
+            line += 1
+
+
+    def _row_bytes(self, width:int) -> int:
+        """The number of bytes in a framebuffer row of `width` pixels."""
+        if self.use_tiny_buf:
+            # GS4 rows are padded to a whole byte
+            return (width + 1) // 2
+        if self.use_gs8_buf:
+            return width
+        return width * 2
+
+
+    def _write_normal_buf(self, x0, y0, x1, y1):
+        """Write normal framebuf data in the given window."""
+        width = self.width
+        fbuf_view = memoryview(self.fbuf)
+
+        if x0 == 0 and x1 == width:
+            # full rows are contiguous in the framebuffer, so they can be written in one go.
+            self._write(None, fbuf_view[y0 * width * 2:y1 * width * 2])
+            return
+
+        # otherwise, write the window one row slice at a time.
+        row_len = (x1 - x0) * 2
+        if self.cs:
+            self.cs.off()
+        self.dc.on()
+        while y0 < y1:
+            start_idx = ((y0 * width) + x0) * 2
+            self.spi.write(fbuf_view[start_idx:start_idx + row_len])
+            y0 += 1
+        if self.cs:
+            self.cs.on()
 
 
     def hard_reset(self):
@@ -503,6 +915,7 @@ class ST7789:
             value (bool): if True enable sleep mode. if False disable sleep
             mode
         """
+        self.wait_for_flush()
         # mh_if TDECK:
         # TDeck shares SPI with SDCard
         self.spi.init()
@@ -524,6 +937,7 @@ class ST7789:
             value (bool): if True enable inversion mode. if False disable
             inversion mode
         """
+        self.wait_for_flush()
         # mh_if TDECK:
         # TDeck shares SPI with SDCard
         self.spi.init()
@@ -561,6 +975,19 @@ class ST7789:
             self.needs_swap,
         ) = self.rotations[rotation]
 
+        # Hardware vertical scrolling moves the panel's own rows.
+        # That's only the screen's vertical axis when rows aren't swapped (MV) or flipped (MY).
+        self._hw_scroll = not (madctl & (_ST7789_MADCTL_MV | _ST7789_MADCTL_MY))
+        self._scroll_top = 0
+        self._scroll_bottom = self.height
+        self._scroll_offset = 0
+        self._scroll_fbuf = None
+        self._scroll_defined = False
+        self._scroll_pending = False
+        self._flush_vscsad = None
+        # counts calls to fill, so that scrolling views can tell when something else redrew the screen
+        self.fill_count = 0
+
         if self.color_order == _BGR:
             madctl |= _ST7789_MADCTL_BGR
         else:
@@ -601,7 +1028,7 @@ class ST7789:
             length (int): length of line
             color (int): 565 encoded color
         """
-        self._set_show_min(y, y + length)
+        self._set_show_rect(x, y, x + 1, y + length)
         color = self._format_color(color)
         self.fbuf.vline(x, y, length, color)
 
@@ -616,7 +1043,7 @@ class ST7789:
             length (int): length of line
             color (int): 565 encoded color
         """
-        self._set_show_min(y, y)
+        self._set_show_rect(x, y, x + length, y + 1)
         color = self._format_color(color)
         self.fbuf.hline(x, y, length, color)
 
@@ -630,16 +1057,26 @@ class ST7789:
             Y (int): y coordinate
             color (int): 565 encoded color
         """
-        self._set_show_min(y, y)
+        self._set_show_rect(x, y, x + 1, y + 1)
         color = self._format_color(color)
         self.fbuf.pixel(x,y,color)
         
         
-    def show(self):
+    def show(self, wait=True):
         """
         Write the current framebuf to the display
+
+        Args:
+            wait (bool):
+                When double buffered, and wait is False, return immediately
+                and send the frame in the background (See wait_for_flush).
+                Has no effect on a single buffered display.
         """
-        if self._show_y_min > self._show_y_max:
+        if self._front_view is not None:
+            self._show_double_buffered(wait)
+            return
+
+        if self._show_y_min >= self._show_y_max:
             # nothing to show
             return
         
@@ -648,31 +1085,327 @@ class ST7789:
         self.spi.init()
         # mh_end_if
 
-        # clamp min and max
-        if self._show_y_min < 0:
-            self._show_y_min = 0
-        if self._show_y_max > self.height:
-            self._show_y_max = self.height
-
-        self._set_window(
-            0,
-            self._show_y_min,
-            self.width - 1,
-            self._show_y_max - 1,
-            )
-        
-        if self.use_tiny_buf:
-            self._write_tiny_buf()
+        rect_count = self._dirty_rect_count()
+        if rect_count:
+            # write each dirty rect in its own window
+            rects = self._dirty_rects
+            for i in range(0, rect_count * 4, 4):
+                self._show_window(rects[i], rects[i + 1], rects[i + 2], rects[i + 3])
         else:
-            self._write_normal_buf()
+            # write the full-width band
+            self._show_window(0, self._show_y_min, self.width, self._show_y_max)
 
         self._reset_show_min()
 
+        # start showing the new scroll position, now that its rows have been sent
+        if self._scroll_pending:
+            self._scroll_pending = False
+            self._write_scroll_start(self._scroll_start())
+
         # mh_if TDECK:
         # TDeck shares SPI with SDCard
         self.spi.deinit()
         # mh_end_if
-        
+
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Double buffering: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def _get_show_windows(self):
+        """Return a list of (x0, y0, x1, y1) windows that need to be written to the display."""
+        if self._show_y_min >= self._show_y_max:
+            return []
+
+        rect_count = self._dirty_rect_count()
+        if rect_count:
+            rects = self._dirty_rects
+            return [
+                (rects[i], rects[i + 1], rects[i + 2], rects[i + 3])
+                for i in range(0, rect_count * 4, 4)
+                ]
+        return [(0, self._show_y_min, self.width, self._show_y_max)]
+
+
+    def _show_double_buffered(self, wait):
+        """Copy dirty windows to the front buffer, and start sending them."""
+        # the front buffer can't be modified until the previous frame is done.
+        self.wait_for_flush()
+
+        windows = self._get_show_windows()
+        self._reset_show_min()
+        if not windows:
+            return
+
+        # copy each window from the back buffer (self.fbuf) into the front buffer
+        width = self.width
+        back_view = memoryview(self.fbuf)
+        front_view = self._front_view
+        for x0, y0, x1, y1 in windows:
+            if x0 == 0 and x1 == width:
+                # full rows can be copied all at once
+                front_view[y0 * width * 2:y1 * width * 2] = back_view[y0 * width * 2:y1 * width * 2]
+            else:
+                for y in range(y0, y1):
+                    start_idx = ((y * width) + x0) * 2
+                    end_idx = ((y * width) + x1) * 2
+                    front_view[start_idx:end_idx] = back_view[start_idx:end_idx]
+
+        self._flush_windows = windows
+        self._flush_row = windows[0][1]
+
+        # the new scroll position is sent once this frame is done
+        if self._scroll_pending:
+            self._scroll_pending = False
+            self._flush_vscsad = self._scroll_start()
+
+        if wait:
+            self.wait_for_flush()
+        elif self._flush_timer is not None:
+            self._flush_timer.init(period=_FLUSH_PERIOD_MS, callback=self._flush_callback)
+
+
+    def _flush_callback(self, timer):
+        """Flush timer callback; send the next chunk, and stop the timer when done."""
+        # the main program might be in the middle of a flush step already
+        if self._flush_busy:
+            return
+        if not self._flush_step():
+            timer.deinit()
+
+
+    def _flush_step(self):
+        """
+        Send one chunk of the front buffer to the display.
+        Returns True if there is more left to send.
+
+        Each chunk sets its own window, so the main program can use the SPI bus for other devices
+        in between chunks (when the chunks are sent by wait_for_flush or show_async).
+        """
+        windows = self._flush_windows
+        if not windows:
+            return False
+        self._flush_busy = True
+
+        # mh_if TDECK:
+        # TDeck shares SPI with SDCard
+        self.spi.init()
+        # mh_end_if
+
+        x0, _, x1, y1 = windows[0]
+        y0 = self._flush_row
+        width = self.width
+        row_len = (x1 - x0) * 2
+        rows = min(y1 - y0, max(1, self._flush_chunk_bytes // row_len))
+
+        self._set_window(x0, y0, x1 - 1, y1 - 1)
+        if x0 == 0 and x1 == width:
+            # full rows are contiguous
+            self._write(None, self._front_view[y0 * row_len:(y0 + rows) * row_len])
+        else:
+            if self.cs:
+                self.cs.off()
+            self.dc.on()
+            for y in range(y0, y0 + rows):
+                start_idx = ((y * width) + x0) * 2
+                self.spi.write(self._front_view[start_idx:start_idx + row_len])
+            if self.cs:
+                self.cs.on()
+
+        # mh_if TDECK:
+        # TDeck shares SPI with SDCard
+        self.spi.deinit()
+        # mh_end_if
+
+        # move on to the next rows, or the next window
+        y0 += rows
+        if y0 >= y1:
+            windows.pop(0)
+            if windows:
+                y0 = windows[0][1]
+            else:
+                self._flush_windows = None
+        self._flush_row = y0
+
+        if self._flush_windows is None and self._flush_vscsad is not None:
+            # mh_if TDECK:
+            self.spi.init()
+            # mh_end_if
+            self._write_scroll_start(self._flush_vscsad)
+            self._flush_vscsad = None
+            # mh_if TDECK:
+            self.spi.deinit()
+            # mh_end_if
+
+        self._flush_busy = False
+        return self._flush_windows is not None
+
+
+    def flushing(self) -> bool:
+        """Return True if a frame is still being sent in the background."""
+        return self._flush_windows is not None
+
+
+    def wait_for_flush(self):
+        """
+        Block until the previous frame has been completely sent to the display.
+        (Call this before modifying the display from outside of show().)
+        """
+        if self._flush_windows is None:
+            return
+        # stop the timer so that it doesn't compete with us
+        if self._flush_timer is not None:
+            self._flush_timer.deinit()
+        while self._flush_step():
+            pass
+
+
+    async def show_async(self):
+        """
+        Asyncio alternative to show(wait=False).
+        Send the frame in chunks, yielding to other tasks in between each chunk.
+        """
+        import asyncio
+        self.show(wait=False)
+        # the timer isn't needed when asyncio is sending the chunks
+        if self._flush_timer is not None:
+            self._flush_timer.deinit()
+        while self._flush_step():
+            await asyncio.sleep_ms(0)
+
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Scroll areas: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    def set_scroll_area(self, top=0, bottom=0):
+        """
+        Split the display into a fixed header, a scrolling area, and a fixed footer.
+
+        When the panel's rows run from the top to the bottom of the screen (e.g. portrait rotations),
+        the ST7789's hardware vertical scrolling is used, and scrolling only sends the newly exposed rows.
+        Otherwise (e.g. landscape rotations) the area is scrolled in the framebuffer, and the whole area is sent.
+
+        Args:
+            top (int): height of the fixed header
+            bottom (int): height of the fixed footer
+        """
+        self._unwrap_scroll_area()
+
+        self._scroll_top = top
+        self._scroll_bottom = self.height - bottom
+        self._scroll_offset = 0
+        self._scroll_defined = True
+
+        if self._hw_scroll:
+            self.wait_for_flush()
+            tfa = self.ystart + top
+            vsa = self._scroll_bottom - top
+            # mh_if TDECK:
+            self.spi.init()
+            # mh_end_if
+            self._write(_ST7789_VSCRDEF, struct.pack(">HHH", tfa, vsa, _ST7789_RAM_ROWS - tfa - vsa))
+            self._write_scroll_start(tfa)
+            # mh_if TDECK:
+            self.spi.deinit()
+            # mh_end_if
+        else:
+            # a framebuffer over just the scrolling rows
+            if self.use_tiny_buf and self.width % 2:
+                raise ValueError("Scroll areas need an even width when using use_tiny_buf.")
+            row_bytes = self._row_bytes(self.width)
+            self._scroll_fbuf = framebuf.FrameBuffer(
+                memoryview(self.fbuf)[top * row_bytes:self._scroll_bottom * row_bytes],
+                self.width,
+                self._scroll_bottom - top,
+                self._fbuf_format,
+                )
+
+
+    def scroll_area(self, lines, color=None):
+        """
+        Scroll the contents of the scroll area (see set_scroll_area) up by the given number of rows.
+        (Negative values scroll down.)
+
+        New rows are exposed at the bottom (or the top), and are filled with 'color' if it's given.
+        Use scroll_y to find where to draw in the scroll area.
+        """
+        if not self._scroll_defined:
+            # default to scrolling the whole screen
+            self.set_scroll_area()
+
+        top = self._scroll_top
+        bottom = self._scroll_bottom
+        height = bottom - top
+
+        if self._hw_scroll:
+            # the framebuffer stays in the same order as the panel's RAM,
+            # and the visible rows are offset into it like a ring buffer.
+            self._scroll_offset = (self._scroll_offset + lines) % height
+            self._scroll_pending = True
+        else:
+            self._scroll_fbuf.scroll(0, -lines)
+            self._set_show_rect(0, top, self.width, bottom)
+
+        if color is not None:
+            if lines > 0:
+                self._fill_scroll_rows(max(top, bottom - lines), bottom, color)
+            else:
+                self._fill_scroll_rows(top, min(bottom, top - lines), color)
+
+
+    def scroll_y(self, y):
+        """
+        Convert a y position on the screen, into a y position in the framebuffer.
+        This only has an effect in a hardware scrolled area.
+        """
+        if self._scroll_offset and self._scroll_top <= y < self._scroll_bottom:
+            return self._scroll_top + (y - self._scroll_top + self._scroll_offset) % (self._scroll_bottom - self._scroll_top)
+        return y
+
+
+    def _fill_scroll_rows(self, y0, y1, color):
+        """Fill screen rows y0 to y1 (exclusive), which may wrap around the scroll area in the framebuffer."""
+        while y0 < y1:
+            fbuf_y = self.scroll_y(y0)
+            rows = min(y1 - y0, self._scroll_bottom - fbuf_y)
+            self.rect(0, fbuf_y, self.width, rows, color, fill=True)
+            y0 += rows
+
+
+    def _scroll_start(self):
+        """The hardware scroll start address for the current scroll offset."""
+        return self.ystart + self._scroll_top + self._scroll_offset
+
+
+    def _write_scroll_start(self, address):
+        self._write(_ST7789_VSCSAD, struct.pack(">H", address))
+
+
+    def _unwrap_scroll_area(self):
+        """Put a hardware scrolled area back into screen order, so the scroll offset can be reset."""
+        offset = self._scroll_offset
+        if not offset:
+            return
+        row_bytes = self._row_bytes(self.width)
+        view = memoryview(self.fbuf)
+        start = self._scroll_top * row_bytes
+        split = start + offset * row_bytes
+        end = self._scroll_bottom * row_bytes
+
+        head = bytes(view[start:split])
+        view[start:end - len(head)] = bytes(view[split:end])
+        view[end - len(head):end] = head
+
+        self._scroll_offset = 0
+        self._scroll_pending = True
+        self._set_show_rect(0, self._scroll_top, self.width, self._scroll_bottom)
+
+
+    def _show_window(self, x0, y0, x1, y1):
+        """Write one window (x1/y1 exclusive) of the framebuffer to the display."""
+        self._set_window(x0, y0, x1 - 1, y1 - 1)
+
+        if self.use_tiny_buf or self.use_gs8_buf:
+            self._write_tiny_buf(x0, y0, x1, y1)
+        else:
+            self._write_normal_buf(x0, y0, x1, y1)
+
+
     def blit_buffer(self, buffer, x, y, width, height, key=-1, palette=None):
         """
         Copy buffer to display framebuf at the given location.
@@ -686,11 +1419,11 @@ class ST7789:
             key (int): color to be considered transparent
             palette (framebuf): the color pallete to use for the buffer
         """
-        self._set_show_min(y, y + height)
+        self._set_show_rect(x, y, x + width, y + height)
         if not isinstance(buffer, framebuf.FrameBuffer):
             buffer = framebuf.FrameBuffer(
                 buffer, width, height,
-                framebuf.GS4_HMSB if self.use_tiny_buf else framebuf.RGB565,
+                self._fbuf_format,
                 )
         
         self.fbuf.blit(buffer, x, y, key, palette)
@@ -707,7 +1440,7 @@ class ST7789:
             height (int): Height in pixels
             color (int): 565 encoded color
         """
-        self._set_show_min(y, y + h)
+        self._set_show_rect(x, y, x + w, y + h)
         color = self._format_color(color)
         self.fbuf.rect(x,y,w,h,color,fill)
 
@@ -724,7 +1457,7 @@ class ST7789:
             color (int): 565 encoded color
             fill (bool): fill in the ellipse. Default is False
         """
-        self._set_show_min(y - yr, y + yr + 1)
+        self._set_show_rect(x - xr, y - yr, x + xr + 1, y + yr + 1)
         color = self._format_color(color)
         self.fbuf.ellipse(x,y,xr,yr,color,fill,m)
 
@@ -743,7 +1476,6 @@ class ST7789:
             height (int): Height in pixels
             color (int): 565 encoded color
         """
-        self._set_show_min(y, y + height)
         self.rect(x, y, width, height, color, fill=True)
 
 
@@ -758,6 +1490,12 @@ class ST7789:
         self._set_show_min(0, self.height)
         color = self._format_color(color)
         self.fbuf.fill(color)
+        self.fill_count += 1
+
+        # the whole framebuffer is overwritten, so a hardware scroll can be reset for free
+        if self._scroll_offset:
+            self._scroll_offset = 0
+            self._scroll_pending = True
 
 
     def line(self, x0, y0, x1, y1, color):
@@ -771,9 +1509,11 @@ class ST7789:
             y1 (int): End point y coordinate
             color (int): 565 encoded color
         """
-        self._set_show_min(
-            min(y0,y1),
-            max(y0,y1)
+        self._set_show_rect(
+            min(x0, x1),
+            min(y0, y1),
+            max(x0, x1) + 1,
+            max(y0, y1) + 1,
             )
         color = self._format_color(color)
         self.fbuf.line(x0, y0, x1, y1, color)
@@ -784,7 +1524,7 @@ class ST7789:
         Shift the contents of the FrameBuffer by the given vector.
         This may leave a footprint of the previous colors in the FrameBuffer.
 
-        Unlike vscsad which uses the hardware for scrolling,
+        Unlike scroll_area (which can use the hardware for scrolling),
         this method scrolls the framebuffer itself.
         This is a wrapper for the framebuffer.scroll method:
         """
@@ -825,6 +1565,7 @@ class ST7789:
         
         
         use_tiny_fbuf = bool(self.use_tiny_buf)
+        use_gs8_fbuf = bool(self.use_gs8_buf)
         fbuf16 = ptr16(self.fbuf)
         fbuf8 = ptr8(self.fbuf)
         
@@ -858,6 +1599,9 @@ class ST7789:
                             dest_shift = ((target_px + 1) % 2) * 4
                             dest_mask = 0xf0 >> dest_shift
                             fbuf8[target_idx] = (fbuf8[target_idx] & dest_mask) | (color << dest_shift)
+                        elif use_gs8_fbuf:
+                            # one byte per pixel
+                            fbuf8[target_px] = color
                         else:
                             # draw to 16 bits
                             target_idx = target_px
@@ -874,6 +1618,169 @@ class ST7789:
                 return
 
 
+    @staticmethod
+    def _load_glyph(font, ch_idx):
+        """Copy one glyph from a bitmap font into a new MONO_HLSB FrameBuffer."""
+        # for fonts that are a multiple of 8 pixels wide,
+        # each glyph is already stored as rows of MSB-first bits (which is MONO_HLSB format).
+        glyph_len = font.WIDTH * font.HEIGHT // 8
+        start = (ch_idx - font.FIRST) * glyph_len
+        return framebuf.FrameBuffer(
+            bytearray(font.FONT[start:start + glyph_len]),
+            font.WIDTH, font.HEIGHT,
+            framebuf.MONO_HLSB,
+            )
+
+
+    def _blit_text(self, font, text, x, y, color):
+        """
+        Draw text by blitting cached glyphs.
+        Designed to be envoked using the 'text' method,
+        for fonts with a width that is a multiple of 8.
+        """
+        width = font.WIDTH
+        height = font.HEIGHT
+        self_width = self.width
+
+        # early return for text off screen
+        if y >= self.height or (y + height) < 0:
+            return
+
+        cache = self._glyph_caches.get(font)
+        if cache is None:
+            cache = LRUCache(self._glyph_cache_size)
+            self._glyph_caches[font] = cache
+
+        # glyph pixels that are 0 become the key color, which blit skips (making them transparent)
+        if self.use_tiny_buf:
+            key = (color + 1) & 0xf
+        elif self.use_gs8_buf:
+            key = (color + 1) & 0xff
+        else:
+            key = color ^ 0xffff
+        palette = self._glyph_palette
+        palette.pixel(0, 0, key)
+        palette.pixel(1, 0, color)
+
+        fbuf = self.fbuf
+        first = font.FIRST
+        last = font.LAST
+        utf8_scale = height // 8
+
+        for char in text:
+            ch_idx = ord(char)
+
+            # only draw chars that exist in font
+            if first <= ch_idx < last:
+                glyph = cache.get(ch_idx)
+                if glyph is None:
+                    glyph = self._load_glyph(font, ch_idx)
+                    cache.put(ch_idx, glyph)
+
+                fbuf.blit(glyph, x, y, key, palette)
+                x += width
+            else:
+                # try drawing with utf8 instead
+                x += self.utf8_putc(ch_idx, x, y, color, utf8_scale)
+
+            # early return for text off screen
+            if x >= self_width:
+                return
+
+
+    @staticmethod
+    def _utf8_num_ranges(header):
+        """Check the header of the utf8 font, and return the number of ranges in its index."""
+        magic, num_ranges, _ = struct.unpack('<4sHH', header)
+        if magic != _UTF8_MAGIC:
+            raise ValueError("utf8 font is not in the expected (sparse) format")
+        return num_ranges
+
+
+    @micropython.viper
+    def _utf8_offset(self, char:int) -> int:
+        """
+        Find the byte offset of a utf8 glyph in the font data.
+        Returns -1 if the font has no glyph for that character.
+        """
+        ranges = ptr16(self._utf8_ranges)
+
+        # binary search over (first_codepoint, glyph_count, first_glyph) ranges
+        low = 0
+        high = int(self._utf8_range_count)
+        while low < high:
+            mid = (low + high) // 2
+            first = ranges[mid * 3]
+            if char < first:
+                high = mid
+            elif char >= first + ranges[mid * 3 + 1]:
+                low = mid + 1
+            else:
+                return int(self._utf8_data_start) + (ranges[mid * 3 + 2] + char - first) * 8
+        return -1
+
+
+    # mh_if not frozen:
+    def _utf8_load(self, chars):
+        """
+        Read the given (sorted) utf8 characters from the font file into the glyph cache.
+
+        Glyphs are read in order of their offset in the file,
+        and glyphs that are close together are read in a single call.
+        """
+        font_file = self.utf8_font
+        cache = self._utf8_cache
+        view = self._utf8_view
+        buf_start = 0
+        buf_end = 0
+
+        for char in chars:
+            if char in cache:
+                continue
+            offset = self._utf8_offset(char)
+            if offset < 0:
+                # empty glyph (not stored in the font)
+                continue
+            if not buf_start <= offset <= buf_end - 8:
+                font_file.seek(offset)
+                buf_start = offset
+                buf_end = offset + font_file.readinto(self._utf8_buf)
+            start = offset - buf_start
+            cache.put(char, bytes(view[start:start + 8]))
+
+
+    def _utf8_prefetch(self, text, first, last):
+        """
+        Load any uncached utf8 glyphs that are needed to draw the given text.
+        Characters in range(first, last) are drawn with another font, and are skipped.
+        """
+        cache = self._utf8_cache
+        missing = None
+        for char in text:
+            ch_idx = ord(char)
+            if not first <= ch_idx < last \
+            and ch_idx <= 0xFFFF \
+            and ch_idx not in cache:
+                if missing is None:
+                    missing = []
+                missing.append(ch_idx)
+
+        if missing is not None:
+            missing.sort()
+            # don't prefetch more glyphs than the cache can hold
+            self._utf8_load(missing[:_UTF8_CACHE_SIZE])
+
+
+    def _utf8_glyph(self, char):
+        """Get the 8 bytes of glyph data for a utf8 character (from RAM if recently used)."""
+        glyph = self._utf8_cache.get(char)
+        if glyph is None:
+            self._utf8_load((char,))
+            glyph = self._utf8_cache.get(char)
+        return glyph
+    # mh_end_if
+
+
     @micropython.viper
     def utf8_putc(self, char:int, x:int, y:int, color:int, scale:int) -> int:
         """Render a single character on the screen."""
@@ -885,21 +1792,24 @@ class ST7789:
         
         # set up viper variables
         use_tiny_fbuf = bool(self.use_tiny_buf)
+        use_gs8_fbuf = bool(self.use_gs8_buf)
         fbuf16 = ptr16(self.fbuf)
         fbuf8 = ptr8(self.fbuf)
         self_width = int(self.width)
         self_height = int(self.height)
 
-        # calculate the offset in the binary data
-        offset = char * 8
+        # find the offset in the binary data
+        offset = int(self._utf8_offset(char))
+        if offset < 0:
+            # empty glyphs are not stored, so there is nothing to draw
+            return width * scale
 
         # mh_if frozen:
         # # Read the font data directly from the memoryview
         # cur = ptr8(utf8)
         # mh_else:
-        # seek to offset and read 8 bytes
-        self.utf8_font.seek(offset)
-        cur = ptr8(self.utf8_font.read(8))
+        # get the 8 bytes of glyph data (cached in RAM)
+        cur = ptr8(self._utf8_glyph(char))
         # mh_end_if
 
         # y axis is inverted - we start from bottom not top
@@ -939,6 +1849,9 @@ class ST7789:
                             dest_shift = ((target_px + 1) % 2) * 4
                             dest_mask = 0xf0 >> dest_shift
                             fbuf8[target_idx] = (fbuf8[target_idx] & dest_mask) | (color << dest_shift)
+                        elif use_gs8_fbuf:
+                            # one byte per pixel
+                            fbuf8[target_px] = color
                         else:
                             # draw to 16 bits
                             target_idx = target_px
@@ -950,6 +1863,324 @@ class ST7789:
         return width * scale
 
 
+    def _font_map(self, font):
+        """
+        Get a sorted array of (codepoint, glyph index) pairs for a proportional font's MAP.
+        This lets glyphs be found with a binary search, rather than with `MAP.index`.
+        """
+        font_map = self._font_maps.get(font)
+        if font_map is None:
+            font_map = array.array('I')
+            for code, idx in sorted((ord(char), idx) for idx, char in enumerate(font.MAP)):
+                font_map.append(code)
+                font_map.append(idx)
+            self._font_maps[font] = font_map
+        return font_map
+
+
+    @micropython.viper
+    @staticmethod
+    def _map_glyph(font_map, char:int) -> int:
+        """Find the glyph index for a char in a map from '_font_map'. Returns -1 if it's not in the font."""
+        codes = ptr32(font_map)
+        low = 0
+        high = int(len(font_map)) // 2
+        while low < high:
+            mid = (low + high) // 2
+            code = codes[mid * 2]
+            if char < code:
+                high = mid
+            elif char > code:
+                low = mid + 1
+            else:
+                return codes[mid * 2 + 1]
+        return -1
+
+
+    @micropython.viper
+    def _write_text(self, font, text, x:int, y:int, color:int):
+        """
+        Internal viper method to draw text with a proportional font.
+        Designed to be envoked using the 'text' method.
+
+        The font must be in the format created by `write_font_converter.py`
+        (with 'MAP', 'WIDTHS', 'OFFSETS', and 1 bit per pixel 'BITMAPS').
+        """
+        height = int(font.HEIGHT)
+        self_width = int(self.width)
+        self_height = int(self.height)
+
+        # early return for text off screen
+        if y >= self_height or (y + height) < 0:
+            return
+
+        font_map = self._font_map(font)
+        widths = ptr8(font.WIDTHS)
+        offsets = ptr8(font.OFFSETS)
+        offset_width = int(font.OFFSET_WIDTH)
+        bitmaps = ptr8(font.BITMAPS)
+        utf8_scale = height // 8
+
+        use_tiny_fbuf = bool(self.use_tiny_buf)
+        use_gs8_fbuf = bool(self.use_gs8_buf)
+        fbuf16 = ptr16(self.fbuf)
+        fbuf8 = ptr8(self.fbuf)
+
+        # only draw the rows that are on screen
+        row_start = 0
+        if y < 0:
+            row_start = 0 - y
+        row_end = height
+        if y + height > self_height:
+            row_end = self_height - y
+
+        for char in text:
+            ch_idx = int(ord(char))
+            glyph = int(self._map_glyph(font_map, ch_idx))
+
+            if glyph >= 0:
+                width = widths[glyph]
+
+                # glyph bitmaps start at a (big-endian) bit offset
+                bit_start = 0
+                i = 0
+                while i < offset_width:
+                    bit_start = (bit_start << 8) | offsets[glyph * offset_width + i]
+                    i += 1
+
+                # only draw the columns that are on screen
+                col_start = 0
+                if x < 0:
+                    col_start = 0 - x
+                col_end = width
+                if x + width > self_width:
+                    col_end = self_width - x
+
+                row = row_start
+                while row < row_end:
+                    row_px = ((y + row) * self_width) + x
+                    bit_idx = bit_start + (row * width) + col_start
+                    col = col_start
+                    while col < col_end:
+                        if (bitmaps[bit_idx >> 3] >> (7 - (bit_idx & 7))) & 1:
+                            target_px = row_px + col
+                            if use_tiny_fbuf:
+                                # pack 4 bits into 8 bit ptr
+                                target_idx = target_px // 2
+                                dest_shift = ((target_px + 1) % 2) * 4
+                                dest_mask = 0xf0 >> dest_shift
+                                fbuf8[target_idx] = (fbuf8[target_idx] & dest_mask) | (color << dest_shift)
+                            elif use_gs8_fbuf:
+                                # one byte per pixel
+                                fbuf8[target_px] = color
+                            else:
+                                # draw to 16 bits
+                                fbuf16[target_px] = color
+                        bit_idx += 1
+                        col += 1
+                    row += 1
+                x += width
+            else:
+                # try drawing with utf8 instead
+                x += int(self.utf8_putc(ch_idx, x, y, color, utf8_scale))
+
+            # early return for text off screen
+            if x >= self_width:
+                return
+
+
+    @staticmethod
+    def _blend565(background:int, color:int, level:int, max_level:int) -> int:
+        """Mix two RGB565 colors, giving `color` a weight of level / max_level."""
+        inverse = max_level - level
+        red = (((background >> 11) * inverse) + ((color >> 11) * level)) // max_level
+        green = ((((background >> 5) & 0x3f) * inverse) + (((color >> 5) & 0x3f) * level)) // max_level
+        blue = (((background & 0x1f) * inverse) + ((color & 0x1f) * level)) // max_level
+        return (red << 11) | (green << 5) | blue
+
+
+    def _aa_lut(self, color, bg, bpp):
+        """
+        Get the lookup table of framebuffer colors for each coverage level of an anti-aliased font.
+
+        In RGB565 mode, each level is a blend of the text and background colors.
+        In the indexed (tiny/gs8) modes, colors are palette indices,
+        so each level uses the palette color that is closest to the blended color.
+        """
+        palette = self.palette
+        key = (color, bg, bpp, palette.version)
+        lut = self._aa_luts.get(key)
+        if lut is not None:
+            return lut
+
+        max_level = (1 << bpp) - 1
+        lut = array.array('H', bytes(2 << bpp))
+        indexed = self.use_tiny_buf or self.use_gs8_buf
+        # blend the real (RGB565) colors
+        color565 = palette._raw(color) if indexed else color
+        bg565 = palette._raw(bg) if indexed else bg
+
+        for level in range(1, max_level):
+            blended = self._blend565(bg565, color565, level, max_level)
+            lut[level] = palette.closest(blended) if indexed else self._format_color(blended)
+        lut[max_level] = self._format_color(color)
+
+        self._aa_luts.put(key, lut)
+        return lut
+
+
+    @micropython.viper
+    def _write_aa_text(self, font, text, x:int, y:int, lut):
+        """
+        Internal viper method to draw text with an anti-aliased (2 or 4 bpp) proportional font.
+        Designed to be envoked using the 'text' method.
+
+        The font has the same layout as for '_write_text', but each pixel in 'BITMAPS'
+        is a BPP bit coverage level (0 is transparent), which is drawn using the color in 'lut'.
+        """
+        height = int(font.HEIGHT)
+        self_width = int(self.width)
+        self_height = int(self.height)
+
+        # early return for text off screen
+        if y >= self_height or (y + height) < 0:
+            return
+
+        font_map = self._font_map(font)
+        widths = ptr8(font.WIDTHS)
+        offsets = ptr8(font.OFFSETS)
+        offset_width = int(font.OFFSET_WIDTH)
+        bitmaps = ptr8(font.BITMAPS)
+        bpp = int(font.BPP)
+        level_mask = (1 << bpp) - 1
+        colors = ptr16(lut)
+        utf8_scale = height // 8
+
+        use_tiny_fbuf = bool(self.use_tiny_buf)
+        use_gs8_fbuf = bool(self.use_gs8_buf)
+        fbuf16 = ptr16(self.fbuf)
+        fbuf8 = ptr8(self.fbuf)
+
+        # only draw the rows that are on screen
+        row_start = 0
+        if y < 0:
+            row_start = 0 - y
+        row_end = height
+        if y + height > self_height:
+            row_end = self_height - y
+
+        for char in text:
+            ch_idx = int(ord(char))
+            glyph = int(self._map_glyph(font_map, ch_idx))
+
+            if glyph >= 0:
+                width = widths[glyph]
+
+                # glyph bitmaps start at a (big-endian) bit offset
+                bit_start = 0
+                i = 0
+                while i < offset_width:
+                    bit_start = (bit_start << 8) | offsets[glyph * offset_width + i]
+                    i += 1
+
+                # only draw the columns that are on screen
+                col_start = 0
+                if x < 0:
+                    col_start = 0 - x
+                col_end = width
+                if x + width > self_width:
+                    col_end = self_width - x
+
+                row = row_start
+                while row < row_end:
+                    row_px = ((y + row) * self_width) + x
+                    # (pixels never cross a byte boundary, because bpp is 2 or 4)
+                    bit_idx = bit_start + ((row * width) + col_start) * bpp
+                    col = col_start
+                    while col < col_end:
+                        level = (bitmaps[bit_idx >> 3] >> (8 - bpp - (bit_idx & 7))) & level_mask
+                        if level:
+                            target_px = row_px + col
+                            clr = colors[level]
+                            if use_tiny_fbuf:
+                                # pack 4 bits into 8 bit ptr
+                                target_idx = target_px // 2
+                                dest_shift = ((target_px + 1) % 2) * 4
+                                dest_mask = 0xf0 >> dest_shift
+                                fbuf8[target_idx] = (fbuf8[target_idx] & dest_mask) | (clr << dest_shift)
+                            elif use_gs8_fbuf:
+                                # one byte per pixel
+                                fbuf8[target_px] = clr
+                            else:
+                                # draw to 16 bits
+                                fbuf16[target_px] = clr
+                        bit_idx += bpp
+                        col += 1
+                    row += 1
+                x += width
+            else:
+                # try drawing with utf8 instead
+                x += int(self.utf8_putc(ch_idx, x, y, colors[level_mask], utf8_scale))
+
+            # early return for text off screen
+            if x >= self_width:
+                return
+
+
+    @micropython.viper
+    def _measure_text(self, font, text) -> int:
+        """Get the width of text drawn with a proportional font."""
+        font_map = self._font_map(font)
+        widths = ptr8(font.WIDTHS)
+        # utf8 chars are 8 pixels wide (4 if ascii) scaled to the font height
+        utf8_width = (int(font.HEIGHT) // 8) * 8
+
+        total = 0
+        for char in text:
+            ch_idx = int(ord(char))
+            glyph = int(self._map_glyph(font_map, ch_idx))
+            if glyph >= 0:
+                total += widths[glyph]
+            elif ch_idx < 128:
+                total += utf8_width // 2
+            else:
+                total += utf8_width
+        return total
+
+
+    def text_width(self, text, font=None):
+        """
+        Get the width (in pixels) that 'text' will be drawn with.
+
+        This can be used to center or align text without drawing it first.
+
+        Args:
+            text (str): text to measure
+            font (optional): font module to use (the same as in 'text')
+        """
+        if not font:
+            # builtin font and utf8 chars are both 8 pixels wide
+            return len(text) * 8
+
+        if hasattr(font, 'MAP'):
+            return self._measure_text(font, text)
+
+        # chars that aren't in a bitmap font are drawn with the utf8 font, scaled to the font height
+        scale = font.HEIGHT // 8
+        first = font.FIRST
+        last = font.LAST
+        width = 0
+        for char in text:
+            ch_idx = ord(char)
+            if first <= ch_idx < last:
+                width += font.WIDTH
+            elif ch_idx < 128:
+                width += 4 * scale
+            else:
+                width += 8 * scale
+        return width
+
+
     @micropython.viper
     def _utf8_text(self, text, x:int, y:int, color:int):
         """Draw text, including utf8 characters"""
@@ -967,7 +2198,7 @@ class ST7789:
             idx += 1
         
 
-    def text(self, text, x, y, color, font=None):
+    def text(self, text, x, y, color, font=None, bg=None):
         """
         Draw text to the framebuffer.
         
@@ -979,34 +2210,85 @@ class ST7789:
             x (int): column to start drawing at
             y (int): row to start drawing at
             color (int): encoded color to use for text
-            font (optional): bitmap font module to use
+            font (optional): bitmap, or proportional, font module to use
+            bg (int): 
+                For anti-aliased (2 or 4 bpp) fonts, the color that the edges of the text are blended with.
+                Defaults to palette[2] (the MicroHydra bg_color).
         """
+        # proportional fonts use a MAP of their chars, instead of a FIRST/LAST range
+        if font and hasattr(font, 'MAP'):
+            font_map = self._font_map(font)
+            # mh_if not frozen:
+            self._utf8_prefetch(text, font_map[0], font_map[-2] + 1)
+            # mh_end_if
+            self._set_show_rect(x, y, x + self._measure_text(font, text), y + font.HEIGHT)
+            if font.BPP > 1:
+                lut = self._aa_lut(color, self.palette[2] if bg is None else bg, font.BPP)
+                self._write_aa_text(font, text, x, y, lut)
+            else:
+                self._write_text(font, text, x, y, self._format_color(color))
+            return
+
         color = self._format_color(color)
 
+        # mh_if not frozen:
+        # read all the utf8 glyphs we need up front (in file order)
+        if font:
+            self._utf8_prefetch(text, font.FIRST, font.LAST)
+        else:
+            self._utf8_prefetch(text, 0, 128)
+        # mh_end_if
 
         if font:
-            self._set_show_min(y, y + font.HEIGHT)
-            self._bitmap_text(font, text, x, y, color)
+            # utf8 characters are drawn 8px wide, scaled to the font height
+            char_width = max(font.WIDTH, font.HEIGHT // 8 * 8)
+            self._set_show_rect(x, y, x + len(text) * char_width, y + font.HEIGHT)
+            if self._glyph_cache_size and font.WIDTH % 8 == 0:
+                self._blit_text(font, text, x, y, color)
+            else:
+                self._bitmap_text(font, text, x, y, color)
         else:
-            self._set_show_min(y, y + 8)
+            self._set_show_rect(x, y, x + len(text) * 8, y + 8)
             self._utf8_text(text, x, y, color)
 
 
+    def prepare_bitmap(self, bitmap, palette=None):
+        """
+        Convert a bitmap module into a PreparedBitmap, which is much faster to draw.
+
+        Args:
+            bitmap (bitmap_module): The module containing the bitmap(s)
+            palette (list): Optional colors to use instead of bitmap.PALETTE
+        """
+        return PreparedBitmap(self, bitmap, palette)
+
+
     def bitmap(self, bitmap, x, y, index=0, key=-1, palette=None):
         """
         Draw a bitmap on display at the specified column and row
 
         Args:
-            bitmap (bitmap_module): The module containing the bitmap to draw
+            bitmap (bitmap_module|PreparedBitmap): The module containing the bitmap to draw,
+                or a PreparedBitmap made with `prepare_bitmap`
             x (int): column to start drawing at
             y (int): row to start drawing at
             index (int): Optional index of bitmap to draw from multiple bitmap
                 module
             key (int): colors that match the key will be transparent.
+            palette (list): Optional colors to use instead of the bitmap's palette
         """
         if self.width <= x or self.height <= y:
             return
-        
+
+        if isinstance(bitmap, PreparedBitmap):
+            if palette is not None:
+                bitmap.set_palette(palette)
+            if key != -1:
+                key = self._format_color(key)
+            self._set_show_rect(x, y, x + bitmap.width, y + bitmap.height)
+            self.fbuf.blit(bitmap.frames[index], x, y, key, bitmap.palette)
+            return
+
         if palette is None:
             palette = bitmap.PALETTE
         
@@ -1027,8 +2309,9 @@ class ST7789:
         starting_bit = bpp * bitmap_pixels * index  # if index > 0 else 0
         
         use_tiny_buf = bool(self.use_tiny_buf)
+        use_gs8_buf = bool(self.use_gs8_buf)
         
-        self._set_show_min(y, y + height)
+        self._set_show_rect(x, y, x + width, y + height)
         
         
         # format color palette into a pointer
@@ -1074,6 +2357,9 @@ class ST7789:
                     dest_shift = ((target_px + 1) % 2) * 4
                     dest_mask = 0xf0 >> dest_shift
                     fbuf8[target_idx] = (fbuf8[target_idx] & dest_mask) | (clr << dest_shift)
+                elif use_gs8_buf:
+                    # writing 8-bit pixels
+                    fbuf8[target_px] = clr
                 else:
                     # TODO: TEST THIS! (has only been tested for tiny fbuf)
                     # writing 16-bit pixels
@@ -1094,8 +2380,10 @@ class ST7789:
             color (int): Color of polygon
             fill (bool=False) : fill the polygon (or draw an outline)
         """
-        # calculate approx height so min/max can be set
-        h = max(coords)
-        self._set_show_min(y, y + h)
+        # calculate approx bounds so the dirty area can be set
+        # (min/max of all coords is a safe bound for both x and y)
+        c_min = min(coords)
+        c_max = max(coords) + 1
+        self._set_show_rect(x + c_min, y + c_min, x + c_max, y + c_max)
         color = self._format_color(color)
         self.fbuf.poly(x, y, coords, color, fill)
@@ -0,0 +1,153 @@
+"""
+Text measurement and layout for MicroHydra's Display.
+
+This module provides one shared implementation of the text sizing that apps and menus need:
+measuring text width (including utf8 characters, which are drawn wider than ascii characters),
+wrapping text to a maximum width, and shortening text with an ellipsis.
+
+Results are kept in a small cache (keyed on the text, font, and max width),
+so that UI elements which redraw the same strings every frame don't need to re-measure them.
+
+Example:
+```
+from lib.display import Display, textlayout
+
+display = Display()
+for idx, line in enumerate(textlayout.wrap("Some long text to show in a box", 120)):
+    display.text(line, textlayout.center_x(line, 240), 10 + idx * 10, display.palette[8])
+```
+"""
+from .display import Display
+from .lrucache import LRUCache
+
+
+_CACHE_SIZE = const(32)
+_ELLIPSIS = "..."
+
+_width_cache = LRUCache(_CACHE_SIZE)
+_layout_cache = LRUCache(_CACHE_SIZE)
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Measurement ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def width(text:str, font=None) -> int:
+    """
+    Get the width (in pixels) that text will be drawn with (see Display.text).
+
+    Args:
+        text (str): The text to measure.
+        font (optional): The font module the text is drawn with (None for the builtin font).
+    """
+    key = (text, font)
+    result = _width_cache.get(key)
+    if result is None:
+        result = Display.instance.text_width(text, font)
+        _width_cache.put(key, result)
+    return result
+
+
+def center_x(text:str, area_width:int, font=None, area_x:int = 0) -> int:
+    """Get the x position that horizontally centers text in an area."""
+    return area_x + (area_width - width(text, font)) // 2
+
+
+def clear_cache():
+    """Forget all cached measurements (for example, to free memory)."""
+    _width_cache.clear()
+    _layout_cache.clear()
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Layout ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def _fit_chars(text:str, max_width:int, font) -> int:
+    """Count how many leading characters of text fit in max_width (always at least 1)."""
+    display = Display.instance
+    total = 0
+    for idx, char in enumerate(text):
+        total += display.text_width(char, font)
+        if total > max_width:
+            return max(1, idx)
+    return len(text)
+
+
+def _wrap_words(paragraph:str, max_width:int, font, lines:list):
+    space_width = width(" ", font)
+    current = ""
+    current_width = 0
+
+    for word in paragraph.split():
+        word_width = width(word, font)
+        if current and current_width + space_width + word_width <= max_width:
+            current += " " + word
+            current_width += space_width + word_width
+            continue
+
+        if current:
+            lines.append(current)
+
+        # words that are too long for a line of their own are broken up
+        while word_width > max_width and len(word) > 1:
+            cut = _fit_chars(word, max_width, font)
+            lines.append(word[:cut])
+            word = word[cut:]
+            word_width = width(word, font)
+
+        current = word
+        current_width = word_width
+
+    lines.append(current)
+
+
+def _wrap_chars(paragraph:str, max_width:int, font, lines:list):
+    while width(paragraph, font) > max_width and len(paragraph) > 1:
+        cut = _fit_chars(paragraph, max_width, font)
+        lines.append(paragraph[:cut])
+        paragraph = paragraph[cut:]
+    lines.append(paragraph)
+
+
+def wrap(text:str, max_width:int, font=None, words=True) -> tuple:
+    """
+    Split text into lines that fit within max_width pixels.
+
+    Args:
+        text (str): The text to wrap. Newlines always start a new line.
+        max_width (int): The maximum width of a line, in pixels.
+        font (optional): The font module the text is drawn with.
+        words (bool):
+            If True, lines are broken between words (and only long words are split).
+            If False, lines are filled with as many characters as will fit.
+
+    Returns a tuple of lines (which is cached, so it shouldn't be modified).
+    """
+    key = (text, font, max_width, words)
+    lines = _layout_cache.get(key)
+    if lines is not None:
+        return lines
+
+    lines = []
+    for paragraph in text.split("\n"):
+        if words:
+            _wrap_words(paragraph, max_width, font, lines)
+        else:
+            _wrap_chars(paragraph, max_width, font, lines)
+
+    lines = tuple(lines)
+    _layout_cache.put(key, lines)
+    return lines
+
+
+def ellipsize(text:str, max_width:int, font=None) -> str:
+    """Shorten text (adding "...") so that it fits within max_width pixels."""
+    if width(text, font) <= max_width:
+        return text
+
+    key = (text, font, max_width, _ELLIPSIS)
+    result = _layout_cache.get(key)
+    if result is not None:
+        return result
+
+    cut = _fit_chars(text, max_width - width(_ELLIPSIS, font), font)
+    result = text[:cut].rstrip() + _ELLIPSIS
+    _layout_cache.put(key, result)
+    return result
@@ -27,9 +27,20 @@ DEFAULT_CONFIG = const(
 
 
 
+# extended palette gradient (see lib.display.palette)
+_GRADIENT_START = const(16)
+_GRADIENT_LEN = const(24)
+
+
+
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Config Class ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class Config:
+    # Functions called with the Palette each time it's generated,
+    # so that apps can add their own colors (e.g. to the extended, 256 color palette).
+    palette_hooks = []
+
     def __init__(self):
         """
         This class aims to provide a convenient abstraction of the MicroHydra config.json
@@ -96,6 +107,22 @@ class Config:
         self.palette[14] = compliment_color565(bg_color)
         self.palette[15] = compliment_color565(ui_color)
 
+        # the extended (use_gs8_buf) palette also gets a smooth gradient between the user colors
+        if self.palette.extended:
+            for i in range(_GRADIENT_LEN):
+                self.palette[_GRADIENT_START + i] = mix_color565(bg_color, ui_color, i / (_GRADIENT_LEN - 1))
+
+        for hook in Config.palette_hooks:
+            hook(self.palette)
+
+
+    @staticmethod
+    def add_palette_hook(hook):
+        """Add a function to be called (with the Palette) when the palette is generated, and call it now."""
+        Config.palette_hooks.append(hook)
+        if hasattr(Config, 'instance') and hasattr(Config.instance, 'palette'):
+            hook(Config.instance.palette)
+
 
     def __getitem__(self, key):
         # get item passthrough
@@ -5,7 +5,7 @@ lib/Settings.py uses this module heavily.
 
 import math, array, time
 from lib.hydra import color, beeper
-from lib.display import Display
+from lib.display import Display, textlayout
 from lib.hydra.config import Config
 from lib.userinput import UserInput
 from font import vga2_16x32 as font
@@ -846,13 +846,6 @@ def get_text_center(text:str):
     return (center)
 
 
-def get_text_width(text) -> int:
-    width = 0
-    for char in text:
-        width += 16 if ord(char) < 128 else 32
-    return width
-
-
 # left text
 _LEFT_TEXT_UNSELECTED_X = const(10)
 _LEFT_TEXT_TINY_X = const(14)
@@ -860,7 +853,7 @@ _LEFT_TEXT_ARROW_X = const(-4)
 _MAX_LEFT_SIZE = const((_MH_DISPLAY_WIDTH * 2)  // 3)
 
 def draw_left_text(text:str, y_pos:int, selected):
-    if get_text_width(text) < _MAX_LEFT_SIZE:
+    if textlayout.width(text, font) < _MAX_LEFT_SIZE:
         fnt = font
         x = _LEFT_TEXT_UNSELECTED_X
         y = y_pos
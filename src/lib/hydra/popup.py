@@ -3,7 +3,8 @@ Previously called lib/mhoverlay,
 this module provides an easy way to create popup messages, options, and input fields.
 """
 import time
-from lib.display import Display
+from lib.display import Display, textlayout
+from lib.display.layer import Layer
 from lib.hydra.config import Config
 from lib.userinput import UserInput
 
@@ -23,6 +24,9 @@ _WINDOW_HEIGHT = const(_MH_DISPLAY_HEIGHT - (_WINDOW_PADDING * 2))
 
 _MAX_TEXT_WIDTH = const(_WINDOW_WIDTH // _FONT_WIDTH)
 
+# extra lines of text saved under a TextEntry (as it grows)
+_ENTRY_ROOM_LINES = const(3)
+
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ UIOverlay Class ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 class UIOverlay:
@@ -42,6 +46,10 @@ class UIOverlay:
         except AttributeError as e:
             raise AttributeError("Display has no instance. (Please initialize Display before UIOverlay)") from e
 
+        # whether the last popup put back what was underneath it
+        # (if False, the app has to redraw the screen itself)
+        self.background_restored = False
+
 
     def text_entry(self, start_value='', title="Enter text:"):
         """
@@ -86,29 +94,99 @@ class PopupObject:
         self.config = ui_overlay.config
         self.kb = ui_overlay.kb
         self.display = ui_overlay.display
+        self.ui_overlay = ui_overlay
+        # the area the popup has drawn to (x0, y0, x1, y1)
+        self._drawn_area = None
+        # a Layer holding what was underneath the popup
+        self._background = None
+
+
+    def _add_drawn_area(self, x, y, width, height):
+        """Track the area covered by the popup, so it can be restored when it closes."""
+        if self._drawn_area is None:
+            self._drawn_area = [x, y, x + width, y + height]
+        else:
+            area = self._drawn_area
+            area[0] = min(area[0], x)
+            area[1] = min(area[1], y)
+            area[2] = max(area[2], x + width)
+            area[3] = max(area[3], y + height)
+
+
+    def save_background(self, x, y, width, height):
+        """
+        Save the area of the display that the popup will cover, so it can be restored when the popup closes.
+        (If there isn't enough memory, nothing is saved, and the app has to redraw the screen instead.)
+        """
+        display = self.display
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = min(display.width, x + width)
+        y1 = min(display.height, y + height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        try:
+            self._background = Layer(display, x0, y0, x1 - x0, y1 - y0)
+        except MemoryError:
+            print("WARNING: Not enough memory to save the background for this popup.")
+            return
+        self._background.capture()
+
+
+    def restore_background(self) -> bool:
+        """
+        Put back what was underneath the popup (without redrawing it), and show it.
+        Returns True if it was restored, or False if the app needs to redraw the screen.
+        """
+        layer = self._background
+        area = self._drawn_area
+        self._background = None
+        self._drawn_area = None
+
+        restored = False
+        if layer is not None and area is not None:
+            display = self.display
+            x0 = max(0, area[0])
+            y0 = max(0, area[1])
+            x1 = min(display.width, area[2])
+            y1 = min(display.height, area[3])
+            # only restore if the popup stayed inside the saved area
+            if x0 >= layer.x and y0 >= layer.y \
+            and x1 <= layer.x + layer.width and y1 <= layer.y + layer.height:
+                layer.restore(x0, y0, x1 - x0, y1 - y0)
+                display.show()
+                restored = True
+
+        self.ui_overlay.background_restored = restored
+        return restored
 
 
     @staticmethod
-    def split_lines(text:str, max_length:int=_MAX_TEXT_WIDTH) -> list[str]:
-        """Split a string into multiple lines, based on max line-length."""
-        lines = []
-        current_line = ''
-        words = text.split()
-
-        for word in words:
-            if len(word) + len(current_line) >= max_length:
-                lines.append(current_line)
-                current_line = word
-            elif len(current_line) == 0:
-                current_line += word
-            else:
-                current_line += ' ' + word
-            
-        lines.append(current_line) # add final line
-            
-        return lines
+    def split_lines(text:str, max_length:int=_MAX_TEXT_WIDTH) -> tuple[str]:
+        """Split a string into multiple lines, based on max line-length (in characters)."""
+        return textlayout.wrap(text, max_length * _FONT_WIDTH)
     
     
+    def _text_box(self, text, title=None, min_width=0, min_height=0) -> tuple:
+        """Get the lines of a text box, and its (x, y, width, height) (not including the border)."""
+        lines = self.split_lines(text)
+        
+        if title: # add title before text
+            lines = (title, '') + lines
+        
+        box_height = max((len(lines) * 10) + 8, min_height)
+        box_width = max(max(textlayout.width(line) for line in lines) + 8, min_width)
+        box_x = _DISPLAY_WIDTH_CENTER - (box_width // 2)
+        box_y = _DISPLAY_HEIGHT_CENTER - (box_height // 2)
+        return lines, box_x, box_y, box_width, box_height
+
+
+    def save_text_box_background(self, text, title=None, min_width=0, min_height=0):
+        """Save the background underneath a text box (including its border)."""
+        _, box_x, box_y, box_width, box_height = self._text_box(text, title, min_width, min_height)
+        self.save_background(box_x - 3, box_y - 3, box_width + 6, box_height + 6)
+
+
     def draw_text_box(
         self,
         text,
@@ -122,17 +200,10 @@ class PopupObject:
         Draw a text box, with optional title and minimum sizes.
         Returns a tuple of box width/height (for tracking minimum width/height)
         """
-        lines = self.split_lines(text)
-        
-        if title: # add title before text
-            lines = [title, ''] + lines
-        
-        box_height = max((len(lines) * 10) + 8, min_height)
-        box_width = max((len(max(lines, key=len)) * 8) + 8, min_width)
-        box_x = _DISPLAY_WIDTH_CENTER - (box_width // 2)
-        box_y = _DISPLAY_HEIGHT_CENTER - (box_height // 2)
+        lines, box_x, box_y, box_width, box_height = self._text_box(text, title, min_width, min_height)
         
         # draw box
+        self._add_drawn_area(box_x - 3, box_y - 3, box_width + 6, box_height + 6)
         for i in range(4):
             self.display.rect(
                 box_x - i, box_y - i,
@@ -142,7 +213,7 @@ class PopupObject:
                 )
         
         for idx, line in enumerate(lines):
-            centered_x = _DISPLAY_WIDTH_CENTER - (len(line) * 4)
+            centered_x = textlayout.center_x(line, _MH_DISPLAY_WIDTH)
             self.display.text(line, centered_x, box_y + 4 + (idx*10), self.config.palette[clr_idx])
         
         return box_width, box_height
@@ -157,6 +228,7 @@ class PopupText(PopupObject):
 
     def main(self):
         """Main program in PopupObject"""
+        self.save_text_box_background(self.text)
         self.draw_text_box(self.text, clr_idx=8)
         self.display.show()
             
@@ -164,6 +236,7 @@ class PopupText(PopupObject):
         self.kb.get_new_keys() # run once to update keys
         while True:
             if self.kb.get_new_keys(): # any key closes text box
+                self.restore_background()
                 return
 
 
@@ -176,6 +249,7 @@ class PopupError(PopupObject):
 
     def main(self):
         """Main program in PopupObject"""
+        self.save_text_box_background(self.text, title="ERROR:")
         self.draw_text_box(self.text, clr_idx=11, bg_clr=0, title="ERROR:")
         self.display.show()
             
@@ -183,6 +257,7 @@ class PopupError(PopupObject):
         self.kb.get_new_keys() # run once to update keys
         while True:
             if self.kb.get_new_keys(): # any key closes text box
+                self.restore_background()
                 return
 
 
@@ -217,6 +292,13 @@ class TextEntry(PopupObject):
         Display a popup text entry box.
         Blocks until "enter" key pressed, returning written text.
         """
+        # save room for the text to grow (up to the full width, and a few more lines)
+        _, _, _, _, box_height = self._text_box(self.text + "|", self.title)
+        self.save_text_box_background(
+            self.text + "|", self.title,
+            min_width=_MAX_TEXT_WIDTH * _FONT_WIDTH + 8,
+            min_height=box_height + _ENTRY_ROOM_LINES * 10,
+            )
         self.draw()
         
         draw_time = time.ticks_ms()
@@ -230,8 +312,10 @@ class TextEntry(PopupObject):
                 elif key == "BSPC":
                     self.text = self.text[:-1]
                 elif key == "ENT" or key == "G0":
+                    self.restore_background()
                     return self.text
                 elif key == "ESC":
+                    self.restore_background()
                     return self.start_text
                 elif key == "DEL":
                     self.text = ''
@@ -299,6 +383,24 @@ class PopupOptions(PopupObject):
         
 
 
+    def _box(self) -> tuple:
+        """Get the (x, y, width, height) covered by the options and their title."""
+        display_width = self.display.width
+        bg_y = (self.display.height - self.total_height) // 2
+        if self.title is None:
+            bg_width = self.total_width
+            x0 = (display_width - bg_width) // 2
+            return x0, bg_y, bg_width, self.total_height
+
+        title_box_width = max(len(self.title) * _FONT_WIDTH + _OPTION_X_PADDING_TOTAL, self.total_width)
+        title_box_x = display_width // 2 - title_box_width // 2
+        title_box_y = bg_y - _OPTION_BOX_HEIGHT - _OPTION_Y_PADDING
+        bg_x = (display_width - title_box_width) // 2
+        x0 = min(title_box_x, bg_x)
+        x1 = max(title_box_x, bg_x) + title_box_width
+        return x0, title_box_y, x1 - x0, bg_y + self.total_height - title_box_y
+
+
     def draw_option_box(self, text, x, y, selected=False):
         box_width = (len(text) * 8) + _OPTION_X_PADDING_TOTAL
         x -= box_width // 2
@@ -306,6 +408,7 @@ class PopupOptions(PopupObject):
         
         depth = self.depth
         
+        self._add_drawn_area(x, y, box_width, _OPTION_BOX_HEIGHT)
         self.display.rect(
             x, y, box_width, _OPTION_BOX_HEIGHT,
             self.config.palette[(6 + depth) % 11 if selected else (4 + depth) % 11],
@@ -340,6 +443,10 @@ class PopupOptions(PopupObject):
             title_box_y = bg_y - _OPTION_BOX_HEIGHT - _OPTION_Y_PADDING
             
             
+            self._add_drawn_area(
+                title_box_x, title_box_y,
+                title_box_width, _OPTION_BOX_HEIGHT + _OPTION_Y_PADDING,
+                )
             self.display.rect(
                 title_box_x, title_box_y,
                 title_box_width, _OPTION_BOX_HEIGHT + _OPTION_Y_PADDING,
@@ -363,6 +470,7 @@ class PopupOptions(PopupObject):
         bg_x = (display_width - bg_width) // 2
         
         # draw bg:
+        self._add_drawn_area(bg_x, bg_y, bg_width, self.total_height)
         self.display.rect(
             bg_x,
             bg_y,
@@ -410,6 +518,7 @@ class PopupOptions(PopupObject):
         Display a popup options menu.
         Blocks until "enter" key pressed, returning option str.
         """
+        self.save_background(*self._box())
         self.draw()
 
         
@@ -429,9 +538,11 @@ class PopupOptions(PopupObject):
                     self.cursor_y = (self.cursor_y + 1) % len(self.options[self.cursor_x])
 
                 elif key == "ESC" or key == "BSPC":
+                    self.restore_background()
                     return None
 
                 elif key == self.kb.main_action or key == self.kb.secondary_action:
+                    self.restore_background()
                     return self.options[self.cursor_x][self.cursor_y]
             
             if keys:
@@ -4,15 +4,20 @@ It can be used to simply print status information to the device.
 
 When `immediate` is set to `True` (the default value), it draws and shows itself every time you print to it.
 When `False`, only draw when you call the draw method. You must call `Display.show` manually.
+
+When drawing immediately, new lines are added by scrolling the display (see `Display.scroll_area`),
+so only the new lines need to be drawn.
 """
-from lib.display import Display
+from lib.display import Display, textlayout
 from lib.hydra.config import Config
 
 
 _MH_DISPLAY_HEIGHT = const(135)
 _MH_DISPLAY_WIDTH = const(240)
-_MAX_H_CHARS = const(_MH_DISPLAY_WIDTH // 8)
-_MAX_V_LINES = const(_MH_DISPLAY_HEIGHT // 9)
+_LINE_HEIGHT = const(9)
+_MAX_V_LINES = const(_MH_DISPLAY_HEIGHT // _LINE_HEIGHT)
+# rows at the bottom of the display that don't fit a whole line
+_FOOTER_HEIGHT = const(_MH_DISPLAY_HEIGHT - (_MAX_V_LINES * _LINE_HEIGHT))
 
 class SimpleTerminal:
     lines = []
@@ -23,35 +28,52 @@ class SimpleTerminal:
         self.display = Display.instance
         self.config = Config.instance if hasattr(Config, 'instance') else Config()
         self.immediate = immediate
+        # the display's fill_count when the whole terminal was last drawn.
+        # If it changes, something else has drawn over the terminal, and it can't be scrolled.
+        self._fill_count = None
 
 
     def print(self, text):
         text = str(text)
         print(text)
         
-        new_lines = []
-        
         # cut up line when it's too long
-        while len(text) > _MAX_H_CHARS:
-            new_lines.append(text[:_MAX_H_CHARS])
-            text = text[_MAX_H_CHARS:]
-        new_lines.append(text)
+        new_lines = textlayout.wrap(text, _MH_DISPLAY_WIDTH, words=False)
         
         # add new lines, trim to correct length
         self.lines += new_lines
-        if len(self.lines) > _MAX_V_LINES:
+        scroll_lines = len(self.lines) - _MAX_V_LINES
+        if scroll_lines > 0:
             self.lines = self.lines[-_MAX_V_LINES:]
         
         if self.immediate:
-            self.display.fill(self.config.palette[2])
-            self.draw()
+            if self._fill_count == self.display.fill_count \
+            and scroll_lines < _MAX_V_LINES:
+                # scroll old lines up, and only draw what has changed
+                if scroll_lines > 0:
+                    self.display.scroll_area(scroll_lines * _LINE_HEIGHT, self.config.palette[2])
+                # the previous last line also changes color
+                self._draw_lines(max(0, len(self.lines) - len(new_lines) - 1))
+            else:
+                self.display.fill(self.config.palette[2])
+                self.draw()
             self.display.show()
 
 
     def draw(self):
-        for idx, line in enumerate(self.lines):
+        # lines scroll in an area that fits a whole number of lines
+        self.display.set_scroll_area(0, _FOOTER_HEIGHT)
+        self._draw_lines(0)
+        self._fill_count = self.display.fill_count
+
+
+    def _draw_lines(self, start_idx):
+        """Draw lines from start_idx to the end, clearing behind them first."""
+        for idx in range(start_idx, len(self.lines)):
+            y = self.display.scroll_y(idx * _LINE_HEIGHT)
+            self.display.rect(0, y, _MH_DISPLAY_WIDTH, _LINE_HEIGHT, self.config.palette[2], fill=True)
             self.display.text(
-                line,
-                0, idx * 9,
+                self.lines[idx],
+                0, y,
                 self.config.palette[8 if idx == len(self.lines) - 1 else 7]
                 )
@@ -0,0 +1,292 @@
+"""
+Record and replay input for MicroHydra's UserInput.
+
+An InputRecorder saves everything returned by `UserInput.get_new_keys()` and `get_touch_events()`
+(with the time since recording started) into a compact binary log.
+An InputReplayer then feeds a log back through those same methods, instead of reading the hardware.
+Replays can follow the original timing, or return one recorded event per call (as fast as the app polls).
+
+Combined with the HOST device's headless Display (and `lib.display.profiler`),
+this gives repeatable end-to-end benchmarks of real apps.
+
+Record a session (with one line, after UserInput has been created):
+```
+from lib.userinput import inputlog; inputlog.record("/sd/input.bin")
+# ... use the app, then:
+inputlog.stop()
+```
+and replay it later with `inputlog.replay("/sd/input.bin", realtime=False)`.
+"""
+import time
+import struct
+from .userinput import UserInput
+
+# mh_if touchscreen:
+# from ._touch import Tap, Swipe
+# mh_else:
+from collections import namedtuple
+# (the same as the touch module's events, so that touch logs can be replayed on any device)
+Tap = namedtuple("Tap", ['x', 'y', 'size', 'duration'])
+Swipe = namedtuple("Swipe", ['x0', 'y0', 'x1', 'y1', 'size', 'duration', 'distance', 'direction'])
+# mh_end_if
+
+
+_DEFAULT_PATH = "/input.bin"
+
+# file layout:
+# header, then a record for every call that returned something.
+# each record is a _RECORD_HEADER (ticks_ms since start, kind, number of items), followed by its items:
+#   keys: a length byte, and the utf8 key name.
+#   touch: a tag byte, then a _TAP or _SWIPE struct.
+_HEADER = b"MHIN\x01"
+_RECORD_HEADER = "<IBB"
+_RECORD_HEADER_SIZE = const(6)
+
+_KIND_KEYS = const(0)
+_KIND_TOUCH = const(1)
+
+_TAG_TAP = const(0)
+_TAG_SWIPE = const(1)
+_TAP = "<hhHI"
+_SWIPE = "<hhhhHIHB"
+_DIRECTIONS = const(("UP", "DOWN", "LEFT", "RIGHT"))
+
+_MAX_ITEMS = const(255)
+
+
+
+def _patch(user_input, name, function, saved):
+    """Replace a UserInput method (with an instance attribute), returning the original.
+
+    Any instance attribute being replaced is stored in `saved`, so that `_unpatch` can put it back.
+    """
+    original = getattr(user_input, name, None)
+    saved[name] = user_input.__dict__.get(name)
+    setattr(user_input, name, function)
+    return original
+
+
+def _unpatch(user_input, saved):
+    """Undo every `_patch` recorded in `saved`."""
+    for name, original in saved.items():
+        if original is None:
+            # fall back to the class method again
+            delattr(user_input, name)
+        else:
+            setattr(user_input, name, original)
+    saved.clear()
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Recording ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class InputRecorder:
+    """
+    Records input by wrapping UserInput's get_new_keys and get_touch_events methods.
+
+    Args:
+        user_input (UserInput): The UserInput to record.
+        path (str|None): If given, the log is saved here when recording stops.
+    """
+    def __init__(self, user_input, path=None):
+        self.user_input = user_input
+        self.path = path
+        self.log = bytearray(_HEADER)
+        self.count = 0
+        self._start = time.ticks_ms()
+
+        self._saved = {}
+        self._get_new_keys = _patch(user_input, 'get_new_keys', self.get_new_keys, self._saved)
+        self._get_touch_events = None
+        if hasattr(user_input, 'get_touch_events'):
+            self._get_touch_events = _patch(
+                user_input, 'get_touch_events', self.get_touch_events, self._saved,
+                )
+
+
+    def _add_record(self, kind, count):
+        self.log += struct.pack(_RECORD_HEADER, time.ticks_diff(time.ticks_ms(), self._start), kind, count)
+        self.count += 1
+
+
+    def get_new_keys(self):
+        """Call the original get_new_keys, and record its result."""
+        keys = self._get_new_keys()
+        if keys:
+            self._add_record(_KIND_KEYS, min(len(keys), _MAX_ITEMS))
+            for key in keys[:_MAX_ITEMS]:
+                name = key.encode()
+                self.log.append(len(name))
+                self.log += name
+        return keys
+
+
+    def get_touch_events(self):
+        """Call the original get_touch_events, and record its result."""
+        events = self._get_touch_events()
+        if events:
+            self._add_record(_KIND_TOUCH, min(len(events), _MAX_ITEMS))
+            for event in events[:_MAX_ITEMS]:
+                if hasattr(event, 'direction'):
+                    self.log.append(_TAG_SWIPE)
+                    self.log += struct.pack(
+                        _SWIPE,
+                        event.x0, event.y0, event.x1, event.y1,
+                        event.size, event.duration, event.distance,
+                        _DIRECTIONS.index(event.direction),
+                        )
+                else:
+                    self.log.append(_TAG_TAP)
+                    self.log += struct.pack(_TAP, event.x, event.y, event.size, event.duration)
+        return events
+
+
+    def save(self, path):
+        """Write the log to a file."""
+        with open(path, 'wb') as f:
+            f.write(self.log)
+
+
+    def stop(self):
+        """Stop recording (restoring UserInput's methods), and save the log if a path was given."""
+        _unpatch(self.user_input, self._saved)
+        if self.path:
+            self.save(self.path)
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Replaying ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def load(path) -> tuple:
+    """
+    Read a log file.
+    Returns a (key_records, touch_records) tuple, where each is a list of (ticks_ms, items) tuples.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:len(_HEADER)] != _HEADER:
+        raise ValueError(f"'{path}' is not an input log.")
+
+    key_records = []
+    touch_records = []
+    tap_size = struct.calcsize(_TAP)
+    swipe_size = struct.calcsize(_SWIPE)
+
+    idx = len(_HEADER)
+    while idx < len(data):
+        ticks, kind, count = struct.unpack_from(_RECORD_HEADER, data, idx)
+        idx += _RECORD_HEADER_SIZE
+        items = []
+        for _ in range(count):
+            if kind == _KIND_KEYS:
+                length = data[idx]
+                items.append(data[idx + 1:idx + 1 + length].decode())
+                idx += 1 + length
+            elif data[idx] == _TAG_SWIPE:
+                values = struct.unpack_from(_SWIPE, data, idx + 1)
+                items.append(Swipe(*values[:7], _DIRECTIONS[values[7]]))
+                idx += 1 + swipe_size
+            else:
+                items.append(Tap(*struct.unpack_from(_TAP, data, idx + 1)))
+                idx += 1 + tap_size
+
+        if kind == _KIND_KEYS:
+            key_records.append((ticks, items))
+        else:
+            touch_records.append((ticks, items))
+
+    return key_records, touch_records
+
+
+class InputReplayer:
+    """
+    Replays a log by replacing UserInput's get_new_keys and get_touch_events methods.
+
+    Args:
+        user_input (UserInput): The UserInput to replace the input of.
+        path (str): The log file to replay.
+        realtime (bool):
+            If True, events are returned at the same time (since the replay started) as they were recorded.
+            If False, each call returns the next recorded event, regardless of timing.
+    """
+    def __init__(self, user_input, path, realtime=True):
+        self.user_input = user_input
+        self.realtime = realtime
+        self._key_records, self._touch_records = load(path)
+        self._key_idx = 0
+        self._touch_idx = 0
+        self._start = time.ticks_ms()
+
+        self._saved = {}
+        self._get_new_keys = _patch(user_input, 'get_new_keys', self.get_new_keys, self._saved)
+        self._get_touch_events = _patch(user_input, 'get_touch_events', self.get_touch_events, self._saved)
+
+
+    @property
+    def finished(self) -> bool:
+        """Whether every recorded event has been replayed."""
+        return self._key_idx >= len(self._key_records) \
+            and self._touch_idx >= len(self._touch_records)
+
+
+    def _next_items(self, records, idx) -> tuple:
+        """Return (items, new_idx) for the records that are due."""
+        if not self.realtime:
+            if idx < len(records):
+                return list(records[idx][1]), idx + 1
+            return [], idx
+
+        now = time.ticks_diff(time.ticks_ms(), self._start)
+        items = []
+        while idx < len(records) and records[idx][0] <= now:
+            items += records[idx][1]
+            idx += 1
+        return items, idx
+
+
+    def get_new_keys(self):
+        """Return the next recorded keys."""
+        keys, self._key_idx = self._next_items(self._key_records, self._key_idx)
+        return keys
+
+
+    def get_touch_events(self):
+        """Return the next recorded touch events."""
+        events, self._touch_idx = self._next_items(self._touch_records, self._touch_idx)
+        return events
+
+
+    def stop(self):
+        """Stop replaying, and read the real input again."""
+        _unpatch(self.user_input, self._saved)
+
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ One-line API ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+_active = None
+
+
+def record(path=_DEFAULT_PATH, user_input=None) -> InputRecorder:
+    """Start recording the input of user_input (the UserInput instance, if not given)."""
+    global _active
+    stop()
+    if user_input is None:
+        user_input = UserInput.instance
+    _active = InputRecorder(user_input, path)
+    return _active
+
+
+def replay(path=_DEFAULT_PATH, realtime=True, user_input=None) -> InputReplayer:
+    """Start replaying a log into user_input (the UserInput instance, if not given)."""
+    global _active
+    stop()
+    if user_input is None:
+        user_input = UserInput.instance
+    _active = InputReplayer(user_input, path, realtime)
+    return _active
+
+
+def stop():
+    """Stop recording (saving the log) or replaying."""
+    global _active
+    if _active is not None:
+        _active.stop()
+        _active = None
@@ -0,0 +1,167 @@
+"""
+A fixed-size queue of timestamped key events, for MicroHydra's keyboard drivers.
+
+The queue is designed to be filled from a timer callback (by a background keyboard scanner),
+and drained by the app using `UserInput.poll_events()`.
+It never allocates when events are added, and when it's full the oldest events are dropped.
+
+Each event is stored as two 32-bit words: the ticks_ms timestamp, and the (device-specific) keycode,
+with PRESSED set for key presses (and clear for releases).
+
+This module also provides `diff_state`, which the keyboard drivers use to compare key state bitmasks
+(so that unchanged keys don't need to be converted into readable names on every poll).
+"""
+import array
+
+
+_DEFAULT_SIZE = const(64)
+PRESSED = const(0x100)
+_CODE_MASK = const(0xff)
+
+# position array indices
+_HEAD = const(0)
+_COUNT = const(1)
+_DROPPED = const(2)
+
+
+
+@micropython.viper
+def _push(events, pos, size:int, code:int, ticks:int):
+    """Add one event to the ring buffer, overwriting the oldest event if it is full."""
+    events_ptr = ptr32(events)
+    pos_ptr = ptr32(pos)
+    head = pos_ptr[_HEAD]
+    events_ptr[head * 2] = ticks
+    events_ptr[head * 2 + 1] = code
+    pos_ptr[_HEAD] = (head + 1) % size
+    if pos_ptr[_COUNT] < size:
+        pos_ptr[_COUNT] += 1
+    else:
+        pos_ptr[_DROPPED] += 1
+
+@micropython.viper
+def diff_state(old_state, new_state, words:int, changes) -> int:
+    """
+    Compare two key state bitmasks (arrays of 32-bit words, where bit N is keycode N),
+    and copy new_state into old_state.
+
+    The keycode of every key that changed is written to changes (an array('H')),
+    with PRESSED set for key presses. Returns the number of changes (0 if nothing changed).
+    """
+    old_ptr = ptr32(old_state)
+    new_ptr = ptr32(new_state)
+    changes_ptr = ptr16(changes)
+    count = 0
+
+    word = 0
+    while word < words:
+        new_word = new_ptr[word]
+        changed = old_ptr[word] ^ new_word
+        bit = 0
+        while changed:
+            if changed & 1:
+                code = (word << 5) + bit
+                if (new_word >> bit) & 1:
+                    code |= PRESSED
+                changes_ptr[count] = code
+                count += 1
+            changed = (changed >> 1) & 0x7fffffff
+            bit += 1
+        old_ptr[word] = new_word
+        word += 1
+
+    return count
+
+
+
+class KeyEventQueue:
+    """
+    Ring buffer of key press/release events.
+
+    Args:
+        size (int): The maximum number of events to hold.
+    """
+    def __init__(self, size=_DEFAULT_SIZE):
+        self.size = size
+        self._events = array.array('I', bytes(size * 8))
+        self._pos = array.array('I', (0, 0, 0))
+        # events are copied here when they're taken from the queue
+        self._taken = array.array('I', bytes(size * 8))
+
+
+    def __len__(self):
+        return self._pos[_COUNT]
+
+
+    @property
+    def dropped(self) -> int:
+        """How many events have been lost because the queue was full."""
+        return self._pos[_DROPPED]
+
+
+    def push(self, code, pressed, ticks):
+        """Add an event to the queue."""
+        _push(self._events, self._pos, self.size, code | (PRESSED if pressed else 0), ticks)
+
+
+    @micropython.viper
+    def push_changes(self, old_state, new_state, words:int, ticks:int):
+        """
+        Compare two key state bitmasks (arrays of 32-bit words, where bit N is keycode N),
+        add a press or release event for every key that changed,
+        and copy new_state into old_state.
+        """
+        old_ptr = ptr32(old_state)
+        new_ptr = ptr32(new_state)
+        events = self._events
+        pos = self._pos
+        size = int(self.size)
+
+        word = 0
+        while word < words:
+            new_word = new_ptr[word]
+            changed = old_ptr[word] ^ new_word
+            bit = 0
+            while changed:
+                if changed & 1:
+                    code = (word << 5) + bit
+                    if (new_word >> bit) & 1:
+                        code |= PRESSED
+                    _push(events, pos, size, code, ticks)
+                changed = (changed >> 1) & 0x7fffffff
+                bit += 1
+            old_ptr[word] = new_word
+            word += 1
+
+
+    @micropython.viper
+    def _take(self) -> int:
+        """
+        Move all waiting events (oldest first) into self._taken, and return how many there were.
+        (This is viper, so it can't be interrupted by the timer callback that adds events.)
+        """
+        events = ptr32(self._events)
+        taken = ptr32(self._taken)
+        pos = ptr32(self._pos)
+        size = int(self.size)
+
+        count = pos[_COUNT]
+        idx = (pos[_HEAD] - count + size) % size
+        out = 0
+        while out < count:
+            taken[out * 2] = events[idx * 2]
+            taken[out * 2 + 1] = events[idx * 2 + 1]
+            idx = (idx + 1) % size
+            out += 1
+        pos[_COUNT] = 0
+        return count
+
+
+    def pop_all(self) -> list:
+        """Remove all waiting events, and return them as a list of (keycode, pressed, ticks_ms) tuples."""
+        count = self._take()
+        taken = self._taken
+        return [
+            (taken[i * 2 + 1] & _CODE_MASK, bool(taken[i * 2 + 1] & PRESSED), taken[i * 2])
+            for i in range(count)
+            ]
@@ -28,6 +28,10 @@ _FONT_HEIGHT = const(8)
 _BOX_HEIGHT = const(_FONT_HEIGHT + (_PADDING * 2) + 1)
 _RADIUS = const((_BOX_HEIGHT - 1) // 2)
 
+# sets make the per-key membership tests cheap
+_MOD_KEYS = set(_keys.MOD_KEYS)
+_ALWAYS_NEW_KEYS = set(_keys.ALWAYS_NEW_KEYS)
+
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ UserInput: ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -51,6 +55,10 @@ class UserInput(_keys.Keys):
     
     allow_locking_keys : bool = True
         Set to False to disable locking modifier keys (True uses the value in config.json).
+
+    event_scan_ms : int = None
+        If given (and supported by the device), scan the keyboard in the background at this interval,
+        recording every key press/release so that they can be read with `poll_events`.
     
     **kwargs :
         Passes other (device-specific) keywords to _keys.Keys
@@ -61,12 +69,15 @@ class UserInput(_keys.Keys):
         repeat_ms=80,
         use_sys_commands=True,
         allow_locking_keys=False,
+        event_scan_ms=None,
         **kwargs):
         
         self.config = Config()
         
         # key repetition / locking keys
         self.tracker = {}
+        # the key_state list that was last added to the tracker
+        self._tracked_key_state = None
         self.hold_ms = hold_ms
         self.repeat_delta = hold_ms - repeat_ms
 
@@ -81,6 +92,18 @@ class UserInput(_keys.Keys):
 
         # init _keys.Keys
         super().__init__(**kwargs)
+
+        # key events (see poll_events)
+        # readable names of pressed keys, by keycode (so releases match their presses)
+        self._event_keys = {}
+        # keys seen by the last poll_events (for devices without a background scanner)
+        self._event_key_state = []
+        # one-shot keys (like the trackball directions) are used up when they're read,
+        # so those read by one of poll_events/get_new_keys are kept for the other
+        self._pending_new_keys = []
+        self._pending_event_keys = []
+        if event_scan_ms and hasattr(self, 'start_scanner'):
+            self.start_scanner(event_scan_ms)
         
         # mh_if kb_light:
         # keyboard backlight control!
@@ -122,14 +145,14 @@ class UserInput(_keys.Keys):
         keylist = []
         for key in self.key_state:
             if key not in tracker \
-            or key in _keys.ALWAYS_NEW_KEYS:
+            or key in _ALWAYS_NEW_KEYS:
                 keylist.append(key)
 
         # Test if tracked keys have been held enough to repeat.
         # If they have, we can repeat them and reset the repeat time.
         # Also, don't repeat modifier` keys.
         for key, key_time in tracker.items():
-            if key not in _keys.MOD_KEYS \
+            if key not in _MOD_KEYS \
             and int(time.ticks_diff(time_now, key_time)) >= hold_ms:
                 keylist.append(key)
                 tracker[key] = time_now - repeat_delta
@@ -149,12 +172,77 @@ class UserInput(_keys.Keys):
         self.get_pressed_keys()
         keylist = self._get_new_keys()
 
+        for key in self.key_state:
+            if key in _ALWAYS_NEW_KEYS and key not in self._pending_event_keys:
+                self._pending_event_keys.append(key)
+        if self._pending_new_keys:
+            for key in self._pending_new_keys:
+                if key not in keylist:
+                    keylist.append(key)
+            self._pending_new_keys.clear()
+
         if self.use_sys_commands:
             self.system_commands(keylist)
 
         return keylist
 
 
+    def poll_events(self):
+        """
+        Return a list of (key, pressed, ticks_ms) tuples,
+        for every key that has been pressed or released since the last call (oldest first).
+
+        When the background scanner is running (see `event_scan_ms`), keys pressed and released
+        between calls aren't lost, even if the app is busy for a while.
+        Otherwise, the keyboard is read now, and compared to the keys from the last call.
+        """
+        queue = getattr(self, 'events', None)
+        if queue is None:
+            return self._poll_state_events()
+
+        events = []
+        event_keys = self._event_keys
+        for code, pressed, ticks in queue.pop_all():
+            if pressed:
+                held = event_keys.values()
+                key = self.event_key_name(
+                    code,
+                    'FN' in held or 'FN' in self.locked_keys,
+                    'SHIFT' in held or 'SHIFT' in self.locked_keys,
+                    )
+                event_keys[code] = key
+            else:
+                key = event_keys.pop(code, None)
+                if key is None:
+                    continue
+            events.append((key, pressed, ticks))
+        return events
+
+
+    def _poll_state_events(self):
+        """poll_events for devices without a background scanner."""
+        # read the keyboard without changing key_state (which get_new_keys depends on)
+        key_state = self.key_state
+        current = self.get_pressed_keys()
+        self.key_state = key_state
+        # reading the keys also used up any one-shot input (like the T-Deck's trackball movement),
+        # so keep it for get_new_keys too
+        for key in current:
+            if key in _ALWAYS_NEW_KEYS and key not in self._pending_new_keys:
+                self._pending_new_keys.append(key)
+        if self._pending_event_keys:
+            # and add the one-shot keys that get_new_keys read
+            current = current + [key for key in self._pending_event_keys if key not in current]
+            self._pending_event_keys.clear()
+
+        ticks = time.ticks_ms()
+        previous = self._event_key_state
+        events = [(key, False, ticks) for key in previous if key not in current]
+        events += [(key, True, ticks) for key in current if key not in previous]
+        self._event_key_state = current
+        return events
+
+
     def get_pressed_keys(self):
         force_fn = True if 'FN' in self.locked_keys else False
         force_shift = True if 'SHIFT' in self.locked_keys else False
@@ -163,18 +251,24 @@ class UserInput(_keys.Keys):
 
     def get_mod_keys(self):
         """Return modifier keys that are being held, or that are currently locked."""
-        return [key for key in self.key_state + self.locked_keys if key in _keys.MOD_KEYS]
+        return [key for key in self.key_state + self.locked_keys if key in _MOD_KEYS]
 
 
     def populate_tracker(self):
         """Move currently pressed keys to tracker"""
+        # _keys returns the same list while the held keys are unchanged,
+        # and in that case the tracker is already up to date.
+        if self.key_state is self._tracked_key_state:
+            return
+        self._tracked_key_state = self.key_state
+
         # add new keys
         for key in self.key_state:
             if key not in self.tracker.keys():
                 
                 # mod keys lock rather than repeat
                 if self.locking_keys \
-                and key in _keys.MOD_KEYS:
+                and key in _MOD_KEYS:
                     # True means key can be locked
                     self.tracker[key] = True
                 else:
@@ -186,7 +280,7 @@ class UserInput(_keys.Keys):
         for key in self.tracker.keys():
             if key not in self.key_state \
             and (self.locking_keys == False
-            or key not in _keys.MOD_KEYS):
+            or key not in _MOD_KEYS):
                 self.tracker.pop(key)
 
 
@@ -197,7 +291,7 @@ class UserInput(_keys.Keys):
 
         # iterate over mod keys in tracker:
         for key in tracker:
-            if key in _keys.MOD_KEYS:
+            if key in _MOD_KEYS:
                 
                 # pre-fetch for easier readability:
                 tracker_val = tracker[key]
@@ -7,7 +7,7 @@ import yaml
 import argparse
 import subprocess
 import shutil
-from parse_files import NON_DEVICE_FILES
+from parse_files import NON_DEVICE_FILES, NON_FIRMWARE_DEVICES
 
 
 # argparser stuff:
@@ -55,7 +55,8 @@ def main():
     # parse devices into list of Device objects
     devices = []
     for filepath in os.listdir(DEVICE_PATH):
-        if filepath not in NON_DEVICE_FILES:
+        if filepath not in NON_DEVICE_FILES \
+        and filepath not in NON_FIRMWARE_DEVICES:
             devices.append(Device(filepath))
 
     # Run build script, passing each target device name.
@@ -0,0 +1,133 @@
+"""
+This tool converts a TrueType/OpenType font (any that can be opened by PIL) into an
+anti-aliased MicroHydra font module, which can be drawn using `Display.text`.
+
+The output uses the same layout as the proportional fonts made with `write_font_converter.py`
+(MAP, WIDTHS, OFFSETS, and BITMAPS), but each pixel is stored with 2 or 4 bits (BPP),
+holding how much of the pixel the glyph covers.
+The Display blends the text color with a background color using these levels,
+so large text has smooth edges instead of jagged ones.
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+
+import os
+import argparse
+
+
+# argparser stuff:
+PARSER = argparse.ArgumentParser(
+prog='aa_font_converter',
+description="""\
+Convert a font file into an anti-aliased MicroHydra font module.
+"""
+)
+
+
+PARSER.add_argument('font_file', help='Path to the TTF/OTF font file.')
+PARSER.add_argument('size', type=int, help='Font size in pixels.')
+PARSER.add_argument('-o', '--output_file', help='Output file name (defaults to "<font name>_<size>_aa.py")')
+PARSER.add_argument('-b', '--bpp', type=int, default=4, choices=(1, 2, 4), help='Bits per pixel (default 4).')
+PARSER.add_argument('-c', '--characters', default='0x20-0x7e', help='Character ranges to include, like "0x20-0x7e,0xb0".')
+SCRIPT_ARGS = PARSER.parse_args()
+
+
+FONT_FILE = SCRIPT_ARGS.font_file
+OUTPUT_FILE = SCRIPT_ARGS.output_file
+BPP = SCRIPT_ARGS.bpp
+MAX_LEVEL = (1 << BPP) - 1
+
+
+# set defaults for args not given:
+CWD = os.getcwd()
+
+if OUTPUT_FILE is None:
+    font_name = os.path.splitext(os.path.basename(FONT_FILE))[0].replace('-', '_')
+    OUTPUT_FILE = os.path.join(CWD, f'{font_name}_{SCRIPT_ARGS.size}_aa.py')
+
+
+def parse_characters(ranges):
+    """Parse a string like "0x20-0x7e,0xb0" into a string of characters."""
+    chars = []
+    for part in ranges.split(','):
+        if '-' in part:
+            start, end = part.split('-')
+            chars.extend(chr(code) for code in range(int(start, 0), int(end, 0) + 1))
+        else:
+            chars.append(chr(int(part, 0)))
+    return ''.join(chars)
+
+
+FONT = ImageFont.truetype(FONT_FILE, SCRIPT_ARGS.size)
+ASCENT, DESCENT = FONT.getmetrics()
+HEIGHT = ASCENT + DESCENT
+CHARS = parse_characters(SCRIPT_ARGS.characters)
+
+
+def render_glyph(char):
+    """Return (width, levels) for one character, where levels are coverage values from 0 to MAX_LEVEL."""
+    width = max(1, round(FONT.getlength(char)))
+    image = Image.new('L', (width, HEIGHT), 0)
+    ImageDraw.Draw(image).text((0, 0), char, font=FONT, fill=255)
+    levels = [(value * MAX_LEVEL + 127) // 255 for value in image.getdata()]
+    return width, levels
+
+
+def format_bytes(name, data):
+    """Format bytes as a MicroPython const, split into lines."""
+    lines = [f"{name} = const(\\"]
+    for idx in range(0, len(data), 16):
+        chunk = ''.join(f'\\x{byte:02x}' for byte in data[idx:idx + 16])
+        end = ')' if idx + 16 >= len(data) else '\\'
+        lines.append(f"    b'{chunk}'{end}")
+    return '\n'.join(lines)
+
+
+widths = bytearray()
+bit_offsets = []
+bits = []
+for char in CHARS:
+    width, levels = render_glyph(char)
+    widths.append(width)
+    bit_offsets.append(len(bits))
+    for level in levels:
+        bits.extend((level >> shift) & 1 for shift in range(BPP - 1, -1, -1))
+
+# pack the bits (MSB first)
+bitmaps = bytearray((len(bits) + 7) // 8)
+for idx, bit in enumerate(bits):
+    if bit:
+        bitmaps[idx >> 3] |= 0x80 >> (idx & 7)
+
+OFFSET_WIDTH = max(1, (max(bit_offsets).bit_length() + 7) // 8)
+offsets = bytearray()
+for offset in bit_offsets:
+    offsets += offset.to_bytes(OFFSET_WIDTH, 'big')
+
+char_map = CHARS.replace('\\', '\\\\').replace('"', '\\"')
+
+output = f"""# -*- coding: utf-8 -*-
+# Converted from {os.path.basename(FONT_FILE)} using:
+#     aa_font_converter.py {os.path.basename(FONT_FILE)} {SCRIPT_ARGS.size} -b {BPP} -c {SCRIPT_ARGS.characters}
+
+MAP = const("{char_map}")
+BPP = {BPP}
+HEIGHT = {HEIGHT}
+MAX_WIDTH = {max(widths)}
+{format_bytes('_WIDTHS', widths)}
+
+OFFSET_WIDTH = {OFFSET_WIDTH}
+{format_bytes('_OFFSETS', offsets)}
+
+{format_bytes('_BITMAPS', bitmaps)}
+
+WIDTHS = memoryview(_WIDTHS)
+OFFSETS = memoryview(_OFFSETS)
+BITMAPS = memoryview(_BITMAPS)
+"""
+
+# write output file
+with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+    f.write(output)
+
+print(f"{len(CHARS)} characters, {HEIGHT}px high, {BPP} bpp: {len(bitmaps)} bytes of bitmaps")
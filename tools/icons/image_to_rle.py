@@ -0,0 +1,109 @@
+"""
+This tool converts an image (any that can be opened by PIL) into a MicroHydra RLE image,
+which can be drawn using `lib.display.rleimage.RLEImage`.
+
+The image is reduced to (up to) 16 colors, and each row is stored as runs of a single color.
+This works best for images with large flat areas, like splash screens and icons.
+"""
+
+from PIL import Image
+
+import os
+import struct
+import argparse
+
+
+# argparser stuff:
+PARSER = argparse.ArgumentParser(
+prog='image_to_rle',
+description="""\
+Convert an image into a MicroHydra RLE image file.
+"""
+)
+
+
+PARSER.add_argument('input_image', help='Path to the image file.')
+PARSER.add_argument('-o', '--output_file', help='Output file name (defaults to "image.rle")')
+PARSER.add_argument('-W', '--width', type=int, help='Resize the image to this width.')
+PARSER.add_argument('-H', '--height', type=int, help='Resize the image to this height.')
+PARSER.add_argument('-c', '--colors', type=int, default=16, help='Number of colors to use (2-16, default 16).')
+PARSER.add_argument('-d', '--dither', help='Dither the converted image.', action='store_true')
+PARSER.add_argument('-p', '--preview', help='Open a preview of the converted image.', action='store_true')
+SCRIPT_ARGS = PARSER.parse_args()
+
+
+INPUT_IMAGE = SCRIPT_ARGS.input_image
+OUTPUT_FILE = SCRIPT_ARGS.output_file
+
+
+# set defaults for args not given:
+CWD = os.getcwd()
+
+if OUTPUT_FILE is None:
+    OUTPUT_FILE = os.path.join(CWD, 'image.rle')
+
+if not 2 <= SCRIPT_ARGS.colors <= 16:
+    raise ValueError("--colors must be between 2 and 16")
+
+
+MAGIC = b'MHRL'
+MAX_RUN = 16
+
+IMAGE = Image.open(INPUT_IMAGE).convert('RGB')
+
+
+# resize (keeping the aspect ratio if only one dimension is given)
+if SCRIPT_ARGS.width or SCRIPT_ARGS.height:
+    width = SCRIPT_ARGS.width or round(IMAGE.width * SCRIPT_ARGS.height / IMAGE.height)
+    height = SCRIPT_ARGS.height or round(IMAGE.height * SCRIPT_ARGS.width / IMAGE.width)
+    IMAGE = IMAGE.resize((width, height))
+
+
+OUTPUT_IMAGE = IMAGE.quantize(
+    colors=SCRIPT_ARGS.colors,
+    dither=Image.Dither.FLOYDSTEINBERG if SCRIPT_ARGS.dither else Image.Dither.NONE,
+    )
+
+
+def color565(red, green, blue):
+    return ((red & 0xf8) << 8) | ((green & 0xfc) << 3) | (blue >> 3)
+
+
+def encode_row(row):
+    """Encode one row of palette indices as runs of (index << 4 | length - 1)."""
+    runs = bytearray()
+    idx = 0
+    while idx < len(row):
+        color = row[idx]
+        length = 1
+        while idx + length < len(row) and row[idx + length] == color and length < MAX_RUN:
+            length += 1
+        runs.append((color << 4) | (length - 1))
+        idx += length
+    return runs
+
+
+# quantize can return fewer colors than requested
+NUM_COLORS = max(OUTPUT_IMAGE.getdata()) + 1
+RGB_PALETTE = OUTPUT_IMAGE.getpalette()[:NUM_COLORS * 3]
+PALETTE = [color565(*RGB_PALETTE[i:i+3]) for i in range(0, len(RGB_PALETTE), 3)]
+
+PIXELS = list(OUTPUT_IMAGE.getdata())
+WIDTH, HEIGHT = OUTPUT_IMAGE.size
+
+output = bytearray(struct.pack('<4sHHBB', MAGIC, WIDTH, HEIGHT, NUM_COLORS, 0))
+output += struct.pack(f'<{NUM_COLORS}H', *PALETTE)
+for y in range(HEIGHT):
+    output += encode_row(PIXELS[y * WIDTH:(y + 1) * WIDTH])
+
+
+# write output file
+with open(OUTPUT_FILE, 'wb') as f:
+    f.write(output)
+
+raw_size = (WIDTH * HEIGHT + 1) // 2
+print(f"{WIDTH}x{HEIGHT}, {NUM_COLORS} colors: {len(output)} bytes ({len(output) * 100 // raw_size}% of raw GS4)")
+
+if SCRIPT_ARGS.preview:
+    PREVIEW = OUTPUT_IMAGE.resize((WIDTH * 2, HEIGHT * 2))
+    PREVIEW.show()
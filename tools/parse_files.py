@@ -116,6 +116,10 @@ DONT_INCLUDE_IF_FROZEN = [
 # These file/dir names in `devices/` should not define new devices
 NON_DEVICE_FILES = ['default.yml', 'esp32_mpy_build', 'README.md']
 
+# These devices run MicroHydra on a computer (using the MicroPython unix port),
+# so they don't get frozen firmware builds.
+NON_FIRMWARE_DEVICES = ['HOST']
+
 
 # Designate unicode "noncharacter" as representation of completed mh conditional
 # 1-byte noncharacters = U+FDD0..U+FDEF, choosing from these arbitrarily.
@@ -146,7 +150,8 @@ def main():
     # parse devices into list of Device objects
     devices = []
     for filepath in os.listdir(DEVICE_PATH):
-        if filepath not in NON_DEVICE_FILES:
+        if filepath not in NON_DEVICE_FILES \
+        and not (FROZEN and filepath in NON_FIRMWARE_DEVICES):
             devices.append(Device(filepath))
 
     # print status information
@@ -1,8 +1,12 @@
 #coding: utf-8
 
+import argparse
+import os
 from PIL import Image, ImageDraw, ImageFont
 from typing import Tuple
 
+import sparse_font
+
 class PILFont():
     def __init__(self, font_path: str, font_size: int) -> None:
         self.__font = ImageFont.FreeTypeFont(font_path, font_size)
@@ -42,26 +46,56 @@ def i18s_decode(cur: int, width=8, height=8) -> None:
             cur >>= 1
         print()
 
+parser = argparse.ArgumentParser(
+    description="Render an 8x8 utf8 font, and save it in MicroHydra's sparse utf8 font format."
+)
+parser.add_argument(
+    '--subset', action='store_true',
+    help="Only include the characters used by the `_TRANS` tables in src/ (plus printable ascii, and any --blocks)."
+)
+parser.add_argument(
+    '--blocks', nargs='*', default=[],
+    help="Unicode blocks to include in a subset (plus printable ascii), written as hex ranges. E.g. '3040-30FF 4E00-9FFF'"
+)
+parser.add_argument(
+    '--source', default=os.path.join(os.path.dirname(__file__), '..', '..', 'src'),
+    help="Path to the MicroHydra source (used to find `_TRANS` tables)."
+)
+args = parser.parse_args()
+
+
 # 生成Unicode范围内的所有字符，从 U+0000 到 U+FFFF
 start = 0x0000  # 开始范围
 end = 0xFFFF    # 结束范围
 
-with open(f"utf8_8x8.bin", "wb") as binary_file:
-    for codepoint in range(start, end + 1):
-        char = chr(codepoint)
-        
+codepoints = range(start, end + 1)
+if args.subset or args.blocks:
+    # printable ascii is always kept (the same as sparse_font.subset)
+    keep = sparse_font.parse_blocks(args.blocks).union(sparse_font.ASCII_RANGE)
+    if args.subset:
+        keep |= sparse_font.trans_chars(args.source)
+    codepoints = sorted(keep)
+
+glyphs = {}
+for codepoint in codepoints:
+    char = chr(codepoint)
+
+    try:
+        # 获取i18s_encode的值
+        encoded_value = i18s_encode(char)
+
+        # 将i18s_encode的值（8字节）保存
         try:
-            # 获取i18s_encode的值
-            encoded_value = i18s_encode(char)
-            
-            # 将i18s_encode的值（8字节）写入文件
-            try:
-                t = encoded_value.to_bytes(8, byteorder='big')
-            except Exception as e:
-                x = 0
-                t = x.to_bytes(8, byteorder='big')
-                print(f"Error encoding {char} (U+{codepoint:04X}):{e}, Assuming 0...")
-            binary_file.write(t)
-        
+            t = encoded_value.to_bytes(8, byteorder='big')
         except Exception as e:
-            print(f"Error processing character {char} (U+{codepoint:04X}): {e}")
\ No newline at end of file
+            x = 0
+            t = x.to_bytes(8, byteorder='big')
+            print(f"Error encoding {char} (U+{codepoint:04X}):{e}, Assuming 0...")
+        glyphs[codepoint] = t
+
+    except Exception as e:
+        print(f"Error processing character {char} (U+{codepoint:04X}): {e}")
+
+# 空字形不会被写入文件 (empty glyphs are not stored)
+with open("utf8_8x8.bin", "wb") as binary_file:
+    binary_file.write(sparse_font.pack(glyphs))
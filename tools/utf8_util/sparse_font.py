@@ -0,0 +1,117 @@
+"""
+Helpers for reading and writing MicroHydra's sparse utf8 font format.
+
+The original utf8 font is a dense table of 8-byte glyphs for every codepoint from U+0000 to U+FFFF.
+Most of those glyphs are empty, so the sparse format only stores runs of non-empty glyphs,
+along with an index that maps those runs back to their codepoints.
+
+Format (all numbers are little-endian uint16):
+    header:  b'MHU8', num_ranges, num_glyphs
+    index:   num_ranges * (first_codepoint, glyph_count, first_glyph)
+    glyphs:  num_glyphs * 8 bytes of glyph data
+
+Ranges are sorted by codepoint, and any codepoint not covered by a range is an empty glyph.
+"""
+
+import os
+import re
+import struct
+
+
+MAGIC = b'MHU8'
+HEADER_FORMAT = '<4sHH'
+RANGE_FORMAT = '<HHH'
+GLYPH_BYTES = 8
+
+EMPTY_GLYPH = bytes(GLYPH_BYTES)
+
+# always keep printable ascii in subsets (it's tiny, and the display can fall back to it)
+ASCII_RANGE = range(0x20, 0x7f)
+
+
+def read_dense(path):
+    """Read a dense (legacy) utf8 font into a {codepoint: glyph_bytes} dict of non-empty glyphs."""
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    glyphs = {}
+    for codepoint in range(len(data) // GLYPH_BYTES):
+        glyph = data[codepoint * GLYPH_BYTES:(codepoint + 1) * GLYPH_BYTES]
+        if glyph != EMPTY_GLYPH:
+            glyphs[codepoint] = glyph
+    return glyphs
+
+
+def unpack(data):
+    """Read sparse font data back into a {codepoint: glyph_bytes} dict."""
+    magic, num_ranges, _ = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != MAGIC:
+        raise ValueError("Data is not a sparse utf8 font.")
+
+    data_start = struct.calcsize(HEADER_FORMAT) + num_ranges * struct.calcsize(RANGE_FORMAT)
+    glyphs = {}
+    for first, count, glyph_idx in struct.iter_unpack(
+            RANGE_FORMAT, data[struct.calcsize(HEADER_FORMAT):data_start]):
+        for i in range(count):
+            start = data_start + (glyph_idx + i) * GLYPH_BYTES
+            glyphs[first + i] = data[start:start + GLYPH_BYTES]
+    return glyphs
+
+
+def read_font(path):
+    """Read either a sparse or a dense utf8 font into a {codepoint: glyph_bytes} dict."""
+    with open(path, 'rb') as file:
+        is_sparse = file.read(len(MAGIC)) == MAGIC
+    if is_sparse:
+        with open(path, 'rb') as file:
+            return unpack(file.read())
+    return read_dense(path)
+
+
+def pack(glyphs):
+    """Pack a {codepoint: glyph_bytes} dict into sparse font data. Empty glyphs are dropped."""
+    codepoints = sorted(cp for cp, glyph in glyphs.items() if glyph != EMPTY_GLYPH and cp <= 0xFFFF)
+
+    # group consecutive codepoints into ranges of [first, count, first_glyph]
+    ranges = []
+    for glyph_idx, codepoint in enumerate(codepoints):
+        if ranges and ranges[-1][0] + ranges[-1][1] == codepoint:
+            ranges[-1][1] += 1
+        else:
+            ranges.append([codepoint, 1, glyph_idx])
+
+    return b''.join((
+        struct.pack(HEADER_FORMAT, MAGIC, len(ranges), len(codepoints)),
+        *(struct.pack(RANGE_FORMAT, *rng) for rng in ranges),
+        *(glyphs[cp] for cp in codepoints),
+    ))
+
+
+def parse_blocks(blocks):
+    """Convert strings like '3040-30FF' or '4E00' into a set of codepoints."""
+    codepoints = set()
+    for block in blocks:
+        first, _, last = block.partition('-')
+        first = int(first, 16)
+        last = int(last, 16) if last else first
+        codepoints.update(range(first, last + 1))
+    return codepoints
+
+
+def trans_chars(source_path):
+    """Find all the characters used by the `_TRANS` tables in the given source directory."""
+    chars = set()
+    for dirpath, _, filenames in os.walk(source_path):
+        for filename in filenames:
+            if not filename.endswith('.py'):
+                continue
+            with open(os.path.join(dirpath, filename), 'r', encoding='utf-8') as file:
+                for table in re.findall(r'_TRANS = const\("""(.*?)"""\)', file.read(), re.DOTALL):
+                    chars.update(ord(char) for char in table)
+    return chars
+
+
+def subset(glyphs, codepoints):
+    """Return only the glyphs for the given codepoints (plus printable ascii)."""
+    keep = set(codepoints).union(ASCII_RANGE)
+    return {cp: glyph for cp, glyph in glyphs.items() if cp in keep}
@@ -1,24 +1,59 @@
 """
 Simple script to convert the output of `generate_utf8_font.py` 
 into a .py file that can be frozen in MicroPython firmware.
+
+The font is written in the sparse utf8 font format (see `sparse_font.py`).
+Older, dense fonts are converted automatically.
+
+Use `--subset` to only keep the characters used by the `_TRANS` tables in src/,
+and `--blocks` to keep additional unicode blocks (e.g. `--blocks 3040-30FF 4E00-9FFF`).
+The source .bin is never modified. The packed font is also written to `--bin-out`
+(by default, the non-frozen font in `src/font/utf8_8x8.bin`), so that the frozen .py and the .bin always match.
 """
 
+import argparse
 import os
 
+import sparse_font
+
+
+parser = argparse.ArgumentParser(description="Convert a utf8 font .bin into a freezable .py file.")
+parser.add_argument('--subset', action='store_true', help="Only keep characters from `_TRANS` tables.")
+parser.add_argument('--blocks', nargs='*', default=[], help="Unicode blocks to keep, as hex ranges.")
+parser.add_argument('--bin-out', help="Where to write the packed .bin font (default: src/font/utf8_8x8.bin).")
+args = parser.parse_args()
+
 
 # decide on working in the current, or in the './tools/utf8_util' directory
 if os.path.exists(os.path.join('tools','utf8_util','utf8_8x8.bin')):
     source_file = os.path.join('tools','utf8_util','utf8_8x8.bin')
     dest_file = os.path.join('tools','utf8_util','utf8_8x8.py')
+    source_path = 'src'
 else:
     source_file = 'utf8_8x8.bin'
     dest_file = 'utf8_8x8.py'
+    source_path = os.path.join('..', '..', 'src')
+
+bin_file = args.bin_out if args.bin_out else os.path.join(source_path, 'font', 'utf8_8x8.bin')
+if os.path.abspath(bin_file) == os.path.abspath(source_file):
+    raise ValueError("--bin-out can't overwrite the source font.")
 
 
-with open(source_file, 'rb') as source:
-    with open(dest_file, 'w') as dest:
-        dest.write(f"""\
-_UTF8 = const({source.read()})
+glyphs = sparse_font.read_font(source_file)
+
+if args.subset or args.blocks:
+    keep = sparse_font.parse_blocks(args.blocks)
+    if args.subset:
+        keep.update(sparse_font.trans_chars(source_path))
+    glyphs = sparse_font.subset(glyphs, keep)
+
+font_data = sparse_font.pack(glyphs)
+
+with open(bin_file, 'wb') as bin_out:
+    bin_out.write(font_data)
+
+with open(dest_file, 'w') as dest:
+    dest.write(f"""\
+_UTF8 = const({font_data})
 utf8 = memoryview(_UTF8)
 """)
-